@@ -1,6 +1,8 @@
 from model.parsed_query import ParsedQuery
 from model.query_tree import (
     QueryTree,
+    LogicalNode,
+    ConditionNode,
     SetClause,
     TableReference,
     InsertData,
@@ -13,10 +15,12 @@ from helper.helper import (
     make_join_commutative,
     associate_natural_join,
     associate_theta_join,
-    choose_best,
     build_join_tree,
-    plan_cost,
+    build_bushy_join_tree,
     _tables_under,
+    _alias_map,
+    _conjuncts,
+    _pred_tables,
     _some_permutations,
     _get_columns_from_select,
     validate_query,
@@ -50,6 +54,33 @@ from helper.helper import (
 )
 
 from helper.stats import get_stats
+from helper.join_order import (
+    FitnessCache,
+    FitnessEvaluator,
+    TopKPlans,
+    parallel_costs,
+    _init_fitness_worker,
+    _evaluate_in_worker,
+    _worker_evaluator,
+    Deadline,
+    greedy_join_order,
+    dp_join_order,
+    dp_join_order_orders,
+    bnb_join_order,
+    goo_join_order,
+    dp_bushy_join_order,
+    join_graph_edges,
+    decode_edge_order
+)
+from helper.join_strategy import select_join_strategy
+from helper.join_graph import JoinGraph
+from helper.star_schema import detect_star_schema, star_join_order, choose_star_join_methods
+from helper.cost import CostPlanner, order_column
+from helper.cost_engine import CostEngine
+from helper.memory import MemoryConfig
+from helper.cpu_cost import CpuWeights
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import math
 import random
 
 class OptimizationEngine:
@@ -62,7 +93,113 @@ class OptimizationEngine:
         self.ga_crossover_rate = 0.7
         self.ga_tournament_size = 3
         self.ga_elite_size = 2
-        self.ga_threshold_tables = 4
+
+        # Operator GA/SA yang menjaga setiap prefix urutan left-deep terhubung di
+        # join graph (seeding, repair setelah crossover/mutasi/move); cartesian
+        # hanya kalau graph memang tidak terhubung
+        self.ga_connected_operators = True
+
+        # Greedy Operator Ordering untuk query sangat besar (menggantikan GA dan
+        # heuristic di atas threshold); deterministik dan polinomial
+        self.use_goo = True
+        self.goo_threshold_tables = 40
+
+        # Evaluasi fitness paralel: ga_workers <= 1 berarti serial,
+        # ga_executor "process" (ProcessPoolExecutor) atau "thread"
+        self.ga_workers = 0
+        self.ga_executor = "process"
+
+        # Island model: ga_islands > 1 menjalankan populasi terpisah (proses
+        # worker bila ga_executor "process" dan ga_workers > 1), migrasi elite
+        # setiap ga_migration_interval generasi
+        self.ga_islands = 0
+        self.ga_migration_interval = 5
+        self.ga_migration_size = 2
+
+        # Branch-and-bound di GA: individu left-deep yang batas bawahnya sudah
+        # melebihi best cost ditinggalkan (cost inf). Hanya untuk evaluasi serial
+        self.ga_prune = False
+
+        # Simulated annealing (strategi "sa", opt-in): satu trajektori atas
+        # genes yang sama dengan GA, move swap / 3-cycle / segment exchange,
+        # cost inkremental lewat prefix trie FitnessCache
+        self.use_sa = False
+        self.sa_seed = None
+        self.sa_max_evaluations = 120
+        self.sa_cooling_rate = 0.9
+        self.sa_steps_per_temperature = None  # None = disebar merata di evaluation cap
+        self.sa_min_temperature_ratio = 1e-3
+        self.sa_moves = ("swap", "cycle3", "segment")
+        self.last_sa_stats = {}
+
+        # Query star/snowflake (fact besar + dimensi kecil lewat key) langsung
+        # dibuatkan plan tanpa search; filter_selectivity = selectivity filter
+        # per tabel dari query yang sedang dioptimasi
+        self.use_star_plans = True
+        self.star_fact_ratio = 2.0
+        self.filter_selectivity = {}
+        self.last_star_schema = None
+
+        # Top-k: strategi yang mendukung (DP/BnB left-deep, GA, SA, sampling)
+        # menyimpan plan_top_k plan termurah yang berbeda lewat bounded heap;
+        # last_top_plans = [{plan, cost, breakdown}] dari yang termurah
+        self.plan_top_k = 1
+        self.last_top_plans = []
+
+        # Interesting orders: kalau query punya ORDER BY / GROUP BY di atas
+        # join, DP left-deep membawa properti order per subplan sehingga merge
+        # join dan sort yang bisa dilewati ikut dipertimbangkan.
+        # required_order diisi optimize_query per query.
+        self.use_interesting_orders = True
+        self.required_order = None
+        self._order_operator = None
+        self.last_sort_avoided = False
+
+        # Model cost tunggal (helper.cost_engine) untuk semua strategi join,
+        # top-k dan get_cost: "planner" (CostPlanner: index, join method,
+        # estimasi size) atau "simple" (plan_cost: rows = max, SIGMA / 2).
+        # aliases diisi optimize_query untuk predikat beralias
+        self.cost_model = "planner"
+        self.aliases = {}
+
+        # Memory (helper.memory.MemoryConfig) untuk join method dan sort di
+        # CostPlanner: buffer pool, ukuran block, dan grant per query; bisa dari
+        # MemoryConfig.from_config(...) atau MemoryConfig.from_storage_manager(sm).
+        # Grant per panggilan optimize_query(memory_grant_blocks=...) membatasi
+        # m semua operator; last_memory_blocks = peak memory plan terakhir
+        self.memory = MemoryConfig()
+        self.query_memory = None
+        self.last_memory_blocks = None
+
+        # Bobot CPU (helper.cpu_cost.CpuWeights) per tuple dan per evaluasi
+        # predikat di cost "planner"; CpuWeights(0, 0) = block I/O saja
+        self.cpu_weights = CpuWeights()
+
+        # Counter FitnessCache dari run GA terakhir (hits, misses, prefix_hits, join_evals, pruned)
+        self.last_ga_stats = {}
+
+        # Enumerasi exhaustive left-deep (exact untuk cost_model "simple";
+        # "planner" hampir exact karena size join bergantung pada urutan):
+        # "dp" (DP atas connected subgraph) atau "bnb" (branch-and-bound, anytime;
+        # lower bound "planner" lemah, pakai bersama time_budget_ms)
+        self.dp_max_tables = 15
+        self.join_enumerator = "dp"
+
+        # Bushy plan space: DPccp di heuristic path, encoding edge order di GA
+        self.bushy_plans = False
+        self.dp_bushy_max_tables = 10
+
+        # Batas waktu optimasi per query (ms), None = tanpa batas. Bisa di-override
+        # per panggilan optimize_query; kalau habis sebelum ada plan lengkap,
+        # dipakai greedy_join_order
+        self.time_budget_ms = None
+        self.last_budget_exhausted = False
+
+        # Strategi join-order: "auto" memilih dari registry helper.join_strategy
+        # berdasarkan bentuk join graph dan jumlah tabel, atau nama strategi
+        # ("dp", "bnb", "ga", "goo", "greedy", "heuristic")
+        self.join_strategy = "auto"
+        self.last_strategy = None
     
     # parse sql query string dan return ParsedQuery object
     def parse_query(self, query: str) -> ParsedQuery:
@@ -267,12 +404,25 @@ class OptimizationEngine:
         
         return parse_result
 
-    def optimize_query(self, parsed_query: ParsedQuery) -> ParsedQuery:
+    def optimize_query(self, parsed_query: ParsedQuery, time_budget_ms=None, memory_grant_blocks=None) -> ParsedQuery:
         if not parsed_query or not parsed_query.query_tree:
             return parsed_query
 
+        # grant memory query ini (None = buffer pool self.memory saja)
+        self.query_memory = None if memory_grant_blocks is None else self.memory.with_grant(memory_grant_blocks)
+        self.last_memory_blocks = None
+
+        # deadline mulai dihitung sejak awal optimasi, termasuk rewrite rules
+        if time_budget_ms is None:
+            time_budget_ms = self.time_budget_ms
+        deadline = Deadline(time_budget_ms)
+        self.last_strategy = None
+        self.last_top_plans = []
+        self.last_sort_avoided = False
+
         # 1) START WITH ORIGINAL ROOT
         root = parsed_query.query_tree
+        self.aliases = _alias_map(root)
 
         # 2) APPLY NON-JOIN RULES (push-down & simplify)
         changed = True
@@ -283,6 +433,9 @@ class OptimizationEngine:
             changed = (repr(root) != prev)
             max_iter -= 1
 
+        # selectivity filter per tabel, sebelum sigma dilebur ke predikat join
+        self.filter_selectivity = self._filter_selectivity(root, get_stats())
+
         # 3) APPLY JOIN RULES (fold selection, assoc, commutative)
         root = fold_selection_with_cartesian(root)
         root = merge_selection_into_join(root)
@@ -293,8 +446,22 @@ class OptimizationEngine:
         # 4) TABLE EXTRACTION
         tables = list(_tables_under(root)) if root else []
         if len(tables) <= 1:
+            # tanpa join: hanya access path (table / index scan) yang dipilih
+            if root is not None:
+                self._cost_engine(get_stats()).annotate_physical(root)
             return ParsedQuery(parsed_query.query, root)
 
+        # operator hasil (PROJECT/SORT/GROUP/LIMIT) di atas join dipasang lagi
+        # di atas plan join; SORT/GROUP terdekat ke join = order yang diminta
+        result_ops = self._result_operators(root)
+        self.required_order = None
+        self._order_operator = None
+        for op in reversed(result_ops):
+            if op.type in ("SORT", "GROUP"):
+                self.required_order = order_column(op.val)
+                self._order_operator = op.type
+                break
+
         # 5) BUILD JOIN CONDITIONS FROM CURRENT TREE
         join_conditions = self._extract_join_conditions_from_tree(root)
 
@@ -302,52 +469,548 @@ class OptimizationEngine:
         stats = get_stats()
 
         # 7) CHOOSE OPTIMIZATION METHOD
-        best_plan = None
-        
-        if self.use_ga and len(tables) >= self.ga_threshold_tables:
-            ga_plan, ga_cost = self._genetic_algorithm_optimize(tables, join_conditions, stats)
-            
-            heuristic_plan, heuristic_cost = self._heuristic_optimize(tables, join_conditions, stats)
-            
-            if ga_cost < heuristic_cost:
-                best_plan = ga_plan
-            else:
-                best_plan = heuristic_plan
-        else:
-            best_plan, _ = self._heuristic_optimize(tables, join_conditions, stats)
+        # strategi yang kehabisan waktu mengembalikan (None, inf)
+        strategy = select_join_strategy(self, tables, join_conditions, stats)
+        self.last_strategy = strategy.name
+        best_plan, _ = strategy.run(self, tables, join_conditions, stats, deadline)
+        self.last_budget_exhausted = deadline.expired()
 
+        if best_plan is None:
+            best_plan, _ = self._greedy_optimize(tables, join_conditions, stats)
+        if not self.last_top_plans:
+            cost = self._cost_engine(stats).plan_cost(best_plan)
+            self.last_top_plans = [self._plan_entry(best_plan, cost, stats)]
         # 8) RETURN BEST PLAN AS FINAL OPTIMIZED QUERY TREE
-        return ParsedQuery(parsed_query.query, best_plan)
+        final_plan = self._graft_result_operators(result_ops, best_plan)
+        engine = self._cost_engine(stats)
+        engine.annotate_physical(final_plan)
+        self.last_memory_blocks = engine.peak_memory(final_plan)
+        return ParsedQuery(parsed_query.query, final_plan)
+
+    RESULT_OPERATORS = ("PROJECT", "SORT", "GROUP", "LIMIT")
+
+    def _result_operators(self, root):
+        # rantai operator unary dari root sampai join/tabel pertama (atas ke bawah)
+        ops = []
+        node = root
+        while node is not None and node.type not in ("JOIN", "TABLE") and len(node.childs) == 1:
+            if node.type in self.RESULT_OPERATORS:
+                ops.append(node)
+            node = node.childs[0]
+        return ops
+
+    def _graft_result_operators(self, ops, plan):
+        for op in reversed(ops):
+            node = QueryTree(op.type, op.val, [plan])
+            plan.parent = node
+            if op.type in ("SORT", "GROUP") and self.last_sort_avoided and order_column(op.val) == self.required_order:
+                node.physical["sort"] = "avoided"
+            plan = node
+        return plan
+
+    def _heuristic_optimize(self, tables, join_conditions, stats, deadline=None):
+        if self.bushy_plans and len(tables) <= self.dp_bushy_max_tables:
+            return self._dp_optimize(tables, join_conditions, stats, deadline)
+
+        if len(tables) <= self.dp_max_tables:
+            if self.join_enumerator == "bnb":
+                return self._bnb_optimize(tables, join_conditions, stats, deadline)
+            elif self.join_enumerator == "dp":
+                return self._dp_optimize(tables, join_conditions, stats, deadline)
+            raise ValueError(f"Unknown join enumerator: {self.join_enumerator}")
 
-    def _heuristic_optimize(self, tables, join_conditions, stats):
+        graph = JoinGraph(tables, join_conditions)
+        engine = self._cost_engine(stats)
         orders = _some_permutations(tables, max_count=10)
+        top = self._top_k()
         plans = []
         for order in orders:
-            plan = build_join_tree(order, join_conditions)
+            if deadline is not None and deadline.expired():
+                break
+            plan = build_join_tree(order, join_conditions, graph)
             if plan:
                 plans.append(plan)
+                if top is not None:
+                    top.offer(tuple(order), engine.plan_cost(plan))
         
         if not plans:
-            return build_join_tree(tables, join_conditions), float('inf')
+            if deadline is not None and deadline.expired():
+                return None, float('inf')
+            return build_join_tree(tables, join_conditions, graph), float('inf')
         
-        best = choose_best(plans, stats)
-        cost = plan_cost(best, stats)
+        best = engine.choose_best(plans)
+        cost = engine.plan_cost(best)
+        self._record_top_plans(top, graph, join_conditions, stats)
         return best, cost
 
-    def _genetic_algorithm_optimize(self, tables, join_conditions, stats):
+    def _dp_optimize(self, tables, join_conditions, stats, deadline=None):
+        graph = JoinGraph(tables, join_conditions)
+        engine = self._cost_engine(stats)
+        if self.bushy_plans and len(tables) <= self.dp_bushy_max_tables:
+            model = engine.search_model(graph, bushy=True)
+            shape, cost = dp_bushy_join_order(tables, join_conditions, stats, model, deadline=deadline, graph=graph)
+            if shape is None:
+                return None, cost
+            return build_bushy_join_tree(shape, join_conditions, graph), cost
+
+        if self.use_interesting_orders and self.required_order is not None:
+            return self._dp_orders_optimize(tables, join_conditions, stats, graph, deadline)
+
+        top = self._top_k()
+        order, cost = dp_join_order(tables, join_conditions, stats, engine.search_model(graph),
+                                    deadline=deadline, graph=graph, top_k=top)
+        if order is None:
+            return None, cost
+        self._record_top_plans(top, graph, join_conditions, stats)
+        return build_join_tree(order, join_conditions, graph), cost
+
+    def _dp_orders_optimize(self, tables, join_conditions, stats, graph, deadline=None):
+        engine = self._cost_engine(stats)
+        order, methods, cost, sorted_output = dp_join_order_orders(
+            tables, join_conditions, stats, self.required_order, engine.search_model(graph),
+            deadline=deadline, graph=graph
+        )
+        if order is None:
+            return None, cost
+        plan = build_join_tree(order, join_conditions, graph)
+
+        # join left-deep dari bawah sejajar dengan methods. hanya merge join
+        # yang dicatat: dipilih model demi order (bisa dipaksa), method lain
+        # dipilih ulang CostPlanner saat annotate_physical
+        joins = []
+        node = plan
+        while node.type == "JOIN":
+            joins.append(node)
+            node = node.childs[0]
+        for join, method in zip(reversed(joins), methods):
+            if method == "merge-join":
+                join.physical["join_method"] = method
+
+        # plan DP biasa + operator hasil bisa tetap lebih murah (GROUP dengan
+        # hash aggregation, model simple tanpa sort): interesting orders
+        # tidak boleh menghasilkan plan yang lebih mahal
+        plain, _ = dp_join_order(tables, join_conditions, stats, engine.search_model(graph),
+                                 deadline=deadline, graph=graph)
+        if plain is not None:
+            plain_plan = build_join_tree(plain, join_conditions, graph)
+            if self._ordered_cost(engine, plain_plan) < self._ordered_cost(engine, plan):
+                plan, sorted_output = plain_plan, False
+        self.last_sort_avoided = sorted_output
+        return plan, engine.plan_cost(plan)
+
+    def _ordered_cost(self, engine, plan):
+        """cost plan join + operator hasil (SORT / GROUP) yang meminta required_order"""
+        return engine.plan_cost(QueryTree(self._order_operator or "SORT", self.required_order, [plan]))
+
+    def _bnb_optimize(self, tables, join_conditions, stats, deadline=None):
+        graph = JoinGraph(tables, join_conditions)
+        model = self._cost_engine(stats).search_model(graph)
+        top = self._top_k()
+        order, cost = bnb_join_order(tables, join_conditions, stats, model, deadline=deadline, graph=graph,
+                                     top_k=top)
+        self._record_top_plans(top, graph, join_conditions, stats)
+        return build_join_tree(order, join_conditions, graph), cost
+
+    def _greedy_optimize(self, tables, join_conditions, stats):
+        graph = JoinGraph(tables, join_conditions)
+        order, cost = greedy_join_order(tables, join_conditions, stats, self._cost_engine(stats).search_model(graph),
+                                        graph)
+        return build_join_tree(order, join_conditions, graph), cost
+
+    def _star_optimize(self, tables, join_conditions, stats, deadline=None):
+        graph = JoinGraph(tables, join_conditions)
+        schema = detect_star_schema(tables, join_conditions, stats, self.star_fact_ratio, graph)
+        self.last_star_schema = schema
+        if schema is None:
+            return None, float('inf')
+
+        order = star_join_order(schema, stats, self.filter_selectivity)
+        plan = build_join_tree(order, join_conditions, graph)
+        engine = self._cost_engine(stats)
+        methods = choose_star_join_methods(schema, order, stats, self.filter_selectivity, engine.planner)
+
+        # join left-deep dari bawah sejajar dengan order[1:]
+        joins = []
+        node = plan
+        while node.type == "JOIN":
+            joins.append(node)
+            node = node.childs[0]
+        for join, physical in zip(reversed(joins), methods):
+            join.physical.update(physical)
+        return plan, engine.plan_cost(plan)
+
+    def _filter_selectivity(self, root, stats):
+        # selectivity konjungsi SIGMA yang hanya mereferensikan satu tabel
+        planner = CostPlanner(stats=stats)
+        aliases = _alias_map(root)
+        out = {}
+
+        def walk(n):
+            if n.type == "SIGMA":
+                for conj in _conjuncts(n.val):
+                    refs = _pred_tables(conj, aliases)
+                    if not refs or len(refs) != 1:
+                        continue
+                    if not isinstance(conj, (LogicalNode, ConditionNode)):
+                        continue
+                    table = next(iter(refs))
+                    out[table] = out.get(table, 1.0) * planner.selectivity(conj, table)
+            for c in n.childs:
+                walk(c)
+
+        walk(root)
+        return out
+
+    def _goo_optimize(self, tables, join_conditions, stats):
+        graph = JoinGraph(tables, join_conditions)
+        engine = self._cost_engine(stats)
+        shape, cost = goo_join_order(tables, join_conditions, stats, engine.search_model(graph, bushy=True),
+                                     engine.planner, graph)
+        return build_bushy_join_tree(shape, join_conditions, graph), cost
+
+    def _genetic_algorithm_optimize(self, tables, join_conditions, stats, deadline=None):
+        graph = JoinGraph(tables, join_conditions)
+        genes, bushy = self._search_genes(tables, join_conditions, graph)
+
+        # Fitness cache per optimasi, dengan prefix sharing untuk left-deep
+        model = self._cost_engine(stats).search_model(graph, bushy)
+        cache = FitnessCache(model)
+        top = self._attach_top_k(cache, tables, model, bushy)
+
+        # Pool dibuat sekali per optimasi; evaluator (genes + model) dikirim
+        # ke worker sekali lewat initializer
+        evaluator = FitnessEvaluator(tables, genes, model, bushy)
+
+        # graph untuk operator GA; encoding bushy sudah bebas cartesian
+        op_graph = graph if self.ga_connected_operators and not bushy else None
+
+        if self.ga_islands > 1:
+            best_individual, best_cost = self._ga_island_optimize(genes, evaluator, deadline, op_graph, cache)
+            self._record_top_plans(top, graph, join_conditions, stats, bushy)
+            return self._ga_build_plan(best_individual, best_cost, graph, join_conditions, model, bushy)
+
+        executor, evaluate = self._ga_make_executor(evaluator)
+        gene_index = {g: i for i, g in enumerate(genes)}
+
+        # compute=None: left-deep serial lewat trie prefix di FitnessCache
+        compute = None
+        if executor:
+            def compute(keys):
+                codes = [evaluator.encode(k, gene_index) for k in keys]
+                return parallel_costs(executor, evaluate, codes, self.ga_workers)
+        elif bushy:
+            def compute(keys):
+                return [decode_edge_order(list(k), tables, model)[1] for k in keys]
+
+        try:
+            best_individual, best_cost = self._ga_evolve(genes, cache, compute, deadline, op_graph)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        self.last_ga_stats = cache.stats()
+        self._record_top_plans(top, graph, join_conditions, stats, bushy)
+        return self._ga_build_plan(best_individual, best_cost, graph, join_conditions, model, bushy)
+
+    def _search_genes(self, tables, join_conditions, graph):
+        # Bushy encoding: individu = permutasi edge join graph (decode_edge_order)
+        if self.bushy_plans:
+            edges = join_graph_edges(tables, join_conditions, graph)
+            if len(edges) > 1:
+                return edges, True
+        return tables, False
+
+    def _simulated_annealing_optimize(self, tables, join_conditions, stats, deadline=None):
+        graph = JoinGraph(tables, join_conditions)
+        genes, bushy = self._search_genes(tables, join_conditions, graph)
+        model = self._cost_engine(stats).search_model(graph, bushy)
+        cache = FitnessCache(model)
+        top = self._attach_top_k(cache, tables, model, bushy)
+        op_graph = graph if self.ga_connected_operators and not bushy else None
+        rng = random.Random(self.sa_seed) if self.sa_seed is not None else random
+
+        compute = None
+        if bushy:
+            def compute(keys):
+                return [decode_edge_order(list(k), tables, model)[1] for k in keys]
+
+        def cost_of(individual):
+            return cache.costs([tuple(individual)], compute)[0]
+
+        # Titik awal: greedy (left-deep) atau edge order acak (bushy)
+        if bushy:
+            current = genes[:]
+            rng.shuffle(current)
+        else:
+            current, _ = greedy_join_order(tables, join_conditions, stats, model, graph)
+        current_cost = cost_of(current)
+        best, best_cost = current[:], current_cost
+
+        evaluations = 1
+        accepted = 0
+        temperature = 0.0
+        if len(genes) >= 3:
+            temperature, samples = self._sa_initial_temperature(current, current_cost, cost_of, rng, op_graph)
+            evaluations += samples
+        t_min = temperature * self.sa_min_temperature_ratio
+        steps_per_temperature = self.sa_steps_per_temperature
+        if steps_per_temperature is None:
+            # sebar tahap cooling (T0 -> T0 * min_ratio) merata di evaluation cap
+            stages = math.log(self.sa_min_temperature_ratio) / math.log(self.sa_cooling_rate)
+            steps_per_temperature = self.sa_max_evaluations / stages
+
+        step = 0
+        next_cooling = steps_per_temperature
+        while len(genes) >= 3 and evaluations < self.sa_max_evaluations and temperature > t_min:
+            if deadline is not None and deadline.expired():
+                break
+            neighbor = self._sa_neighbor(current, rng, op_graph)
+            cost = cost_of(neighbor)
+            evaluations += 1
+
+            delta = cost - current_cost
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                current, current_cost = neighbor, cost
+                accepted += 1
+                if cost < best_cost:
+                    best, best_cost = neighbor[:], cost
+
+            # Cooling geometrik setiap steps_per_temperature langkah
+            step += 1
+            while step >= next_cooling:
+                temperature *= self.sa_cooling_rate
+                next_cooling += steps_per_temperature
+
+        self.last_sa_stats = dict(
+            cache.stats(), evaluations=evaluations, accepted=accepted, final_temperature=temperature
+        )
+        self._record_top_plans(top, graph, join_conditions, stats, bushy)
+        return self._ga_build_plan(best, best_cost, graph, join_conditions, model, bushy)
+
+    def _sa_initial_temperature(self, current, current_cost, cost_of, rng, graph=None):
+        # T0: move naik rata-rata diterima dengan peluang 1/2 di awal
+        samples = min(20, max(1, self.sa_max_evaluations // 10))
+        uphill = []
+        for _ in range(samples):
+            delta = cost_of(self._sa_neighbor(current, rng, graph)) - current_cost
+            if delta > 0:
+                uphill.append(delta)
+        if uphill:
+            return sum(uphill) / len(uphill) / math.log(2), samples
+        return max(1.0, current_cost * 0.01), samples
+
+    def _sa_neighbor(self, individual, rng=random, graph=None):
+        n = len(individual)
+        move = rng.choice(self.sa_moves)
+        neighbor = individual[:]
+        if move == "swap":
+            i, j = rng.sample(range(n), 2)
+            neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
+        elif move == "cycle3":
+            i, j, k = sorted(rng.sample(range(n), 3))
+            neighbor[i], neighbor[j], neighbor[k] = individual[k], individual[i], individual[j]
+        elif move == "segment":
+            # tukar dua segmen berurutan: padanan subtree exchange di urutan
+            # left-deep / edge order
+            a, b, c, d = sorted(rng.sample(range(n + 1), 4))
+            neighbor = individual[:a] + individual[c:d] + individual[b:c] + individual[a:b] + individual[d:]
+        else:
+            raise ValueError(f"Unknown SA move: {move}")
+
+        if graph is not None:
+            neighbor = self._ga_repair(neighbor, graph)
+        return neighbor
+
+    def _top_k(self):
+        return TopKPlans(self.plan_top_k) if self.plan_top_k > 1 else None
+
+    def _attach_top_k(self, cache, tables, model, bushy):
+        # individu bushy (edge order) dibedakan berdasarkan shape hasil decode
+        top = self._top_k()
+        cache.top_k = top
+        if top is not None and bushy:
+            cache.plan_key = lambda key: decode_edge_order(list(key), tables, model)[0]
+        return top
+
+    def _record_top_plans(self, top, graph, join_conditions, stats, bushy=False):
+        if top is None:
+            return
+        build = build_bushy_join_tree if bushy else build_join_tree
+        self.last_top_plans = [
+            self._plan_entry(build(key if bushy else list(key), join_conditions, graph), cost, stats)
+            for key, cost in top.items()
+        ]
+
+    def _plan_entry(self, plan, cost, stats):
+        return {"plan": plan, "cost": cost, "breakdown": self._cost_engine(stats).breakdown(plan)}
+
+    def _memory(self):
+        return self.query_memory or self.memory
+
+    def _cost_engine(self, stats, model=None):
+        return CostEngine(stats, model or self.cost_model, self.aliases, memory=self._memory(),
+                          cpu=self.cpu_weights)
+
+    def recost_top_plans(self):
+        """
+        hitung ulang last_top_plans dengan model "planner" (sadar index dan join
+        method), isi planner_cost, dan kembalikan urut dari yang termurah.
+        sama dengan cost kalau cost_model sudah "planner".
+        """
+        engine = self._cost_engine(get_stats(), "planner")
+        for entry in self.last_top_plans:
+            entry["planner_cost"] = engine.plan_cost(entry["plan"])
+        return sorted(self.last_top_plans, key=lambda e: e["planner_cost"])
+
+    def _ga_build_plan(self, best_individual, best_cost, graph, join_conditions, model, bushy):
+        # deadline habis sebelum generasi pertama selesai dievaluasi
+        if best_individual is None:
+            return None, best_cost
+
+        # Build final best plan
+        if bushy:
+            shape, _ = decode_edge_order(best_individual, graph.tables, model)
+            best_plan = build_bushy_join_tree(shape, join_conditions, graph)
+        else:
+            best_plan = build_join_tree(best_individual, join_conditions, graph)
+        return best_plan, best_cost
+
+    def _ga_island_optimize(self, genes, evaluator, deadline=None, graph=None, cache=None):
+        # cache (FitnessCache, opsional): top_k dan plan_key-nya menerima k
+        # individu termurah tiap island, sama seperti GA satu populasi
+        n = self.ga_islands
+        top_k = cache.top_k.k if cache is not None and cache.top_k is not None else 0
+        islands = []
+        for i in range(n):
+            mutation_rate, crossover_rate = self._ga_island_rates(i, n)
+            rng = random.Random(random.randrange(2 ** 32))
+            islands.append({
+                "population": self._ga_initialize_population(genes, rng, graph),
+                "rng": rng,
+                "graph": graph,
+                "mutation_rate": mutation_rate,
+                "crossover_rate": crossover_rate,
+                "best": (None, float('inf')),
+                "top_k": top_k,
+                "top": [],
+                "stats": {},
+            })
+
+        executor = None
+        if self.ga_workers > 1 and self.ga_executor == "process":
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.ga_workers, n),
+                initializer=_init_fitness_worker,
+                initargs=(evaluator,)
+            )
+
+        epochs = 0
+        remaining = self.ga_generations
+        try:
+            while remaining > 0:
+                if deadline is not None and deadline.expired():
+                    break
+                step = min(self.ga_migration_interval, remaining)
+                # sisa waktu dikirim sebagai angka: clock perf_counter tidak
+                # bisa dibandingkan antar proses worker
+                budget_ms = None if deadline is None or deadline.budget_ms is None else deadline.remaining_ms()
+                if executor:
+                    futures = [executor.submit(self._ga_island_epoch, isl, step, None, budget_ms)
+                               for isl in islands]
+                    islands = [f.result() for f in futures]
+                else:
+                    islands = [self._ga_island_epoch(isl, step, evaluator, budget_ms) for isl in islands]
+                remaining -= step
+                epochs += 1
+                if remaining > 0:
+                    self._ga_migrate(islands)
+        finally:
+            if executor:
+                executor.shutdown()
+
+        # statistik cache dijumlah per island (di mode process cache ada di worker)
+        totals = {}
+        for isl in islands:
+            for key, value in isl["stats"].items():
+                totals[key] = totals.get(key, 0) + value
+            if top_k:
+                for key, cost in isl["top"]:
+                    cache.top_k.offer(cache.plan_key(key) if cache.plan_key else key, cost)
+        self.last_ga_stats = dict(totals, islands=n, epochs=epochs)
+        return min((isl["best"] for isl in islands), key=lambda b: b[1])
+
+    def _ga_island_rates(self, i, n):
+        # rate tiap island disebar 0.5x..1.5x dari rate dasar (crossover berlawanan arah)
+        spread = i / (n - 1) if n > 1 else 0.5
+        mutation_rate = min(1.0, self.ga_mutation_rate * (0.5 + spread))
+        crossover_rate = min(1.0, self.ga_crossover_rate * (1.5 - spread))
+        return mutation_rate, crossover_rate
+
+    def _ga_island_epoch(self, island, generations, evaluator=None, budget_ms=None):
+        # dijalankan di proses worker (evaluator dari initializer) atau lokal;
+        # budget_ms: sisa waktu optimasi, generasi berhenti kalau habis
+        if evaluator is None:
+            evaluator = _worker_evaluator()
+        deadline = Deadline(budget_ms)
+        rng = island["rng"]
+        population = island["population"]
+        best = island["best"]
+        before = evaluator.cache_stats()
+        top = TopKPlans(island["top_k"]) if island["top_k"] else None
+        if top is not None:
+            for key, cost in island["top"]:
+                top.offer(key, cost)
+
+        for _ in range(generations + 1):
+            costs = evaluator.costs([tuple(ind) for ind in population])
+            if top is not None:
+                for ind, cost in zip(population, costs):
+                    top.offer(tuple(ind), cost)
+            fitness_scores = sorted(zip(population, costs), key=lambda x: x[1])
+            if fitness_scores[0][1] < best[1]:
+                best = fitness_scores[0]
+            if generations == 0 or deadline.expired():
+                break
+            generations -= 1
+            population = self._ga_next_generation(
+                fitness_scores, rng, island["mutation_rate"], island["crossover_rate"], island["graph"]
+            )
+
+        # populasi disimpan terurut supaya elite/worst mudah diambil saat migrasi
+        island["population"] = [ind for ind, _ in fitness_scores]
+        island["best"] = best
+        after = evaluator.cache_stats()
+        island["stats"] = {key: island["stats"].get(key, 0) + value - before.get(key, 0)
+                           for key, value in after.items()}
+        if top is not None:
+            island["top"] = top.items()
+        return island
+
+    def _ga_migrate(self, islands):
+        # ring: elite island i menggantikan individu terburuk island i+1
+        k = min(self.ga_migration_size, self.ga_population_size - 1)
+        if k <= 0:
+            return
+        elites = [[ind[:] for ind in isl["population"][:k]] for isl in islands]
+        for i, isl in enumerate(islands):
+            incoming = elites[i - 1]
+            isl["population"] = isl["population"][:-k] + incoming
+
+    def _ga_evolve(self, genes, cache, compute=None, deadline=None, graph=None):
         # Initialize population
-        population = self._ga_initialize_population(tables)
+        population = self._ga_initialize_population(genes, random, graph)
         
         best_individual = None
         best_cost = float('inf')
         
         for generation in range(self.ga_generations):
+            # Anytime: berhenti di antara generasi, best sejauh ini tetap dipakai
+            if deadline is not None and deadline.expired():
+                break
+
             # Evaluate fitness
-            fitness_scores = []
-            for individual in population:
-                plan = build_join_tree(individual, join_conditions)
-                cost = plan_cost(plan, stats) if plan else float('inf')
-                fitness_scores.append((individual, cost))
+            costs = cache.costs([tuple(ind) for ind in population], compute)
+            fitness_scores = list(zip(population, costs))
             
             # Sort by cost (lower is better)
             fitness_scores.sort(key=lambda x: x[1])
@@ -356,6 +1019,8 @@ class OptimizationEngine:
             if fitness_scores[0][1] < best_cost:
                 best_individual = fitness_scores[0][0]
                 best_cost = fitness_scores[0][1]
+                if self.ga_prune:
+                    cache.bound = best_cost
             
             # Early stopping if converged
             if generation > 10:
@@ -363,62 +1028,141 @@ class OptimizationEngine:
                 if len(set(recent_costs)) == 1:
                     break
             
-            # Elitism: keep best individuals
-            new_population = [ind for ind, _ in fitness_scores[:self.ga_elite_size]]
+            population = self._ga_next_generation(fitness_scores, graph=graph)
+        
+        return best_individual, best_cost
+
+    def _ga_next_generation(self, fitness_scores, rng=random, mutation_rate=None, crossover_rate=None, graph=None):
+        # fitness_scores sudah terurut (cost terkecil dulu)
+        if mutation_rate is None:
+            mutation_rate = self.ga_mutation_rate
+        if crossover_rate is None:
+            crossover_rate = self.ga_crossover_rate
+
+        # Elitism: keep best individuals
+        new_population = [ind for ind, _ in fitness_scores[:self.ga_elite_size]]
+        
+        # Generate rest of population
+        while len(new_population) < self.ga_population_size:
+            # Selection
+            parent1 = self._ga_tournament_selection(fitness_scores, rng)
+            parent2 = self._ga_tournament_selection(fitness_scores, rng)
             
-            # Generate rest of population
-            while len(new_population) < self.ga_population_size:
-                # Selection
-                parent1 = self._ga_tournament_selection(fitness_scores)
-                parent2 = self._ga_tournament_selection(fitness_scores)
-                
-                # Crossover
-                if random.random() < self.ga_crossover_rate:
-                    child1, child2 = self._ga_crossover(parent1, parent2)
-                else:
-                    child1, child2 = parent1[:], parent2[:]
-                
-                # Mutation
-                if random.random() < self.ga_mutation_rate:
-                    child1 = self._ga_mutate(child1)
-                if random.random() < self.ga_mutation_rate:
-                    child2 = self._ga_mutate(child2)
-                
-                new_population.append(child1)
-                if len(new_population) < self.ga_population_size:
-                    new_population.append(child2)
+            # Crossover
+            if rng.random() < crossover_rate:
+                child1, child2 = self._ga_crossover(parent1, parent2, rng)
+            else:
+                child1, child2 = parent1[:], parent2[:]
+            
+            # Mutation
+            if rng.random() < mutation_rate:
+                child1 = self._ga_mutate(child1, rng)
+            if rng.random() < mutation_rate:
+                child2 = self._ga_mutate(child2, rng)
+
+            # Repair: kembalikan setiap prefix ke kondisi terhubung
+            if graph is not None:
+                child1 = self._ga_repair(child1, graph)
+                child2 = self._ga_repair(child2, graph)
             
-            population = new_population
+            new_population.append(child1)
+            if len(new_population) < self.ga_population_size:
+                new_population.append(child2)
         
-        # Build final best plan
-        best_plan = build_join_tree(best_individual, join_conditions)
-        return best_plan, best_cost
+        return new_population
+
+    def _ga_make_executor(self, evaluator):
+        # return (executor, fungsi evaluasi batch) atau (None, None) untuk serial
+        if self.ga_workers <= 1:
+            return None, None
+        if self.ga_executor == "thread":
+            return ThreadPoolExecutor(max_workers=self.ga_workers), evaluator.evaluate
+        if self.ga_executor == "process":
+            executor = ProcessPoolExecutor(
+                max_workers=self.ga_workers,
+                initializer=_init_fitness_worker,
+                initargs=(evaluator,)
+            )
+            return executor, _evaluate_in_worker
+        raise ValueError(f"Unknown GA executor: {self.ga_executor}")
+
+    def _ga_initialize_population(self, tables, rng=random, graph=None):
+        if graph is not None:
+            return self._ga_connected_population(tables, rng, graph)
 
-    def _ga_initialize_population(self, tables):
         population = []
         
         population.append(tables[:])
         
         population.append(tables[::-1])
         
+        # individu unik tidak bisa lebih banyak dari jumlah permutasi
+        distinct = math.factorial(len(tables))
         while len(population) < self.ga_population_size:
             individual = tables[:]
-            random.shuffle(individual)
-            if individual not in population:
+            rng.shuffle(individual)
+            if individual not in population or len(population) >= distinct:
                 population.append(individual)
         
         return population
 
-    def _ga_tournament_selection(self, fitness_scores):
-        tournament = random.sample(fitness_scores, min(self.ga_tournament_size, len(fitness_scores)))
+    def _ga_connected_population(self, tables, rng, graph):
+        population = [self._ga_repair(tables[:], graph), self._ga_repair(tables[::-1], graph)]
+
+        # jumlah urutan terhubung bisa lebih kecil dari ukuran populasi
+        # (misal chain pendek), jadi duplikat diizinkan setelah banyak percobaan
+        attempts = 0
+        while len(population) < self.ga_population_size:
+            individual = self._ga_random_connected_order(graph, rng)
+            attempts += 1
+            if individual not in population or attempts > 10 * self.ga_population_size:
+                population.append(individual)
+
+        return population
+
+    def _ga_random_connected_order(self, graph, rng=random):
+        # random walk atas frontier: tabel berikutnya selalu tetangga prefix
+        start = rng.randrange(graph.n)
+        order = [start]
+        mask = 1 << start
+        frontier = graph.nbr[start]
+        while len(order) < graph.n:
+            candidates = frontier & ~mask or graph.full & ~mask
+            ids = graph.names(candidates)
+            nxt = graph.index[ids[rng.randrange(len(ids))]]
+            order.append(nxt)
+            mask |= 1 << nxt
+            frontier |= graph.nbr[nxt]
+        return [graph.tables[i] for i in order]
+
+    def _ga_repair(self, individual, graph):
+        # pertahankan urutan relatif: ambil tabel pertama yang masih menunggu
+        # dan terhubung ke prefix; kalau tidak ada (graph tidak terhubung),
+        # tabel pertama yang menunggu (cartesian)
+        pending = individual[:]
+        order = [pending.pop(0)]
+        mask = 1 << graph.index[order[0]]
+        while pending:
+            pos = 0
+            for k, t in enumerate(pending):
+                if graph.joins(mask, graph.index[t]):
+                    pos = k
+                    break
+            t = pending.pop(pos)
+            order.append(t)
+            mask |= 1 << graph.index[t]
+        return order
+
+    def _ga_tournament_selection(self, fitness_scores, rng=random):
+        tournament = rng.sample(fitness_scores, min(self.ga_tournament_size, len(fitness_scores)))
         winner = min(tournament, key=lambda x: x[1])
         return winner[0][:]
 
-    def _ga_crossover(self, parent1, parent2):
+    def _ga_crossover(self, parent1, parent2, rng=random):
         size = len(parent1)
         
-        point1 = random.randint(0, size - 1)
-        point2 = random.randint(point1 + 1, size)
+        point1 = rng.randint(0, size - 1)
+        point2 = rng.randint(point1 + 1, size)
         
         child1 = [None] * size
         child2 = [None] * size
@@ -443,10 +1187,10 @@ class OptimizationEngine:
                 current_pos = (current_pos + 1) % size
             parent_pos = (parent_pos + 1) % size
 
-    def _ga_mutate(self, individual):
+    def _ga_mutate(self, individual, rng=random):
         individual = individual[:]
         if len(individual) > 1:
-            idx1, idx2 = random.sample(range(len(individual)), 2)
+            idx1, idx2 = rng.sample(range(len(individual)), 2)
             individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
         return individual
 
@@ -470,10 +1214,9 @@ class OptimizationEngine:
         #     pass
         # ===========================================================================
         
-        # Fallback to dummy stats
+        # Fallback to dummy stats, model yang sama dengan join search
         root = parsed_query.query_tree
-        stats = get_stats()
-        return plan_cost(root, stats)
+        return int(self._cost_engine(get_stats()).plan_cost(root))
     
     def optimize_query_non_join(self, pq: ParsedQuery) -> ParsedQuery:
         if not pq or not pq.query_tree:
@@ -507,7 +1250,30 @@ class OptimizationEngine:
         return node
     
     def _extract_join_conditions_from_tree(self, node: QueryTree) -> dict:
+        # edge join graph diambil dari tabel yang benar-benar direferensikan
+        # predikat (alias di-resolve); predikat yang tabelnya tidak bisa
+        # dipastikan tetap memakai semua pasangan kiri x kanan seperti dulu
         mapping = {}
+        aliases = _alias_map(node) if node else {}
+        all_tables = _tables_under(node) if node else set()
+
+        def add_edges(conds, left_tables, right_tables):
+            # return False kalau ada konjungsi yang tabelnya tidak diketahui
+            per_pair = {}
+            resolved = True
+            for conj in conds:
+                refs = _pred_tables(conj, aliases)
+                if refs is None:
+                    resolved = False
+                    continue
+                for lt in refs & left_tables:
+                    for rt in refs & right_tables:
+                        if lt != rt:
+                            per_pair.setdefault(frozenset({lt, rt}), []).append(conj)
+            for key, preds in per_pair.items():
+                pred = preds[0] if len(preds) == 1 else LogicalNode("AND", preds)
+                mapping.setdefault(key, str(pred))
+            return resolved and bool(per_pair)
 
         def walk(n):
             if n is None:
@@ -515,15 +1281,18 @@ class OptimizationEngine:
 
             if n.type == "JOIN":
                 pred = ""
+                cond = None
 
                 try:
                     pred = _theta_pred(n)
                 except:
                     pred = ""
 
+                if hasattr(n.val, "condition"):
+                    cond = n.val.condition
                 if not pred:
-                    if hasattr(n.val, "condition"):
-                        pred = str(n.val.condition)
+                    if cond is not None:
+                        pred = str(cond)
                     elif isinstance(n.val, str):
                         s = n.val.strip()
                         if s.upper().startswith("THETA:"):
@@ -532,19 +1301,28 @@ class OptimizationEngine:
                             pred = s
 
                 if pred:
-                    left_list = list(_tables_under(n.childs[0]))
-                    right_list = list(_tables_under(n.childs[1]))
+                    left_tables = _tables_under(n.childs[0])
+                    right_tables = _tables_under(n.childs[1])
+                    conds = _conjuncts(cond if cond is not None else pred)
 
-                    if left_list and right_list:
-                        key = frozenset({left_list[0], right_list[0]})
-                        mapping[key] = pred
+                    if left_tables and right_tables and not add_edges(conds, left_tables, right_tables):
+                        left_list = list(left_tables)
+                        right_list = list(right_tables)
+                        mapping.setdefault(frozenset({left_list[0], right_list[0]}), pred)
 
                         for lt in left_list:
                             for rt in right_list:
                                 mapping.setdefault(frozenset({lt, rt}), pred)
 
+            elif n.type == "SIGMA" and n.val is not None:
+                # predikat join yang masih berupa seleksi (WHERE a.x = b.y)
+                for conj in _conjuncts(n.val):
+                    refs = _pred_tables(conj, aliases)
+                    if refs and len(refs) == 2 and refs <= all_tables:
+                        mapping.setdefault(frozenset(refs), str(conj))
+
             for c in getattr(n, "childs", []):
                 walk(c)
 
         walk(node)
-        return mapping
\ No newline at end of file
+        return mapping
@@ -0,0 +1,101 @@
+from QueryOptimizer import OptimizationEngine
+from helper.join_order import dp_join_order
+from helper.join_strategy import select_join_strategy
+from tests.queries import star_query
+import random
+import time
+
+
+def run_ga(optimizer, tables, conds, stats, seed):
+    random.seed(seed)
+    _, cost = optimizer._genetic_algorithm_optimize(tables, conds, stats)
+    return cost, optimizer.last_ga_stats
+
+
+def run_sa(optimizer, tables, conds, stats, seed):
+    optimizer.sa_seed = seed
+    _, cost = optimizer._simulated_annealing_optimize(tables, conds, stats)
+    return cost, optimizer.last_sa_stats
+
+
+def compare(sizes=(10, 12, 14, 20, 30), seeds=range(5)):
+    """
+    GA vs SA pada query star: rasio cost terhadap acuan (optimum DP kalau
+    n <= dp_max_tables, selain itu cost terbaik dari kedua metode), jumlah
+    plan yang benar-benar dihitung plan_cost (cache miss), jumlah evaluasi
+    join inkremental dan waktu.
+    """
+    optimizer = OptimizationEngine()
+    methods = [("GA", run_ga), ("SA", run_sa)]
+
+    print("\n" + "="*70)
+    print("GA vs SIMULATED ANNEALING (star / snowflake)")
+    print("="*70)
+    print(f"{'Tables':<8} {'Method':<8} {'Cost ratio':<12} {'Worst':<10} {'Plans':<10} {'Join evals':<12} {'Time':<10}")
+    print("-"*70)
+
+    for n in sizes:
+        rows = {name: [] for name, _ in methods}
+        for seed in seeds:
+            tables, conds, stats = star_query(n, seed)
+            results = {}
+            for name, run in methods:
+                start = time.time()
+                cost, counters = run(optimizer, tables, conds, stats, seed)
+                results[name] = (cost, counters, time.time() - start)
+
+            if n <= optimizer.dp_max_tables:
+                reference = dp_join_order(tables, conds, stats)[1]
+            else:
+                reference = min(cost for cost, _, _ in results.values())
+            for name, (cost, counters, elapsed) in results.items():
+                rows[name].append((cost / reference, counters["misses"], counters["join_evals"], elapsed))
+
+        for name, _ in methods:
+            r = rows[name]
+            k = len(r)
+            print(f"{n:<8} {name:<8} {sum(x[0] for x in r) / k:<12.4f} {max(x[0] for x in r):<10.4f} "
+                  f"{sum(x[1] for x in r) / k:<10.1f} {sum(x[2] for x in r) / k:<12.1f} "
+                  f"{sum(x[3] for x in r) / k * 1000:.2f}ms")
+        print("-"*70)
+
+
+def compare_cost_models(sizes=(4, 8, 12, 15, 20, 30), seeds=range(3)):
+    """
+    latency strategi join (pilihan auto) dengan cost_model "simple" vs
+    "planner", dan cost plan terpilih menurut CostPlanner (model yang dipakai
+    get_cost). Rasio cost > 1 berarti plan model simple lebih mahal.
+    """
+    print("\n" + "="*70)
+    print("COST MODEL: simple vs planner")
+    print("="*70)
+    print(f"{'Tables':<8} {'Strategy':<10} {'Simple':<12} {'Planner':<12} {'Slowdown':<10} {'Cost ratio':<10}")
+    print("-"*70)
+
+    for n in sizes:
+        times = {"simple": 0.0, "planner": 0.0}
+        ratios = []
+        for seed in seeds:
+            tables, conds, stats = star_query(n, seed)
+            plans = {}
+            for model in times:
+                optimizer = OptimizationEngine()
+                optimizer.cost_model = model
+                optimizer.sa_seed = seed
+                random.seed(seed)
+                strategy = select_join_strategy(optimizer, tables, conds, stats)
+                start = time.time()
+                plans[model], _ = strategy.run(optimizer, tables, conds, stats, None)
+                times[model] += time.time() - start
+            engine = optimizer._cost_engine(stats, "planner")
+            ratios.append(engine.plan_cost(plans["simple"]) / engine.plan_cost(plans["planner"]))
+
+        k = len(ratios)
+        print(f"{n:<8} {strategy.name:<10} {times['simple'] / k * 1000:<12.2f} {times['planner'] / k * 1000:<12.2f} "
+              f"{times['planner'] / max(times['simple'], 1e-9):<10.2f} {sum(ratios) / k:<10.3g}")
+    print("-"*70)
+
+
+if __name__ == "__main__":
+    compare()
+    compare_cost_models()
@@ -17,6 +17,11 @@ def print_query_tree(node, indent=0, is_last=True, prefix=""):
     # Format node value based on type
     val_str = _format_node_value(node)
     
+    if getattr(node, 'physical', None) and node.physical.get('join_method'):
+        val_str += f" [{node.physical['join_method']}]"
+    if getattr(node, 'physical', None) and node.physical.get('access_path'):
+        val_str += f" [{node.physical['access_path']}]"
+    
     print(f"{prefix}{connector}{node.type}: {val_str}")
     
     # Print children
@@ -188,7 +193,7 @@ def run_test_query(query_name, query, optimizer, verbose=True):
         improvement_pct = (improvement / cost_before * 100) if cost_before > 0 else 0
         
         print("\n>>> OPTIMIZATION RESULTS:")
-        print(f"  Cost reduction:    {improvement:,} blocks")
+        print(f"  Cost reduction:    {improvement:,} cost units")
         print(f"  Improvement:       {improvement_pct:.2f}%")
         print(f"  Parse time:        {parse_time*1000:.2f}ms")
         print(f"  Optimization time: {optimize_time*1000:.2f}ms")
@@ -197,7 +202,7 @@ def run_test_query(query_name, query, optimizer, verbose=True):
         # Determine optimization method used
         tables = list(optimizer._extract_join_conditions_from_tree(parsed.query_tree).keys())
         num_tables = len(set([t for pair in tables for t in pair])) if tables else 1
-        method_used = "GA + Heuristic" if num_tables >= optimizer.ga_threshold_tables else "Heuristic"
+        method_used = optimizer.last_strategy or "none"
         print(f"  Method used:       {method_used}")
         print(f"  Number of tables:  {num_tables}")
         
@@ -257,12 +262,13 @@ def print_summary(results):
         print(f"{'TOTAL':<30} {total_before:<12,} {total_after:<12,} {total_improvement_pct:.2f}%")
         
         # Method usage statistics
-        ga_used = sum(1 for r in successful if 'GA' in r.get('method', ''))
-        heuristic_only = sum(1 for r in successful if r.get('method', '') == 'Heuristic')
+        methods = {}
+        for r in successful:
+            methods[r.get('method', 'none')] = methods.get(r.get('method', 'none'), 0) + 1
         
         print(f"\n>>> OPTIMIZATION METHODS:")
-        print(f"  GA + Heuristic: {ga_used} queries")
-        print(f"  Heuristic only: {heuristic_only} queries")
+        for method, count in sorted(methods.items()):
+            print(f"  {method:<15} {count} queries")
         
         # Performance statistics
         avg_parse = sum(r['parse_time'] for r in successful) / len(successful)
@@ -300,7 +306,10 @@ if __name__ == "__main__":
     print(f"GA Generations:    {optimizer.ga_generations}")
     print(f"GA Mutation Rate:  {optimizer.ga_mutation_rate}")
     print(f"GA Crossover Rate: {optimizer.ga_crossover_rate}")
-    print(f"GA Threshold:      {optimizer.ga_threshold_tables} tables")
+    print(f"DP Max Tables:     {optimizer.dp_max_tables} tables")
+    print(f"SA Enabled:        {optimizer.use_sa}")
+    print(f"SA Max Evals:      {optimizer.sa_max_evaluations}")
+    print(f"Join Strategy:     {optimizer.join_strategy}")
     
     # Test queries
     test_queries = [
@@ -5,20 +5,224 @@ File ini tabel-tabelnya masih pakai dummy, jalankan python tests/UnitTestingCost
 - l_r: size of a tuple of r
 - f_r: blocking factor of r (number of tuples that fit in one block)
 - V(A,r): number of distinct values for attribute A in relation r
+- histograms: {attribute: bound bucket equi-depth} (opsional, lihat helper.histogram)
+- mcv: {attribute: {value: frekuensi}} most-common-values (opsional, lihat helper.histogram)
+- indexes: {attribute: {"type": "b+" | "hash", "value": kedalaman / jumlah bucket,
+  "primary": True kalau index clustering (file terurut pada atribut itu),
+  "include": [kolom lain yang ikut disimpan di index], "leaf_blocks": jumlah block leaf}}
+  ("primary", "include", "leaf_blocks" opsional); index yang mencakup semua kolom
+  yang dibutuhkan scan dipakai untuk index-only scan
+- widths: {attribute: byte} / schema: [ColumnDefinition, ...] (opsional, lihat
+  helper.widths); lebar kolom untuk l_r, f_r, b_r hasil projection dan join,
+  tanpa keduanya l_r dibagi rata ke kolom v_a_r
+- primary_key: [attribute, ...], foreign_keys: {attribute: "ref_table.ref_column"}
+  (opsional, seperti CREATE TABLE) untuk deteksi key/foreign key saat estimasi join
+- m: buffer blocks untuk sort / join dari MemoryConfig (helper.memory); setiap
+  cost info membawa memory_blocks operator dan peak_memory_blocks subplan
+- cost = io_cost (block I/O) + cpu_cost (bobot CpuWeights per tuple dan per
+  evaluasi predikat, helper.cpu_cost), ketiganya kumulatif per subplan
+
 """
 
-from model.query_tree import QueryTree, ConditionNode, LogicalNode, ColumnNode, ThetaJoin
+from model.query_tree import QueryTree, ConditionNode, LogicalNode, ColumnNode, ThetaJoin, OrderByItem
 from model.parsed_query import ParsedQuery
+from helper.histogram import as_histogram, as_mcv, _numeric
+from helper.memory import memory_config
+from helper.cpu_cost import cpu_weights, sort_comparisons
+from helper.widths import column_widths, tuple_width
 import math
+import re
+
+
+# "a.x = b.y" (boleh dibungkus THETA:/Cond(...)), untuk predikat join berbentuk string
+_EQUI_JOIN = re.compile(r"(?:([A-Za-z_]\w*)\.)?([A-Za-z_]\w*)\s*=\s*(?:([A-Za-z_]\w*)\.)([A-Za-z_]\w*)")
+
+
+def external_sort_cost(b_r, buffer_blocks=100) -> int:
+    """
+    cost external merge sort (tanpa cost membaca input):
+        - in-memory (b_r <= m): b_r
+        - external: 2 * b_r * (1 + ceil(log_{m-1}(b_r / m)))
+    """
+    M = buffer_blocks
+    if b_r <= M:
+        return b_r
+    num_runs = math.ceil(b_r / M)
+    num_passes = math.ceil(math.log(num_runs, M - 1)) if M > 1 else 1
+    return 2 * b_r * (1 + num_passes)
+
+
+def block_nested_loop_cost(outer_b, inner_b, buffer_blocks=100) -> int:
+    """
+    cost block nested-loop join (outer = input kiri), m buffer blocks:
+        - inner muat di memory (b_s <= m - 2): b_r + b_s
+        - selain itu: ceil(b_r / (m - 2)) * b_s + b_r
+    """
+    chunk = max(1, buffer_blocks - 2)
+    if inner_b <= chunk:
+        return outer_b + inner_b
+    return math.ceil(outer_b / chunk) * inner_b + outer_b
+
+
+def hash_join_cost(b_r, b_s, buffer_blocks=100) -> int:
+    """
+    cost hash join, build side = input terkecil, m buffer blocks:
+        - in-memory (build <= m - 2): b_r + b_s
+        - grace hash join: 2 * (b_r + b_s) * passes + b_r + b_s,
+          passes = max(1, ceil(log_{m-1}(build) - 1)) (partisi rekursif)
+    """
+    build = min(b_r, b_s)
+    if build <= max(1, buffer_blocks - 2):
+        return b_r + b_s
+    passes = max(1, math.ceil(math.log(build, buffer_blocks - 1) - 1)) if buffer_blocks > 2 else 1
+    return 2 * (b_r + b_s) * passes + b_r + b_s
+
+
+def sort_memory(b_r, buffer_blocks=100) -> int:
+    """memory (blocks) external sort: seluruh input kalau muat, selain itu m"""
+    return min(max(1, b_r), buffer_blocks)
+
+
+def order_column(key):
+    """
+    nama kolom pertama dari key SORT/GROUP (list OrderByItem / ColumnNode /
+    string "t.col ASC"), None kalau tidak dikenali. order dibandingkan per
+    nama kolom, sama seperti v_a_r.
+    """
+    if isinstance(key, (list, tuple)):
+        return order_column(key[0]) if key else None
+    if isinstance(key, OrderByItem):
+        return order_column(key.column)
+    if isinstance(key, ColumnNode):
+        return key.column
+    if isinstance(key, dict):
+        return key.get("column")
+    if isinstance(key, str) and key.strip():
+        return key.strip().split()[0].split(".")[-1]
+    return None
+
+
+def _histograms(raw) -> dict:
+    # {kolom: EquiDepthHistogram} dari entry stats "histograms"; entry tidak valid dibuang
+    out = {}
+    for attr, value in (raw or {}).items():
+        histogram = as_histogram(value)
+        if histogram is not None:
+            out[attr] = histogram
+    return out
+
+
+def _mcv_lists(raw) -> dict:
+    # {kolom: MostCommonValues} dari entry stats "mcv"; entry tidak valid dibuang
+    out = {}
+    for attr, value in (raw or {}).items():
+        mcv = as_mcv(value)
+        if mcv is not None:
+            out[attr] = mcv
+    return out
+
+
+def _has_attr(cost_info: dict, attr) -> bool:
+    return attr in cost_info.get("v_a_r", {}) or any(attr in key for key in cost_info.get("keys", ()))
+
+
+def _distinct(attr, cost_info: dict):
+    # V(attr) input join: v_a_r, atau n_r kalau attr key; None kalau tidak diketahui
+    n_r = cost_info.get("n_r", 1000)
+    v = cost_info.get("v_a_r", {}).get(attr)
+    if v is None and frozenset([attr]) in cost_info.get("keys", ()):
+        v = n_r
+    return min(v, n_r) if v is not None else None
+
+
+def _io_cost(cost_info: dict):
+    # I/O kumulatif input; cost info tanpa io_cost dianggap I/O seluruhnya
+    return cost_info.get("io_cost", cost_info.get("cost", 0) - cost_info.get("cpu_cost", 0))
+
+
+def _costs(io_cost, cpu_cost) -> dict:
+    return {"cost": io_cost + cpu_cost, "io_cost": io_cost, "cpu_cost": cpu_cost}
+
+
+def _index_columns(column, index: dict) -> frozenset:
+    # kolom yang tersimpan di entry index: kolom key + include
+    return frozenset([column, *index.get("include", ())])
+
+
+def _condition_columns(condition):
+    # nama kolom yang direferensikan predikat, None kalau tidak bisa ditentukan
+    if isinstance(condition, ThetaJoin):
+        return _condition_columns(condition.condition)
+    if isinstance(condition, LogicalNode):
+        out = set()
+        for child in condition.childs:
+            cols = _condition_columns(child)
+            if cols is None:
+                return None
+            out |= cols
+        return out
+    if isinstance(condition, ConditionNode):
+        out = set()
+        for side in (condition.attr, condition.value):
+            if isinstance(side, ColumnNode):
+                out.add(side.column)
+            elif isinstance(side, dict) and "column" in side:
+                out.add(str(side["column"]).split(".")[-1])
+            elif side is condition.attr:
+                return None
+        return out
+    return None
+
+
+def _item_columns(item):
+    # kolom item PROJECT / SORT / GROUP ("t.a", "COUNT(t.b)", OrderByItem), None = semua kolom (*)
+    if isinstance(item, OrderByItem):
+        item = item.column
+    elif isinstance(item, dict) and "column" in item:
+        item = item["column"]
+    text = str(item).strip()
+    if "(" in text:
+        text = text[text.index("(") + 1:text.rindex(")") if ")" in text else len(text)].strip()
+        if text in ("*", ""):
+            return set()
+    if text == "*" or text.endswith(".*"):
+        return None
+    names = re.findall(r"(?:[A-Za-z_]\w*\.)?([A-Za-z_]\w*)", text)
+    return {n for n in names if n.upper() not in ("DISTINCT", "ASC", "DESC", "AS")} or None
+
+
+def _count_conditions(condition) -> int:
+    # jumlah predikat atomik yang dievaluasi per tuple
+    if isinstance(condition, LogicalNode):
+        return sum(_count_conditions(c) for c in condition.childs) or 1
+    return 1
+
+
+_RANGE_OPS = (">", "<", ">=", "<=")
+
+# batas estimasi n_r hasil join, supaya rantai cartesian product tetap terhitung
+_MAX_ROWS = 10 ** 15
 
 class CostPlanner:
-    def __init__(self, storage_manager=None):
+    def __init__(self, storage_manager=None, stats: dict = None, memory=None, cpu=None):
         self.storage_manager = storage_manager
 
-        # TODO ==================== [HAPUS SAAT INTEGRASI] ====================
-        self.BLOCK_SIZE = 4096 
-        self.PAGE_SIZE = 4096 
-         # ====================================================================
+        # Konfigurasi memory (helper.memory): MemoryConfig, int buffer_blocks
+        # atau dict config; None = dari storage_manager kalau ada, selain itu default
+        self.memory = memory_config(memory, storage_manager)
+
+        # Bobot CPU (helper.cpu_cost): CpuWeights atau dict config, None = default
+        self.cpu = cpu_weights(cpu)
+
+        # Statistik dari pemanggil (format helper.stats.get_stats), dipakai
+        # sebelum dummy stats; tabel yang tidak ada di sini jatuh ke dummy
+        self.stats = stats
+        self._stats_cache = {}
+        self._keys_cache = {}  # tabel -> key (frozenset kolom) dari stats / schema
+        self._fk_refs = None   # tabel -> kolom yang direferensikan foreign key
+
+        self.BLOCK_SIZE = self.memory.block_size
+        self.PAGE_SIZE = self.memory.page_size
         
         # Cache untuk menyimpan statistik temporary tables (hasil join, selection, dll)
         # Key: identifier string, Value: dict dengan n_r, b_r, f_r, v_a_r
@@ -27,6 +231,11 @@ class CostPlanner:
         # Mapping alias ke table name (diisi saat build query tree)
         # Key: alias, Value: table_name
         self.alias_map = {}
+    
+    @property
+    def buffer_blocks(self) -> int:
+        """m (blocks) untuk sort dan join: buffer pool dibatasi grant query"""
+        return self.memory.work_blocks
         
     # =================== HELPER FUNCTIONS STATISTIK ===================
     
@@ -48,6 +257,10 @@ class CostPlanner:
         if table_name in self.temp_table_stats:
             return self.temp_table_stats[table_name]
         
+        table_name = self._resolve_table_name(table_name)
+        if self.stats is not None and table_name in self.stats:
+            return self._given_table_stats(table_name)
+        
         # TODO ==================== [UNCOMMENT SAAT INTEGRASI] ====================
         # Ketika SM  ready, UNCOMMENT blok di bawah ini:
         # memakai get_stats dari Storage Manager
@@ -83,7 +296,7 @@ class CostPlanner:
                     'major': 20           
                 },
                 'indexes': {
-                    'student_id': {'type': 'b+', 'value': 4}, # value di b+ itu kedalaman, kalau di hash itu jumlah bucket (m)
+                    'student_id': {'type': 'b+', 'value': 4, 'primary': True}, # value di b+ itu kedalaman, kalau di hash itu jumlah bucket (m); primary = clustering
                     'name': {'type': 'hash', 'value': 10},        
                     'age': {'type': 'none', 'value': None},           
                     'gpa': {'type': 'none', 'value': None},   
@@ -102,7 +315,7 @@ class CostPlanner:
                     'department': 15      # 15 departments
                 },
                 'indexes': {
-                    'course_id': {'type': 'b+', 'value': 3},  # primary key, depth = 3
+                    'course_id': {'type': 'b+', 'value': 3, 'primary': True},  # primary key, depth = 3
                     'course_name': {'type': 'none', 'value': None},
                     'credits': {'type': 'none', 'value': None},
                     'department': {'type': 'none', 'value': None}
@@ -121,7 +334,7 @@ class CostPlanner:
                     'semester': 20           # semester values
                 },
                 'indexes': {
-                    'enrollment_id': {'type': 'b+', 'value': 4},  # primary key, depth = 4
+                    'enrollment_id': {'type': 'b+', 'value': 4, 'primary': True},  # primary key, depth = 4
                     'student_id': {'type': 'hash', 'value': 20},  # foreign key, hash buckets = 20
                     'course_id': {'type': 'b+', 'value': 3},      # foreign key, depth = 3
                     'grade': {'type': 'none', 'value': None},
@@ -140,7 +353,7 @@ class CostPlanner:
                     'salary': 500
                 },
                 'indexes': {
-                    'id': {'type': 'b+', 'value': 4},       # primary key
+                    'id': {'type': 'b+', 'value': 4, 'primary': True},       # primary key
                     'name': {'type': 'none', 'value': None},
                     'dept_id': {'type': 'hash', 'value': 10},  # foreign key
                     'salary': {'type': 'none', 'value': None}
@@ -157,7 +370,7 @@ class CostPlanner:
                     'manager_id': 800
                 },
                 'indexes': {
-                    'id': {'type': 'b+', 'value': 3},  # primary key
+                    'id': {'type': 'b+', 'value': 3, 'primary': True},  # primary key
                     'name': {'type': 'none', 'value': None},
                     'manager_id': {'type': 'none', 'value': None}
                 }
@@ -173,7 +386,7 @@ class CostPlanner:
                     'status': 5
                 },
                 'indexes': {
-                    'id': {'type': 'b+', 'value': 4},  # primary key
+                    'id': {'type': 'b+', 'value': 4, 'primary': True},  # primary key
                     'customer_id': {'type': 'hash', 'value': 15},  # foreign key
                     'status': {'type': 'none', 'value': None}
                 }
@@ -189,7 +402,7 @@ class CostPlanner:
                     'city': 200
                 },
                 'indexes': {
-                    'id': {'type': 'b+', 'value': 4},  # primary key
+                    'id': {'type': 'b+', 'value': 4, 'primary': True},  # primary key
                     'name': {'type': 'none', 'value': None},
                     'city': {'type': 'none', 'value': None}
                 }
@@ -205,7 +418,7 @@ class CostPlanner:
                     'category': 50
                 },
                 'indexes': {
-                    'id': {'type': 'b+', 'value': 4},  # primary key
+                    'id': {'type': 'b+', 'value': 4, 'primary': True},  # primary key
                     'name': {'type': 'none', 'value': None},
                     'category': {'type': 'none', 'value': None}
                 }
@@ -222,20 +435,44 @@ class CostPlanner:
             'indexes': {}
         }
         
+        return dummy_stats.get(table_name.lower(), default_stats)
+        # ==================== [AKHIR BAGIAN HAPUS] ====================
+    
+    def _resolve_table_name(self, table_name) -> str:
+        """nama tabel dari TableReference (alias dicatat di alias_map) atau alias string"""
         # Handle TableReference object - extract name and alias
         if hasattr(table_name, 'name'):
             actual_name = table_name.name
             # Store alias mapping if alias exists
             if hasattr(table_name, 'alias') and table_name.alias:
                 self.alias_map[table_name.alias] = actual_name
-            table_name = actual_name
-        elif isinstance(table_name, str):
-            # Check if this is an alias
-            if table_name in self.alias_map:
-                table_name = self.alias_map[table_name]
-        
-        return dummy_stats.get(table_name.lower(), default_stats)
-        # ==================== [AKHIR BAGIAN HAPUS] ====================
+            return actual_name
+        # Check if this is an alias
+        if isinstance(table_name, str) and table_name in self.alias_map:
+            return self.alias_map[table_name]
+        return table_name
+    
+    def _given_table_stats(self, table_name: str) -> dict:
+        """
+        statistik dari self.stats dilengkapi field yang dipakai cost function
+        (l_r, f_r, v_a_r, indexes, histograms, mcv); di-cache per tabel.
+        """
+        if table_name not in self._stats_cache:
+            raw = self.stats[table_name]
+            n_r = raw.get('n_r', 1000)
+            b_r = raw.get('b_r', 100)
+            self._stats_cache[table_name] = {
+                **raw,
+                'n_r': n_r,
+                'b_r': b_r,
+                'l_r': raw.get('l_r', 0),
+                'f_r': raw.get('f_r') or max(1, math.ceil(n_r / b_r) if b_r else 1),
+                'v_a_r': raw.get('v_a_r', {}),
+                'indexes': raw.get('indexes', {}),
+                'histograms': _histograms(raw.get('histograms')),
+                'mcv': _mcv_lists(raw.get('mcv')),
+            }
+        return self._stats_cache[table_name]
     
     def get_index_info(self, table_stats: dict, attribute: str) -> dict:
         """
@@ -251,6 +488,57 @@ class CostPlanner:
         indexes = table_stats.get('indexes', {})
         return indexes.get(attribute, {'type': 'none', 'value': None})
     
+    def table_keys(self, table_name, table_stats: dict) -> frozenset:
+        """
+        key tabel: himpunan kolom yang unik per tuple.
+        
+        sumber:
+            - primary_key di stats (boleh composite)
+            - kolom yang direferensikan foreign_keys tabel lain
+            - kolom dengan V(A,r) = n_r
+        
+        return:
+            frozenset: {frozenset(kolom), ...}
+        
+        dipanggil oleh:
+            cost_table_scan
+        """
+        name = self._resolve_table_name(table_name)
+        keys = self._keys_cache.get(name)
+        if keys is None:
+            found = set()
+            primary_key = table_stats.get('primary_key')
+            if primary_key:
+                found.add(frozenset([primary_key] if isinstance(primary_key, str) else primary_key))
+            for column in self._referenced_columns().get(name, ()):
+                found.add(frozenset([column]))
+            n_r = table_stats.get('n_r', 0)
+            for attr, v in table_stats.get('v_a_r', {}).items():
+                # V(A,r) > n_r berarti stats tidak konsisten, bukan key
+                if n_r > 0 and v == n_r:
+                    found.add(frozenset([attr]))
+            keys = self._keys_cache[name] = frozenset(found)
+        return keys
+    
+    def _referenced_columns(self) -> dict:
+        # tabel -> kolom yang direferensikan foreign key (harus unik di tabel itu)
+        refs = self._fk_refs
+        if refs is None:
+            refs = {}
+            for table, table_stats in (self.stats or {}).items():
+                foreign_keys = table_stats.get('foreign_keys') or {}
+                if isinstance(foreign_keys, dict):
+                    targets = foreign_keys.values()
+                else:
+                    # list ForeignKeyDefinition dari CREATE TABLE
+                    targets = [f"{fk.ref_table}.{fk.ref_column}" for fk in foreign_keys]
+                for target in targets:
+                    ref_table, _, ref_column = target.partition('.')
+                    if ref_column:
+                        refs.setdefault(ref_table, set()).add(ref_column)
+            self._fk_refs = refs
+        return refs
+    
     
     def extract_join_attributes(self, join_condition) -> tuple:
         """
@@ -270,6 +558,13 @@ class CostPlanner:
             condition = join_condition.condition
         elif isinstance(join_condition, ConditionNode):
             condition = join_condition
+        elif isinstance(join_condition, str):
+            # hasil join ordering: "THETA:Cond(a.x = b.y)", hanya satu equi-join
+            found = _EQUI_JOIN.findall(join_condition)
+            if len(found) != 1 or " AND " in join_condition.upper() or " OR " in join_condition.upper():
+                return ((None, None), (None, None))
+            lt, la, rt, ra = found[0]
+            return ((lt or None, la), (rt or None, ra))
         else:
             return ((None, None), (None, None))
         
@@ -316,6 +611,46 @@ class CostPlanner:
         
         return ((left_table, left_attr), (right_table, right_attr))
     
+    def join_predicates(self, join_condition) -> list:
+        """
+        semua pasangan equi-join dari join condition, termasuk konjungsi
+        (a.x = b.x AND a.y = b.y). conjunct non-equi diabaikan.
+        
+        parameter:
+            join_condition: node.val dari JOIN (ConditionNode / LogicalNode / ThetaJoin / string)
+        
+        return:
+            list: [((left_table, left_attr), (right_table, right_attr)), ...],
+                  [] untuk cartesian, None kalau tidak ada equi-join yang
+                  bisa dipakai (OR, predikat non-equi)
+        
+        dipanggil oleh:
+            cost_join, CostEngine
+        """
+        condition = getattr(join_condition, 'condition', join_condition)
+        if condition is None or (isinstance(condition, str) and condition.strip().upper() in ("", "CARTESIAN")):
+            return []
+        if isinstance(condition, str):
+            if " OR " in condition.upper():
+                return None
+            pairs = [((lt or None, la), (rt or None, ra)) for lt, la, rt, ra in _EQUI_JOIN.findall(condition)]
+            return pairs or None
+        if isinstance(condition, LogicalNode):
+            if condition.operator != "AND":
+                return None
+            pairs = []
+            for child in condition.childs:
+                pairs.extend(self.join_predicates(child) or [])
+            return pairs or None
+        if isinstance(condition, ConditionNode) and condition.op == "=":
+            (lt, la), (rt, ra) = self.extract_join_attributes(condition)
+            # value literal ("x = 5" / "x = 'a'") bukan predikat join
+            literal = isinstance(condition.value, (int, float)) or (
+                isinstance(condition.value, str) and '.' not in condition.value)
+            if la and ra and not literal:
+                return [((lt, la), (rt, ra))]
+        return None
+    
 
     def store_temp_stats(self, table_id: str, n_r: int, b_r: int, f_r: int, v_a_r: dict, indexes: dict = None):
         """
@@ -346,18 +681,23 @@ class CostPlanner:
     
     # ======================= HELPER FUNCTIONS - DISPLAY/FORMATTING =======================
     
-    def _calculate_logical_node_selectivity(self, logical_node: LogicalNode, v_a_r: dict) -> float:
+    def _calculate_logical_node_selectivity(self, logical_node: LogicalNode, v_a_r: dict, histograms: dict = None,
+                                           mcv: dict = None) -> float:
         """
         menghitung selectivity untuk logical node secara rekursif.
         mendukung nested and/or.
         
         rumus:
             - and: s1 * s2 * ... * sn (conjunction)
+              batas range pada kolom ber-histogram yang sama (a >= x AND a < y)
+              dihitung sekali sebagai satu range, bukan dikalikan
             - or: 1 - (1-s1)*(1-s2)*...*(1-sn) (disjunction)
         
         parameter:
             logical_node (LogicalNode): node dengan operator and/or
             v_a_r (dict): {attribute: distinct_count}
+            histograms (dict): {attribute: EquiDepthHistogram}, opsional
+            mcv (dict): {attribute: MostCommonValues}, opsional
         
         return:
             float: combined selectivity (0.0 - 1.0)
@@ -368,13 +708,18 @@ class CostPlanner:
         if logical_node.operator == "AND":
             # Conjunction: multiply selectivities
             result = 1.0
+            ranges = {}  # attribute -> [low, low_inclusive, high, high_inclusive]
             for child in logical_node.childs:
                 if isinstance(child, LogicalNode):
-                    child_selectivity = self._calculate_logical_node_selectivity(child, v_a_r)
+                    child_selectivity = self._calculate_logical_node_selectivity(child, v_a_r, histograms, mcv)
                     result *= child_selectivity
                 elif isinstance(child, ConditionNode):
-                    child_selectivity = self.estimate_selectivity(child, v_a_r)
+                    if self._collect_range(child, histograms, ranges):
+                        continue
+                    child_selectivity = self.estimate_selectivity(child, v_a_r, histograms, mcv)
                     result *= child_selectivity
+            for attr, (low, low_inclusive, high, high_inclusive) in ranges.items():
+                result *= histograms[attr].range_selectivity(low, high, low_inclusive, high_inclusive)
             return result
         
         elif logical_node.operator == "OR":
@@ -382,10 +727,10 @@ class CostPlanner:
             product = 1.0
             for child in logical_node.childs:
                 if isinstance(child, LogicalNode):
-                    child_selectivity = self._calculate_logical_node_selectivity(child, v_a_r)
+                    child_selectivity = self._calculate_logical_node_selectivity(child, v_a_r, histograms, mcv)
                     product *= (1.0 - child_selectivity)
                 elif isinstance(child, ConditionNode):
-                    child_selectivity = self.estimate_selectivity(child, v_a_r)
+                    child_selectivity = self.estimate_selectivity(child, v_a_r, histograms, mcv)
                     product *= (1.0 - child_selectivity)
             return 1.0 - product
         
@@ -450,20 +795,55 @@ class CostPlanner:
     
     # ======================= SELECTIVITY ESTIMATION =======================
     
-    def estimate_selectivity(self, condition: ConditionNode, v_a_r: dict = None) -> float:
+    def selectivity(self, condition, table: str) -> float:
+        """
+        selectivity kondisi selection pada satu tabel, memakai v(a,r),
+        histogram dan MCV dari statistik tabel itu (rumus di estimate_selectivity).
+        
+        parameter:
+            condition: ConditionNode atau LogicalNode (and/or)
+            table (str): nama tabel atau alias
+        
+        return:
+            float: selectivity (0.0 - 1.0), 1.0 untuk kondisi yang tidak dikenali
+        
+        dipanggil oleh:
+            OptimizationEngine._filter_selectivity
+        """
+        stats = self.get_table_stats(table)
+        v_a_r = stats.get('v_a_r', {})
+        histograms = _histograms(stats.get('histograms'))
+        mcv = _mcv_lists(stats.get('mcv'))
+        if isinstance(condition, LogicalNode):
+            return self._calculate_logical_node_selectivity(condition, v_a_r, histograms, mcv)
+        if isinstance(condition, ConditionNode):
+            return self.estimate_selectivity(condition, v_a_r, histograms, mcv)
+        return 1.0
+    
+    def estimate_selectivity(self, condition: ConditionNode, v_a_r: dict = None, histograms: dict = None,
+                             mcv: dict = None) -> float:
         """
-        estimasi selectivity dari kondisi selection menggunakan v(a,r).
+        estimasi selectivity dari kondisi selection menggunakan v(a,r),
+        histogram equi-depth dan MCV list (kalau ada).
         
         rumus:
             - equality (a = value): selectivity = 1/v(a,r)
-            - inequality (a ≠ value): selectivity = 1 - (1/v(a,r))
-            - comparison (a > value): selectivity ≈ 0.5 (tanpa histogram)
+              dengan MCV: frekuensi value kalau termasuk MCV, selain itu
+              (1 - total frekuensi MCV) / (v(a,r) - jumlah MCV)
+            - inequality (a ≠ value): selectivity = 1 - selectivity(a = value)
+            - comparison (a > value) / between: interpolasi histogram,
+              tanpa histogram ≈ 0.5 (between ≈ 0.25)
             - like: selectivity ≈ 0.2
             - in: selectivity ≈ n/v(a,r) dimana n = jumlah values
+              (n = 5 kalau value bukan list); dengan MCV: jumlah
+              selectivity equality tiap value
         
         parameter:
             condition (ConditionNode): node dengan attr, op, value
+                                       (between: value = (low, high))
             v_a_r (dict): {attribute: distinct_count} dari tabel
+            histograms (dict): {attribute: EquiDepthHistogram}, opsional
+            mcv (dict): {attribute: MostCommonValues}, opsional
         
         return:
             float: selectivity (0.0 - 1.0)
@@ -484,8 +864,11 @@ class CostPlanner:
         op = condition.op
         
         # Equality condition: σ_A=v(r)
-        # Formula: selectivity = 1 / V(A,r)
+        # Formula: selectivity = 1 / V(A,r), atau frekuensi dari MCV list
         if op == "=":
+            mcv_list = self._mcv_for(attribute, condition.value, mcv)
+            if mcv_list is not None:
+                return mcv_list.equality(condition.value, v_a_r.get(attribute))
             if attribute and attribute in v_a_r:
                 v_a = v_a_r[attribute]
                 return 1.0 / v_a if v_a > 0 else 0.1
@@ -493,29 +876,46 @@ class CostPlanner:
         
         # Inequality: σ_A≠v(r)
         elif op in ["!=", "<>"]:
+            mcv_list = self._mcv_for(attribute, condition.value, mcv)
+            if mcv_list is not None:
+                return 1.0 - mcv_list.equality(condition.value, v_a_r.get(attribute))
             if attribute and attribute in v_a_r:
                 v_a = v_a_r[attribute]
                 return 1.0 - (1.0 / v_a) if v_a > 0 else 0.9
             return 0.9
         
         # Comparison operators: >, <, >=, <=
-        # Formula ideal: (max - v) / (max - min)
+        # Dengan histogram: fraksi tuple di range, diinterpolasi per bucket
         # Tanpa histogram: asumsi distribusi uniform → 0.5
         elif op in [">", "<", ">=", "<="]:
-            return 0.5
+            histogram = self._histogram_for(attribute, condition.value, histograms)
+            return histogram.selectivity(op, condition.value) if histogram else 0.5
+        
+        # BETWEEN low AND high: value = (low, high)
+        elif op.upper() == "BETWEEN":
+            histogram = None
+            if isinstance(condition.value, (list, tuple)) and len(condition.value) == 2:
+                low, high = condition.value
+                histogram = self._histogram_for(attribute, low, histograms)
+                if histogram is None or _numeric(high) is None:
+                    histogram = None
+            return histogram.selectivity(op, condition.value) if histogram else 0.25
         
         # Pattern matching: LIKE
         elif op.upper() == "LIKE":
             return 0.2
         
         # IN clause: σ_A IN (v1,v2,...,vn)(r)
-        # Formula: selectivity = n / V(A,r)
-        # TODO: Harus detect actual number of values dari condition.value
+        # Formula: selectivity = n / V(A,r), atau jumlah frekuensi dari MCV list
         # TODO: Gimana kalau IN nya juga bukan dari value distinct tabel, tapi literal?
         elif op.upper() == "IN":
+            values = condition.value if isinstance(condition.value, (list, tuple, set)) else None
+            mcv_list = mcv.get(attribute) if values and attribute and mcv else None
+            if mcv_list is not None:
+                return min(1.0, sum(mcv_list.equality(v, v_a_r.get(attribute)) for v in set(values)))
             if attribute and attribute in v_a_r:
-                # Simple heuristic: asumsi 5 values
-                num_values = 5
+                # Simple heuristic: asumsi 5 values kalau daftar value tidak diketahui
+                num_values = len(values) if values else 5
                 v_a = v_a_r[attribute]
                 return min(1.0, num_values / v_a) if v_a > 0 else 0.15
             return 0.15
@@ -523,22 +923,59 @@ class CostPlanner:
         # Default: konservatif
         return 0.5
     
+    def _mcv_for(self, attribute, value, mcv):
+        """MCV list kolom kalau ada dan value literal (bukan kolom lain), selain itu None"""
+        if not attribute or not mcv or not isinstance(value, (int, float, str)):
+            return None
+        return mcv.get(attribute)
+    
+    def _histogram_for(self, attribute, value, histograms):
+        """histogram kolom kalau ada dan value literal numerik/tanggal, selain itu None"""
+        if not attribute or not histograms or _numeric(value) is None:
+            return None
+        return histograms.get(attribute)
+    
+    def _collect_range(self, condition: ConditionNode, histograms, ranges: dict) -> bool:
+        """
+        gabungkan batas range (>, >=, <, <=) pada kolom ber-histogram ke
+        ranges[attribute] = [low, low_inclusive, high, high_inclusive].
+        return False kalau kondisi bukan range yang bisa dihitung histogram.
+        """
+        attribute = condition.attr.column if isinstance(condition.attr, ColumnNode) else None
+        if condition.op not in _RANGE_OPS or self._histogram_for(attribute, condition.value, histograms) is None:
+            return False
+        bound = ranges.setdefault(attribute, [None, True, None, True])
+        value, inclusive = _numeric(condition.value), condition.op in (">=", "<=")
+        if condition.op in (">", ">="):
+            # batas bawah paling ketat
+            if bound[0] is None or value > bound[0] or (value == bound[0] and not inclusive):
+                bound[0], bound[1] = value, inclusive
+        elif bound[2] is None or value < bound[2] or (value == bound[2] and not inclusive):
+            bound[2], bound[3] = value, inclusive
+        return True
+    
 
     
     # ================================================ COST FUNCTIONS ================================================
     
-    def cost_table_scan(self, node: QueryTree) -> dict:
+    def cost_table_scan(self, node: QueryTree, columns=None) -> dict:
         """
-        cost untuk full table scan.
+        cost untuk full table scan, atau index-only scan kalau ada index b+
+        yang mencakup semua kolom yang dibutuhkan (key + include).
         
         rumus:
-            cost = b_r (jumlah blocks yang harus dibaca)
+            io_cost = b_r (jumlah blocks yang harus dibaca)
+            index-only: io_cost = leaf blocks index (lihat _index_leaf),
+                        output terurut pada kolom index
+            cpu_cost = tuple_cost * n_r
         
         parameter:
             node (QueryTree): node dengan type="TABLE"
+            columns (set): kolom yang dibutuhkan operator di atasnya
+                           (required_columns), None = semua kolom
         
         return:
-            dict: {cost, n_r, b_r, f_r, v_a_r, operation, description}
+            dict: {cost, n_r, b_r, f_r, l_r, widths, v_a_r, columns, access_path, operation, description}
         
         dipanggil oleh:
             calculate_cost
@@ -549,18 +986,115 @@ class CostPlanner:
         # Extract display name from TableReference if needed
         display_name = table_name.name if hasattr(table_name, 'name') else table_name
         
+        needed = self._table_columns(stats, columns)
+        widths = column_widths(stats)
+        io_cost, access_path, order = stats['b_r'], "table-scan", None
+        if needed is not None:
+            for column, index in stats.get('indexes', {}).items():
+                if index.get('type') != 'b+' or not needed <= _index_columns(column, index):
+                    continue
+                leaf_blocks, _ = self._index_leaf(stats, column, index)
+                if leaf_blocks < io_cost:
+                    io_cost, access_path, order = leaf_blocks, f"index-only scan (b+) on {column}", column
+        
         return {
             "operation": "TABLE_SCAN",
             "table": display_name,
-            "cost": stats['b_r'],
+            **_costs(io_cost, self.cpu.cost(stats['n_r'])),
             "n_r": stats['n_r'],
             "b_r": stats['b_r'],
             "f_r": stats['f_r'],
+            "l_r": stats.get('l_r') or tuple_width(widths),
+            "widths": widths,
             "v_a_r": stats['v_a_r'],
+            "histograms": _histograms(stats.get('histograms')),
+            "mcv": _mcv_lists(stats.get('mcv')),
             "indexes": stats.get('indexes', {}),
-            "description": f"Full scan of table {display_name}"
+            "keys": self.table_keys(table_name, stats),
+            "columns": needed,
+            "access_path": access_path,
+            "order": order,  # heap file tidak terurut, index-only scan terurut pada key
+            "memory_blocks": 1,  # satu buffer block per scan
+            "peak_memory_blocks": 1,
+            "description": (f"Full scan of table {display_name}" if order is None
+                            else f"{access_path} of table {display_name}")
         }
     
+    def _table_columns(self, table_stats: dict, columns):
+        """
+        kolom yang dibutuhkan dari tabel ini; None (tidak bisa index-only) kalau
+        semua kolom dibutuhkan, tabel tanpa v_a_r, atau ada kolom yang tidak
+        dikenal sebagai kolom tabel (v_a_r, indexes, widths / schema)
+        """
+        if columns is None or not table_stats.get('v_a_r'):
+            return None
+        known = set(table_stats['v_a_r']) | set(table_stats.get('indexes', {})) | set(column_widths(table_stats))
+        if not columns <= known:
+            return None
+        return frozenset(columns)
+    
+    def _index_leaf(self, table_stats: dict, column, index: dict) -> tuple:
+        """
+        (jumlah block leaf, entry per block) index: "leaf_blocks" di entry index
+        kalau ada, selain itu entry = lebar kolom index (helper.widths) +
+        pointer 8 byte per BLOCK_SIZE
+        """
+        n_r = table_stats.get('n_r', 1000)
+        if index.get('leaf_blocks'):
+            leaf_blocks = index['leaf_blocks']
+            return leaf_blocks, max(1, math.ceil(n_r / leaf_blocks))
+        widths = table_stats.get('widths') or column_widths(table_stats)
+        if not widths:
+            l_r = self.BLOCK_SIZE / max(1, table_stats.get('f_r', 10))
+            widths = dict.fromkeys(table_stats.get('v_a_r') or [column], l_r / max(1, len(table_stats.get('v_a_r', {}))))
+        entry = tuple_width(widths, _index_columns(column, index)) + 8
+        per_block = max(2, int(self.BLOCK_SIZE // entry))
+        return max(1, math.ceil(n_r / per_block)), per_block
+    
+    def required_columns(self, node: QueryTree, columns):
+        """
+        kolom yang dibutuhkan dari child node, kalau output node cukup columns
+        (None = semua kolom): kolom PROJECT, ditambah kolom predikat SIGMA /
+        JOIN dan kolom SORT / GROUP. None kalau tidak bisa ditentukan.
+        
+        dipanggil oleh:
+            calculate_cost, CostEngine
+        """
+        if node.type == "PROJECT":
+            items = node.val if isinstance(node.val, (list, tuple)) else [node.val]
+            out = set()
+            for item in items:
+                cols = _item_columns(item)
+                if cols is None:
+                    return None
+                out |= cols
+            return frozenset(out)
+        if columns is None:
+            return None
+        if node.type in ("SIGMA", "SELECT"):
+            used = _condition_columns(node.val)
+        elif node.type == "JOIN":
+            if node.val is None or node.val == "CARTESIAN":
+                used = set()
+            elif isinstance(node.val, str):
+                pairs = self.join_predicates(node.val)
+                used = None if pairs is None else {c for pair in pairs for _, c in pair}
+            else:
+                used = _condition_columns(node.val)
+        elif node.type in ("SORT", "ORDER", "GROUP"):
+            items = node.val if isinstance(node.val, (list, tuple)) else [node.val]
+            used = set()
+            for item in items:
+                cols = _item_columns(item)
+                if cols is None:
+                    return None
+                used |= cols
+        elif node.type == "LIMIT":
+            used = set()
+        else:
+            return None
+        return None if used is None else frozenset(columns | used)
+    
     def cost_selection(self, node: QueryTree, input_cost: dict) -> dict:
         """
         cost untuk operasi selection (σ - sigma).
@@ -570,6 +1104,9 @@ class CostPlanner:
             - output tuples: n_r * selectivity
             - output blocks: ceil(output_tuples / f_r)
             - cost: cost(input) (tidak ada tambahan i/o)
+              + cpu: tuple_cost * n_r + operator_cost * n_r * jumlah predikat
+            - sigma langsung di atas TABLE: access path termurah (table scan
+              atau index scan, lihat choose_access_path) menggantikan cost scan
             - v(a, σ_θ(r)): min(v(a,r), n_r(output))
         
         parameter:
@@ -581,9 +1118,6 @@ class CostPlanner:
         
         dipanggil oleh:
             calculate_cost
-        
-        todo: implementasi index scan jika sm ada info tinggi tree
-              cost = h_i + (selectivity * b_r)
         """
         condition = node.val
         
@@ -591,16 +1125,18 @@ class CostPlanner:
         input_b_r = input_cost.get("b_r", 100)
         input_f_r = input_cost.get("f_r", 10)
         input_v_a_r = input_cost.get("v_a_r", {})
+        input_histograms = input_cost.get("histograms", {})
+        input_mcv = input_cost.get("mcv", {})
         
         # Calculate selectivity based on condition type
         if isinstance(condition, LogicalNode):
             # LogicalNode: Use recursive helper for AND/OR (handles nesting)
-            selectivity = self._calculate_logical_node_selectivity(condition, input_v_a_r)
+            selectivity = self._calculate_logical_node_selectivity(condition, input_v_a_r, input_histograms, input_mcv)
             condition_str = self._logical_node_to_string(condition)
         
         elif isinstance(condition, ConditionNode):
             # Single ConditionNode
-            selectivity = self.estimate_selectivity(condition, input_v_a_r)
+            selectivity = self.estimate_selectivity(condition, input_v_a_r, input_histograms, input_mcv)
             condition_str = self._condition_node_to_string(condition)
         
         else:
@@ -629,8 +1165,18 @@ class CostPlanner:
             # gunakan approximate: min(V(A,r), n_r(output))
             output_v_a_r[attr] = min(v_val, output_n_r)
         
-        # Cost = cost input (selection tidak menambah I/O)
-        total_cost = input_cost.get("cost", 0)
+        # Selection tidak menambah I/O; CPU: setiap tuple input dicek semua predikat.
+        # Di atas TABLE, index scan bisa menggantikan full scan
+        output_order = input_cost.get("order")  # filter mempertahankan urutan input
+        access_path = None
+        if input_cost.get("operation") == "TABLE_SCAN":
+            path = self.choose_access_path(condition, input_cost)
+            access_path = path["access_path"]
+            io_cost, cpu_cost = path["io_cost"], path["cpu_cost"]
+            output_order = path["order"] or output_order
+        else:
+            io_cost = _io_cost(input_cost)
+            cpu_cost = input_cost.get("cpu_cost", 0) + self.cpu.cost(input_n_r, input_n_r * _count_conditions(condition))
         
         # Generate unique ID untuk temporary result
         temp_id = f"sigma_{id(node)}"
@@ -639,16 +1185,130 @@ class CostPlanner:
         return {
             "operation": "SELECTION",
             "condition": condition_str,
-            "cost": total_cost,
+            **_costs(io_cost, cpu_cost),
             "n_r": output_n_r,
             "b_r": output_b_r,
             "f_r": input_f_r,
+            "l_r": input_cost.get("l_r"),
+            "widths": input_cost.get("widths", {}),
             "v_a_r": output_v_a_r,
+            "histograms": input_histograms,  # asumsi independen antar kolom
+            "mcv": input_mcv,
             "indexes": {},  # selection result tidak ada index
+            "keys": input_cost.get("keys", frozenset()),
+            "peak_memory_blocks": input_cost.get("peak_memory_blocks", 1),
+            "order": output_order,
             "selectivity": selectivity,
-            "description": f"Filter: {condition_str} (selectivity={selectivity:.2f})"
+            "access_path": access_path,
+            "description": f"Filter: {condition_str} (selectivity={selectivity:.2f}"
+                           + (f", {access_path})" if access_path else ")")
         }
     
+    def choose_access_path(self, condition, scan_cost: dict) -> dict:
+        """
+        access path termurah untuk SIGMA langsung di atas TABLE: full table scan,
+        atau index scan pada satu kolom dengan predikat =, IN atau range (b+ saja);
+        predikat lain dicek pada tuple yang di-fetch index.
+        
+        rumus (h = kedalaman b+ tree / 1 untuk hash, k = jumlah lookup (IN: jumlah
+        value, selain itu 1), n = max(1, n_r * selectivity) tuple yang cocok,
+        b = ceil(n / f_r)):
+            - table scan: b_r
+            - b+ primary (clustering): k * h + max(k, b)
+            - b+ secondary: k * h + n (satu block per tuple)
+            - hash primary: k + max(k, b)
+            - hash secondary: k + n
+            - index-only (index mencakup semua kolom yang dibutuhkan scan, lihat
+              required_columns): k * h + max(0, ceil(n / entry per leaf) - k)
+        cpu: table scan = cpu scan + cpu filter per n_r tuple; index scan =
+        tuple_cost * n (fetch) + cpu filter per n tuple. index b+ menghasilkan
+        tuple terurut pada kolom index.
+        
+        parameter:
+            condition: node.val SIGMA (ConditionNode / LogicalNode)
+            scan_cost (dict): hasil cost_table_scan (indexes, n_r, f_r, v_a_r, ...)
+        
+        return:
+            dict: {access_path, index_column, io_cost, cpu_cost, order}
+        
+        dipanggil oleh:
+            cost_selection, CostEngine.annotate_physical
+        """
+        n_r = scan_cost.get("n_r", 1000)
+        f_r = scan_cost.get("f_r", 10) or 1
+        needed = scan_cost.get("columns")
+        conditions = _count_conditions(condition)
+        best = {
+            "access_path": scan_cost.get("access_path", "table-scan"),
+            "index_column": None,
+            "io_cost": _io_cost(scan_cost),
+            "cpu_cost": scan_cost.get("cpu_cost", 0) + self.cpu.cost(n_r, n_r * conditions),
+            "order": scan_cost.get("order"),
+        }
+        
+        indexes = scan_cost.get("indexes", {})
+        for column, conds in self._index_conditions(condition).items():
+            index = indexes.get(column) or {}
+            kind = index.get("type")
+            if kind not in ("b+", "hash"):
+                continue
+            usable = [c for c in conds if c.op.upper() in ("=", "IN") or kind == "b+"]
+            if not usable:
+                continue
+            
+            if len(usable) == 1:
+                sel = self.estimate_selectivity(usable[0], scan_cost.get("v_a_r", {}),
+                                                scan_cost.get("histograms"), scan_cost.get("mcv"))
+            else:
+                sel = self._calculate_logical_node_selectivity(LogicalNode("AND", usable), scan_cost.get("v_a_r", {}),
+                                                               scan_cost.get("histograms"), scan_cost.get("mcv"))
+            if any(c.op == "=" for c in usable):
+                lookups = 1
+            else:
+                in_lists = [len(c.value) for c in usable if c.op.upper() == "IN"]
+                lookups = max(1, min(in_lists)) if in_lists else 1
+            
+            matches = max(1, math.ceil(n_r * sel))
+            height = (index.get("value") or 3) if kind == "b+" else 1
+            covering = needed is not None and needed <= _index_columns(column, index)
+            if covering:
+                # index-only: leaf berikutnya saja, heap tidak dibaca
+                _, per_block = self._index_leaf(scan_cost, column, index)
+                io_cost = lookups * height + max(0, math.ceil(matches / per_block) - lookups)
+                path = f"index-only scan ({kind}) on {column}"
+            elif index.get("primary"):
+                io_cost = lookups * height + max(lookups, math.ceil(matches / f_r))
+                path = f"index-scan ({kind}, primary) on {column}"
+            else:
+                io_cost = lookups * height + matches
+                path = f"index-scan ({kind}) on {column}"
+            cpu_cost = self.cpu.cost(matches) + self.cpu.cost(matches, matches * conditions)
+            if io_cost + cpu_cost < best["io_cost"] + best["cpu_cost"]:
+                best = {
+                    "access_path": path,
+                    "index_column": column,
+                    "io_cost": io_cost,
+                    "cpu_cost": cpu_cost,
+                    "order": column if kind == "b+" else None,
+                }
+        return best
+    
+    def _index_conditions(self, condition) -> dict:
+        # {kolom: [ConditionNode]} konjungsi kolom = / IN / range / BETWEEN dengan literal
+        conjuncts = condition.childs if isinstance(condition, LogicalNode) and condition.operator == "AND" else [condition]
+        out = {}
+        for cond in conjuncts:
+            if not isinstance(cond, ConditionNode) or not isinstance(cond.attr, ColumnNode):
+                continue
+            op = cond.op.upper()
+            if isinstance(cond.value, (ColumnNode, dict)):
+                continue
+            if op == "IN" and not isinstance(cond.value, (list, tuple, set)):
+                continue
+            if op in ("=", "IN", "BETWEEN") or op in _RANGE_OPS:
+                out.setdefault(cond.attr.column, []).append(cond)
+        return out
+    
     def cost_projection(self, node: QueryTree, input_cost: dict) -> dict:
         """
         cost untuk operasi projection (π - pi).
@@ -656,19 +1316,23 @@ class CostPlanner:
         rumus:
             - tanpa distinct: size = n_r (sama dengan input)
             - dengan distinct: size = v(a,r)
-            - cost: cost(input) (tidak ada tambahan i/o)
+            - l_r = jumlah lebar kolom yang diproyeksikan (widths input)
+            - f_r = floor(f_r(input) * l_r(input) / l_r), b_r = ceil(n_r / f_r)
+              (tidak pernah lebih besar dari b_r input)
+            - cost: cost(input) (tidak ada tambahan i/o) + cpu: tuple_cost * n_r
         
         parameter:
             node (QueryTree): node dengan type="PROJECT"
             input_cost (dict): cost info dari child node
         
         return:
-            dict: {cost, n_r, b_r, f_r, v_a_r, operation, description}
+            dict: {cost, n_r, b_r, f_r, l_r, widths, v_a_r, operation, description}
         
         dipanggil oleh:
             calculate_cost
         
-        catatan: asumsi tidak ada distinct (belum diimplementasi)
+        catatan: asumsi tidak ada distinct (belum diimplementasi); lebar kolom
+        dari helper.widths, tanpa lebar (widths / l_r input) n_r, b_r, f_r tetap
         """
         columns = node.val
         
@@ -677,48 +1341,90 @@ class CostPlanner:
         output_n_r = input_cost.get("n_r", 1000)
         output_b_r = input_cost.get("b_r", 100)
         output_f_r = input_cost.get("f_r", 10)
+        output_l_r = input_cost.get("l_r")
+        output_widths = input_cost.get("widths", {})
+        
+        # Tuple lebih sempit: block input (f_r * l_r byte) memuat lebih banyak tuple
+        kept = self.required_columns(node, None)
+        if kept is not None and output_widths and output_l_r and output_f_r > 0 and not kept >= set(output_widths):
+            output_widths = {c: w for c, w in output_widths.items() if c in kept}
+            output_l_r = tuple_width(output_widths, kept)
+            if 0 < output_l_r < input_cost["l_r"]:
+                output_f_r = max(output_f_r, int(output_f_r * input_cost["l_r"] // output_l_r))
+                output_b_r = min(output_b_r, max(1, math.ceil(output_n_r / output_f_r)))
         
         # V(A,r) untuk projected attributes tetap sama
         input_v_a_r = input_cost.get("v_a_r", {})
         output_v_a_r = input_v_a_r.copy()  # preserve distinct values
         
-        # Cost = cost input (projection overhead minimal)
-        total_cost = input_cost.get("cost", 0)
+        # Projection tidak menambah I/O, CPU per tuple input
+        io_cost = _io_cost(input_cost)
+        cpu_cost = input_cost.get("cpu_cost", 0) + self.cpu.cost(output_n_r)
         
         return {
             "operation": "PROJECTION",
             "columns": columns,
-            "cost": total_cost,
+            **_costs(io_cost, cpu_cost),
             "n_r": output_n_r,
             "b_r": output_b_r,
             "f_r": output_f_r,
+            "l_r": output_l_r,
+            "widths": output_widths,
             "v_a_r": output_v_a_r,
+            "histograms": input_cost.get("histograms", {}),
+            "mcv": input_cost.get("mcv", {}),
             "indexes": {},  # projection result tidak ada index
+            "keys": input_cost.get("keys", frozenset()),
+            "peak_memory_blocks": input_cost.get("peak_memory_blocks", 1),
+            "order": input_cost.get("order"),
             "description": f"Project columns: {columns}"
         }
     
     def cost_join(self, node: QueryTree, left_cost: dict, right_cost: dict) -> dict:
         """
         cost untuk operasi join (⋈ - bowtie).
-        support nested-loop join, index join (b+/hash), dan hash join.
+        semua method yang berlaku dihitung terhadap buffer m = self.buffer_blocks,
+        yang termurah dipakai (join_method di hasil).
         
-        rumus nested-loop:
-            cost = b_r(r) + n_r(r) * b_r(s)
+        rumus block nested-loop (semua join, r = outer):
+            - b_r(s) <= m - 2: cost = b_r(r) + b_r(s)
+            - selain itu: cost = ceil(b_r(r) / (m - 2)) * b_r(s) + b_r(r)
         
-        rumus index join:
+        rumus index join (index pada atribut join input kanan):
             - b+ tree: cost = b_r(r) + n_r(r) * c
               dimana c = kedalaman + 1
             - hash: cost = b_r(r) + n_r(r) * c_bucket
               dimana c_bucket = b_s / m (m = jumlah bucket)
         
-        rumus hash join (kedua punya hash index):
-            cost = 3 * (b_r(r) + b_r(s))
+        rumus hash join (equi-join, tanpa perlu index):
+            - build side muat di memory: cost = b_r(r) + b_r(s)
+            - grace hash join: cost = 2 * (b_r(r) + b_r(s)) * passes + b_r(r) + b_r(s)
+        
+        rumus sort-merge join (equi-join, atau kalau node.physical memintanya):
+            cost = b_r(r) + b_r(s) + sort(input yang belum terurut)
+        
+        rumus cpu (join_cpu_cost, t = tuple_cost, o = operator_cost):
+            - block nested-loop: t * (n_r(r) + n_r(s)) + o * n_r(r) * n_r(s)
+            - index nested-loop: t * n_r(r) + o * n_r(r) * c (b+) / o * n_r(r) (hash)
+            - hash join: (t + o) * (n_r(r) + n_r(s))
+            - sort-merge: (t + o) * (n_r(r) + n_r(s)) + o * n log2 n per input yang disort
+        join_cost (block I/O) + join_cpu_cost yang termurah dipilih.
+        
+        order output: merge join -> atribut join, nested-loop/index join ->
+        order input kiri (outer), hash join -> tidak terurut
+        
+        memory_blocks: memory yang dipakai method terpilih (join_memory);
+        peak_memory_blocks: maksimum memory_blocks operator di subplan
         
-        rumus estimasi join size:
+        rumus estimasi join size (per pasangan atribut join a = b):
             - case 1 (no common): n_r(r ⋈ s) = n_r(r) * n_r(s)
             - case 2 (key): n_r(r ⋈ s) ≤ n_r(s)
             - case 3 (foreign key): n_r(r ⋈ s) = n_r(s)
-            - case 4 (not key): n_r(r ⋈ s) = (n_r(r) * n_r(s)) / max(v(a,r), v(a,s))
+            - case 4 (not key): n_r(r ⋈ s) = (n_r(r) * n_r(s)) / max(v(a,r), v(b,s))
+            beberapa pasangan (a1 = b1 AND a2 = b2): faktor 1/max(v) dikalikan,
+            dibatasi case 2 kalau atribut join mencakup key salah satu sisi.
+            case 3 tercakup case 4: v(a,r) = n_r(r) untuk key yang direferensikan.
+            atribut join tanpa v(a,r): rata-rata v_a_r input (heuristic lama)
         
         parameter:
             node (QueryTree): node dengan type="JOIN"
@@ -726,29 +1432,54 @@ class CostPlanner:
             right_cost (dict): cost info dari right child
         
         return:
-            dict: {cost, n_r, b_r, f_r, v_a_r, join_cost, join_method, operation, description}
+            dict: {cost, io_cost, cpu_cost, n_r, b_r, f_r, v_a_r, order, join_cost, join_cpu_cost, join_method,
+                   memory_blocks, operation, description}
         
         dipanggil oleh:
             calculate_cost
         """
-        left_n_r = left_cost.get("n_r", 1000)
-        left_b_r = left_cost.get("b_r", 100)
-        left_v_a_r = left_cost.get("v_a_r", {})
-        left_table = left_cost.get("table", None)
+        left_attr, right_attr, left_index, right_index = self.join_inputs(node.val, left_cost, right_cost)
+        forced_merge = getattr(node, "physical", {}).get("join_method") == "merge-join"
+        result = self.estimate_join(left_cost, right_cost, left_attr, right_attr,
+                                    left_index, right_index, forced_merge, self.join_predicates(node.val))
         
-        right_n_r = right_cost.get("n_r", 1000)
-        right_b_r = right_cost.get("b_r", 100)
-        right_v_a_r = right_cost.get("v_a_r", {})
+        # Store temporary stats
+        temp_id = f"join_{id(node)}"
+        self.store_temp_stats(temp_id, result["n_r"], result["b_r"], result["f_r"],
+                              result["v_a_r"], result["indexes"])
+        
+        return {
+            "operation": "JOIN",
+            "join_type": node.val if node.val else "INNER",
+            **result,
+            "description": f"{result['join_method']} join (cost={result['join_cost']:.2f}, cpu={result['join_cpu_cost']:.2f})"
+        }
+    
+    def join_inputs(self, join_condition, left_cost: dict, right_cost: dict) -> tuple:
+        """
+        atribut join dan index yang bisa dipakai untuk join condition.
+        
+        parameter:
+            join_condition: node.val dari JOIN (ConditionNode / ThetaJoin / string)
+            left_cost (dict), right_cost (dict): cost info kedua input
+        
+        return:
+            tuple: (left_attr, right_attr, left_index, right_index)
+        
+        dipanggil oleh:
+            cost_join, CostEngine (di-cache per predikat selama search)
+        """
+        left_table = left_cost.get("table", None)
         right_table = right_cost.get("table", None)
         
-        # Extract join attributes dari condition
-        join_info = self.extract_join_attributes(node.val)
+        # Extract join attributes dari condition, lalu cocokkan sisi predikat
+        # dengan input ("b.y = a.x" dengan a di kiri dibalik) supaya index
+        # inner dan order merge join tidak bergantung pada cara predikat ditulis
+        join_info = self.extract_join_attributes(join_condition)
+        if self._swap_join_sides(join_info, left_cost, right_cost):
+            join_info = join_info[::-1]
         (left_join_table, left_attr), (right_join_table, right_attr) = join_info
         
-        # Determine join method berdasarkan index availability
-        join_method = "nested-loop"
-        join_cost = 0
-        
         # Check index availability untuk join attributes
         left_index = None
         right_index = None
@@ -790,54 +1521,186 @@ class CostPlanner:
                 if right_attr in right_indexes:
                     right_index = right_indexes[right_attr]
         
-        # ===  JOIN METHOD ===
-        #kanan kiri hash index → Hash Join
-        if (left_index and left_index.get('type') == 'hash' and 
-            right_index and right_index.get('type') == 'hash'):
-            join_method = "hash-join"
-            join_cost = 3 * (left_b_r + right_b_r)
+        return left_attr, right_attr, left_index, right_index
+    
+    def choose_join_method(self, left_cost: dict, right_cost: dict, left_attr, right_attr,
+                           left_index, right_index, forced_merge: bool = False) -> tuple:
+        """
+        join method termurah dan cost-nya (rumus di cost_join), tanpa estimasi
+        size hasil join. cost join tidak bergantung pada size hasil, jadi
+        search bisa membandingkan kandidat sebelum menghitung estimate_join.
+        method dibandingkan dari join_cost + join_cpu_cost.
+        
+        return:
+            tuple: (join_method, join_cost (block I/O), output_order, join_cpu_cost)
         
-        #kanan pake B+ index → Index Nested-Loop Join
-        elif right_index and right_index.get('type') == 'b+':
-            join_method = "index-nested-loop (b+)"
+        dipanggil oleh:
+            estimate_join, CostEngine
+        """
+        left_n_r = left_cost.get("n_r", 1000)
+        left_b_r = left_cost.get("b_r", 100)
+        right_n_r = right_cost.get("n_r", 1000)
+        right_b_r = right_cost.get("b_r", 100)
+        M = self.buffer_blocks
+        cpu = self.cpu
+        left_order = left_cost.get("order")
+        
+        # Block nested-loop selalu bisa dipakai (termasuk cartesian / non-equi),
+        # predikat dievaluasi untuk setiap pasangan tuple
+        join_method = "block-nested-loop"
+        join_cost = block_nested_loop_cost(left_b_r, right_b_r, M)
+        join_cpu = cpu.cost(left_n_r + right_n_r, left_n_r * right_n_r)
+        output_order = left_order
+        
+        def cheaper(io, cpu_cost):
+            return io + cpu_cost < join_cost + join_cpu
+        
+        # Index nested-loop: index pada atribut join input kanan (inner)
+        if right_index and right_index.get('type') == 'b+':
             c = right_index.get('value', 3) + 1  # depth + 1
-            join_cost = left_b_r + (left_n_r * c)
-        
-        #kanan pake hash index → Index Nested-Loop Join (hash)
+            cost = left_b_r + (left_n_r * c)
+            cost_cpu = cpu.cost(left_n_r, left_n_r * c)
+            if cheaper(cost, cost_cpu):
+                join_method, join_cost, join_cpu = "index-nested-loop (b+)", cost, cost_cpu
         elif right_index and right_index.get('type') == 'hash':
-            join_method = "index-nested-loop (hash)"
             m = right_index.get('value', 10)  # number of buckets
             c_bucket = right_b_r / m if m > 0 else right_b_r
-            join_cost = left_b_r + (left_n_r * c_bucket)
+            cost = left_b_r + (left_n_r * c_bucket)
+            cost_cpu = cpu.cost(left_n_r, left_n_r)
+            if cheaper(cost, cost_cpu):
+                join_method, join_cost, join_cpu = "index-nested-loop (hash)", cost, cost_cpu
+        
+        if left_attr and right_attr:
+            # Hash join: in-memory atau grace, output tidak terurut; hash + probe per tuple
+            cost = hash_join_cost(left_b_r, right_b_r, M)
+            cost_cpu = cpu.cost(left_n_r + right_n_r, left_n_r + right_n_r)
+            if cheaper(cost, cost_cpu):
+                join_method, join_cost, join_cpu, output_order = "hash-join", cost, cost_cpu, None
+            
+            # Sort-merge join: manfaatkan input yang sudah terurut (interesting order)
+            left_sorted = left_order == left_attr
+            right_sorted = right_cost.get("order") == right_attr
+            merge_cost = left_b_r + right_b_r
+            comparisons = left_n_r + right_n_r
+            if not left_sorted:
+                merge_cost += external_sort_cost(left_b_r, M)
+                comparisons += sort_comparisons(left_n_r)
+            if not right_sorted:
+                merge_cost += external_sort_cost(right_b_r, M)
+                comparisons += sort_comparisons(right_n_r)
+            merge_cpu = cpu.cost(left_n_r + right_n_r, comparisons)
+            if forced_merge or cheaper(merge_cost, merge_cpu):
+                join_method, join_cost, join_cpu, output_order = "merge-join", merge_cost, merge_cpu, left_attr
+        
+        return join_method, join_cost, output_order, join_cpu
+    
+    def join_memory(self, join_method: str, left_cost: dict, right_cost: dict, left_attr, right_attr) -> int:
+        """
+        memory (blocks) yang dipakai join method terhadap m = self.buffer_blocks:
+            - block nested-loop: min(b_r(s) + 2, m), inner sebanyak mungkin di memory
+            - index nested-loop: 3 (block outer, block index/bucket, output)
+            - hash join: min(build + 2, m), build = input terkecil (grace: m)
+            - merge join: 3, atau memory sort input yang belum terurut
         
-        #No index → Nested-Loop Join
-        else:
-            join_method = "nested-loop"
-            join_cost = left_b_r + (left_n_r * right_b_r)
+        dipanggil oleh:
+            estimate_join
+        """
+        M = self.buffer_blocks
+        left_b_r = left_cost.get("b_r", 100)
+        right_b_r = right_cost.get("b_r", 100)
+        if join_method == "block-nested-loop":
+            return min(right_b_r + 2, M)
+        if join_method == "hash-join":
+            return min(min(left_b_r, right_b_r) + 2, M)
+        memory_blocks = 3
+        if join_method == "merge-join":
+            if left_cost.get("order") != left_attr:
+                memory_blocks = max(memory_blocks, sort_memory(left_b_r, M))
+            if right_cost.get("order") != right_attr:
+                memory_blocks = max(memory_blocks, sort_memory(right_b_r, M))
+        return memory_blocks
+    
+    def estimate_join(self, left_cost: dict, right_cost: dict, left_attr, right_attr,
+                      left_index, right_index, forced_merge: bool = False, join_pairs: list = None) -> dict:
+        """
+        join method, cost, dan estimasi size hasil join (rumus di cost_join)
+        dari atribut dan index yang sudah di-resolve join_inputs.
+        join_pairs: hasil join_predicates ([] = cartesian, None = tidak diketahui).
         
-        total_cost = left_cost.get("cost", 0) + right_cost.get("cost", 0) + join_cost
+        return:
+            dict: {join_method, order, cost, io_cost, cpu_cost, n_r, b_r, f_r, v_a_r, histograms, mcv,
+                   indexes, keys, join_cost, join_cpu_cost, memory_blocks, peak_memory_blocks}
         
-        # === SIZE ESTIMATION ===
-        # Karena kita tidak tahu join attribute atau key info,
-        # gunakan R ∩ S = {A} not a key
-        # Formula: n_r(R ⋈ S) = (n_r(R) * n_r(S)) / max(V(A,R), V(A,S))
+        dipanggil oleh:
+            cost_join, CostEngine
+        """
+        left_n_r = left_cost.get("n_r", 1000)
+        left_b_r = left_cost.get("b_r", 100)
+        left_v_a_r = left_cost.get("v_a_r", {})
+        
+        right_n_r = right_cost.get("n_r", 1000)
+        right_b_r = right_cost.get("b_r", 100)
+        right_v_a_r = right_cost.get("v_a_r", {})
+        
+        join_method, join_cost, output_order, join_cpu = self.choose_join_method(
+            left_cost, right_cost, left_attr, right_attr, left_index, right_index, forced_merge
+        )
+        memory_blocks = self.join_memory(join_method, left_cost, right_cost, left_attr, right_attr)
+        peak_memory_blocks = max(memory_blocks, left_cost.get("peak_memory_blocks", 1),
+                                 right_cost.get("peak_memory_blocks", 1))
+        
+        io_cost = _io_cost(left_cost) + _io_cost(right_cost) + join_cost
+        cpu_cost = left_cost.get("cpu_cost", 0) + right_cost.get("cpu_cost", 0) + join_cpu
         
-        # Heuristic: asumsi ada common attribute dengan V(A,R) dan V(A,S)
-        # Ambil rata-rata dari distinct values sebagai estimasi
+        # === SIZE ESTIMATION ===
+        # Heuristic kalau atribut join tidak diketahui: asumsi ada common
+        # attribute dengan V(A,R) dan V(A,S) = rata-rata distinct values
         avg_v_left = sum(left_v_a_r.values()) / len(left_v_a_r) if left_v_a_r else 100
         avg_v_right = sum(right_v_a_r.values()) / len(right_v_a_r) if right_v_a_r else 100
         max_v = max(avg_v_left, avg_v_right)
         
-        if max_v > 0:
+        left_keys = left_cost.get("keys", frozenset())
+        right_keys = right_cost.get("keys", frozenset())
+        pairs = self._orient_join_pairs(join_pairs, left_cost, right_cost) if join_pairs else []
+        pair_v = []  # (left_attr, right_attr, V(a,r), V(b,s))
+        left_unique = right_unique = False
+        
+        if join_pairs is None:
             # Formula: n_r(R ⋈ S) = (n_r(R) * n_r(S)) / max(V(A,R), V(A,S))
-            output_n_r = int((left_n_r * right_n_r) / max_v)
+            output_n_r = int((left_n_r * right_n_r) / max_v) if max_v > 0 else int(left_n_r * right_n_r * 0.1)
         else:
-            # Fallback: cartesian product dengan selectivity 0.1
-            output_n_r = int(left_n_r * right_n_r * 0.1)
+            # Case 1 (cartesian): n_r(R) * n_r(S), dikecilkan 1/max(v) per pasangan
+            size = float(left_n_r) * right_n_r
+            for la, ra in pairs:
+                v_left = _distinct(la, left_cost)
+                v_right = _distinct(ra, right_cost)
+                pair_v.append((la, ra, v_left, v_right))
+                known = max(v_left or 0, v_right or 0)
+                size /= known if known > 0 else max(max_v, 1)
+            
+            # Case 2 (key): setiap tuple sisi lain match paling banyak satu tuple
+            left_attrs = {la for la, _ in pairs}
+            right_attrs = {ra for _, ra in pairs}
+            left_unique = any(key <= left_attrs for key in left_keys)
+            right_unique = any(key <= right_attrs for key in right_keys)
+            if left_unique:
+                size = min(size, right_n_r)
+            if right_unique:
+                size = min(size, left_n_r)
+            output_n_r = max(1, int(min(size, _MAX_ROWS)))
         
         # Estimasi blocking factor untuk join result
-        # Asumsi: f_r = average dari kedua input
-        output_f_r = (left_cost.get("f_r", 10) + right_cost.get("f_r", 10)) // 2
+        # tuple hasil = tuple kiri + tuple kanan: f_r = block / (l_r kiri + l_r kanan),
+        # ukuran block dari input (f_r * l_r); tanpa l_r: average f_r kedua input
+        left_l_r, right_l_r = left_cost.get("l_r"), right_cost.get("l_r")
+        output_widths = {**right_cost.get("widths", {}), **left_cost.get("widths", {})}
+        if left_l_r and right_l_r:
+            output_l_r = left_l_r + right_l_r
+            block = max(left_cost.get("f_r", 10) * left_l_r, right_cost.get("f_r", 10) * right_l_r)
+            output_f_r = max(1, int(block // output_l_r))
+        else:
+            output_l_r = None
+            output_f_r = (left_cost.get("f_r", 10) + right_cost.get("f_r", 10)) // 2
         
         # Estimasi blocks untuk join result
         # Formula: b_r = ceil(n_r / f_r)
@@ -886,24 +1749,69 @@ class CostPlanner:
             if attr in output_v_a_r and attr not in output_indexes:
                 output_indexes[attr] = idx_info
         
-        # Store temporary stats
-        temp_id = f"join_{id(node)}"
-        self.store_temp_stats(temp_id, output_n_r, output_b_r, output_f_r, output_v_a_r, output_indexes)
+        # Atribut join a = b: V(a, r⋈s) = V(b, r⋈s) = min(V(a,r), V(b,s), n_r⋈s)
+        for la, ra, v_left, v_right in pair_v:
+            if v_left and v_right:
+                output_v_a_r[la] = output_v_a_r[ra] = min(v_left, v_right, output_n_r)
+        
+        # Key hasil join: key sisi kanan tetap unik kalau tiap tuple kanan
+        # match paling banyak satu tuple kiri (atribut join = key kiri), dst.
+        output_keys = frozenset()
+        if left_unique:
+            output_keys |= right_keys
+        if right_unique:
+            output_keys |= left_keys
         
         return {
-            "operation": "JOIN",
-            "join_type": node.val if node.val else "INNER",
             "join_method": join_method,
-            "cost": total_cost,
+            "order": output_order,
+            **_costs(io_cost, cpu_cost),
             "n_r": output_n_r,
             "b_r": output_b_r,
             "f_r": output_f_r,
+            "l_r": output_l_r,
+            "widths": output_widths,
             "v_a_r": output_v_a_r,
+            "histograms": {**right_cost.get("histograms", {}), **left_cost.get("histograms", {})},
+            "mcv": {**right_cost.get("mcv", {}), **left_cost.get("mcv", {})},
             "indexes": output_indexes,  # preserve indexes untuk subsequent joins
+            "keys": output_keys,
             "join_cost": join_cost,
-            "description": f"{join_method} join (cost={join_cost:.2f})"
+            "join_cpu_cost": join_cpu,
+            "memory_blocks": memory_blocks,
+            "peak_memory_blocks": peak_memory_blocks,
         }
     
+    def _orient_join_pairs(self, join_pairs, left_cost: dict, right_cost: dict) -> list:
+        """
+        pasangan (atribut kiri, atribut kanan) sesuai sisi input; predikat
+        "b.y = a.x" dengan a di kiri dibalik. sisi ditentukan dari nama tabel
+        (scan) atau keberadaan atribut di v_a_r / keys input.
+        """
+        pairs = []
+        for pair in join_pairs:
+            (_, la), (_, ra) = pair
+            pairs.append((ra, la) if self._swap_join_sides(pair, left_cost, right_cost) else (la, ra))
+        return pairs
+    
+    def _swap_join_sides(self, pair, left_cost: dict, right_cost: dict) -> bool:
+        """
+        True kalau sisi kiri predikat ((tabel, atribut), (tabel, atribut))
+        milik input kanan. sisi ditentukan dari nama tabel (scan) atau
+        keberadaan atribut di v_a_r / keys input.
+        """
+        (lt, la), (rt, ra) = pair
+        if la is None or ra is None:
+            return False
+        left_table = left_cost.get("table")
+        right_table = right_cost.get("table")
+        lt = self.alias_map.get(lt, lt)
+        rt = self.alias_map.get(rt, rt)
+        if left_table or right_table:
+            return (lt is not None and lt == right_table) or (rt is not None and rt == left_table)
+        return (not (_has_attr(left_cost, la) or _has_attr(right_cost, ra))
+                and (_has_attr(left_cost, ra) or _has_attr(right_cost, la)))
+    
     def cost_sort(self, node: QueryTree, input_cost: dict) -> dict:
         """
         cost untuk operasi sort (order by).
@@ -913,51 +1821,59 @@ class CostPlanner:
             - in-memory (b_r ≤ m): cost = b_r
             - external: cost = 2 * b_r * (1 + ⌈log_{m-1}(b_r/m)⌉)
             - m = jumlah blocks di memory buffer
+            - cpu: tuple_cost * n_r + operator_cost * n_r * log2(n_r)
         
         parameter:
             node (QueryTree): node dengan type="SORT"
             input_cost (dict): cost info dari child node
         
         return:
-            dict: {cost, n_r, b_r, f_r, v_a_r, sort_cost, operation, description}
+            dict: {cost, n_r, b_r, f_r, v_a_r, sort_cost, memory_blocks, operation, description}
         
         dipanggil oleh:
             calculate_cost
         
-        catatan: asumsi m = 100 blocks (harus diganti dengan config dari sm)
+        m = self.buffer_blocks, memory_blocks = min(b_r, m). kalau input sudah terurut pada kolom sort (order dari merge join, sort
+        lain, atau aggregation terurut), sort dilewati: sort_cost = 0.
         """
         input_b_r = input_cost.get("b_r", 100)
         input_n_r = input_cost.get("n_r", 1000)
+        sort_column = order_column(node.val)
         
-        # TODO: Asumsi memory buffer size dari Storage Manager
-        # Seharusnya didapat dari storage_manager.get_buffer_pool_size() atau config
-        # Asumsi sementara: memory dapat hold 100 blocks
-        M = 100
-        
-        if input_b_r <= M:
-            # In-memory sort: hanya satu pass
-            sort_cost = input_b_r
+        if sort_column is not None and input_cost.get("order") == sort_column:
+            sort_cost = 0
+            sort_cpu = 0
+            memory_blocks = 1
+            description = f"Sort avoided (input already ordered on {sort_column})"
         else:
-            # External merge sort
-            # Formula: 2 * b_r * (1 + ⌈log_{M-1}(b_r/M)⌉)
-            num_runs = math.ceil(input_b_r / M)
-            num_passes = math.ceil(math.log(num_runs, M - 1)) if M > 1 else 1
-            sort_cost = 2 * input_b_r * (1 + num_passes)
+            sort_cost = external_sort_cost(input_b_r, self.buffer_blocks)
+            sort_cpu = self.cpu.cost(input_n_r, sort_comparisons(input_n_r))
+            memory_blocks = sort_memory(input_b_r, self.buffer_blocks)
+            description = f"External Merge Sort (cost={sort_cost})"
         
-        total_cost = input_cost.get("cost", 0) + sort_cost
+        io_cost = _io_cost(input_cost) + sort_cost
+        cpu_cost = input_cost.get("cpu_cost", 0) + sort_cpu
         
         # Sort tidak mengubah n_r, b_r, atau v_a_r
         return {
             "operation": "SORT",
             "sort_key": node.val,
-            "cost": total_cost,
+            **_costs(io_cost, cpu_cost),
             "n_r": input_cost.get("n_r", 1000),
             "b_r": input_cost.get("b_r", 100),
             "f_r": input_cost.get("f_r", 10),
+            "l_r": input_cost.get("l_r"),
+            "widths": input_cost.get("widths", {}),
             "v_a_r": input_cost.get("v_a_r", {}),
+            "histograms": input_cost.get("histograms", {}),
+            "mcv": input_cost.get("mcv", {}),
             "indexes": input_cost.get("indexes", {}),  # preserve indexes dari input
+            "keys": input_cost.get("keys", frozenset()),
+            "order": sort_column,
+            "memory_blocks": memory_blocks,
+            "peak_memory_blocks": max(memory_blocks, input_cost.get("peak_memory_blocks", 1)),
             "sort_cost": sort_cost,
-            "description": f"External Merge Sort (cost={sort_cost})"
+            "description": description
         }
     
     def cost_limit(self, node: QueryTree, input_cost: dict) -> dict:
@@ -967,7 +1883,7 @@ class CostPlanner:
         
         rumus:
             - output tuples: min(limit, n_r)
-            - cost reduction: cost * (limit / n_r)
+            - cost reduction: cost * (limit / n_r), untuk io_cost dan cpu_cost
         
         parameter:
             node (QueryTree): node dengan type="LIMIT"
@@ -998,7 +1914,8 @@ class CostPlanner:
         else:
             reduction_factor = 1.0
         
-        total_cost = input_cost.get("cost", 0) * reduction_factor
+        io_cost = _io_cost(input_cost) * reduction_factor
+        cpu_cost = input_cost.get("cpu_cost", 0) * reduction_factor
         
         # Blocks juga reduced
         output_b_r = max(1, int(input_cost.get("b_r", 100) * reduction_factor))
@@ -1006,12 +1923,19 @@ class CostPlanner:
         return {
             "operation": "LIMIT",
             "limit": limit_val,
-            "cost": total_cost,
+            **_costs(io_cost, cpu_cost),
             "n_r": output_n_r,
             "b_r": output_b_r,
             "f_r": input_cost.get("f_r", 10),
+            "l_r": input_cost.get("l_r"),
+            "widths": input_cost.get("widths", {}),
             "v_a_r": input_cost.get("v_a_r", {}),
+            "histograms": input_cost.get("histograms", {}),
+            "mcv": input_cost.get("mcv", {}),
             "indexes": input_cost.get("indexes", {}),  # preserve indexes dari input
+            "keys": input_cost.get("keys", frozenset()),
+            "peak_memory_blocks": input_cost.get("peak_memory_blocks", 1),
+            "order": input_cost.get("order"),
             "description": f"Limit to {limit_val} records"
         }
     
@@ -1023,6 +1947,10 @@ class CostPlanner:
         rumus:
             - output size: v(a,r) untuk group by a
             - cost: cost(input) + b_r (build hash table)
+            - input sudah terurut pada kolom group: aggregation streaming,
+              cost(input) saja, output terurut pada kolom group
+            - memory_blocks: min(b_r(output) + 1, m) untuk hash table, 1 kalau streaming
+            - cpu: tuple_cost * n_r + operator_cost * n_r (hash / bandingkan group per tuple)
             - v(a,r) untuk min/max: min(v(a,r), v(g,r))
         
         parameter:
@@ -1049,14 +1977,20 @@ class CostPlanner:
         else:
             output_n_r = max(1, int(input_n_r * 0.1))
         
-        # Hash table build cost
-        agg_cost = input_b_r
-        total_cost = input_cost.get("cost", 0) + agg_cost
+        # Hash table build cost, kecuali input sudah terurut pada kolom group
+        group_column = order_column(node.val)
+        sorted_input = group_column is not None and input_cost.get("order") == group_column
+        agg_cost = 0 if sorted_input else input_b_r
+        io_cost = _io_cost(input_cost) + agg_cost
+        cpu_cost = input_cost.get("cpu_cost", 0) + self.cpu.cost(input_n_r, input_n_r)
         
         # Output blocks
         output_f_r = input_cost.get("f_r", 10)
         output_b_r = max(1, math.ceil(output_n_r / output_f_r)) if output_f_r > 0 else input_b_r
         
+        # Memory: hash table sebesar output (dibatasi m), streaming cukup 1 block
+        memory_blocks = 1 if sorted_input else min(output_b_r + 1, self.buffer_blocks)
+        
         # V(A,r) untuk aggregated values
         # "For min(A) and max(A), the number of distinct values can be estimated as 
         #  min(V(A,r), V(G,r)) where G denotes grouping attributes"
@@ -1067,83 +2001,100 @@ class CostPlanner:
         return {
             "operation": "AGGREGATION",
             "aggregate": node.val,
-            "cost": total_cost,
+            **_costs(io_cost, cpu_cost),
             "n_r": output_n_r,
             "b_r": output_b_r,
             "f_r": output_f_r,
             "v_a_r": output_v_a_r,
             "indexes": {},  # aggregation result tidak ada index
+            "keys": frozenset([frozenset([group_column])]) if group_column else frozenset(),
+            "order": group_column if sorted_input else None,
+            "memory_blocks": memory_blocks,
+            "peak_memory_blocks": max(memory_blocks, input_cost.get("peak_memory_blocks", 1)),
             "agg_cost": agg_cost,
-            "description": f"Aggregation: {node.val} (cost={agg_cost})"
+            "description": f"{'Sorted' if sorted_input else 'Hash'} aggregation: {node.val} (cost={agg_cost})"
         }
     
     # =================================================================== MAIN COST PLANNING ======================================================================
     
-    def calculate_cost(self, node: QueryTree) -> dict:
+    def calculate_cost(self, node: QueryTree, trace: list = None, columns=None) -> dict:
         """
         menghitung cost untuk query tree secara rekursif.
         bottom-up approach: hitung children dulu, lalu parent.
         
         parameter:
             node (QueryTree): node untuk dihitung costnya
+            trace (list): kalau diisi, (node, cost_info) setiap operator
+                          ditambahkan bottom-up (dipakai plan_query)
+            columns (set): kolom output node yang dibutuhkan parent, None =
+                           semua kolom (untuk index-only scan, lihat required_columns)
         
         return:
             dict: {operation, cost, n_r, b_r, f_r, v_a_r, description}
         
         dipanggil oleh:
-            get_cost
+            get_cost, plan_query
         """
+        result = self._calculate_cost(node, trace, columns)
+        if trace is not None:
+            trace.append((node, result))
+        return result
+    
+    def _calculate_cost(self, node: QueryTree, trace, columns) -> dict:
+        # dispatch per type operator, child dihitung lewat calculate_cost
+        # dengan kolom yang dibutuhkan node ini dari child-nya
+        needed = self.required_columns(node, columns)
         if node.type == "TABLE":
-            return self.cost_table_scan(node)
+            return self.cost_table_scan(node, columns)
         
         elif node.type == "SIGMA" or node.type == "SELECT":
             # Selection operation
             # NOTE: Sekarang support LogicalNode (AND/OR) dan ConditionNode
             if not node.childs:
                 return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
-            child_cost = self.calculate_cost(node.childs[0])
+            child_cost = self.calculate_cost(node.childs[0], trace, needed)
             return self.cost_selection(node, child_cost)
         
         elif node.type == "PROJECT":
             # Projection operation
             if not node.childs:
                 return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
-            child_cost = self.calculate_cost(node.childs[0])
+            child_cost = self.calculate_cost(node.childs[0], trace, needed)
             return self.cost_projection(node, child_cost)
         
         elif node.type == "JOIN":
             # Join operation
             if len(node.childs) < 2:
                 return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
-            left_cost = self.calculate_cost(node.childs[0])
-            right_cost = self.calculate_cost(node.childs[1])
+            left_cost = self.calculate_cost(node.childs[0], trace, needed)
+            right_cost = self.calculate_cost(node.childs[1], trace, needed)
             return self.cost_join(node, left_cost, right_cost)
         
         elif node.type == "SORT" or node.type == "ORDER":
             # Sort operation
             if not node.childs:
                 return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
-            child_cost = self.calculate_cost(node.childs[0])
+            child_cost = self.calculate_cost(node.childs[0], trace, needed)
             return self.cost_sort(node, child_cost)
         
         elif node.type == "LIMIT":
             # Limit operation
             if not node.childs:
                 return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
-            child_cost = self.calculate_cost(node.childs[0])
+            child_cost = self.calculate_cost(node.childs[0], trace, needed)
             return self.cost_limit(node, child_cost)
         
         elif node.type in ["GROUP", "AGGREGATE", "COUNT", "SUM", "AVG"]:
             # Aggregation operations
             if not node.childs:
                 return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
-            child_cost = self.calculate_cost(node.childs[0])
+            child_cost = self.calculate_cost(node.childs[0], trace, needed)
             return self.cost_aggregation(node, child_cost)
         
         else:
             # Unknown operation, just pass through child cost
             if node.childs:
-                return self.calculate_cost(node.childs[0])
+                return self.calculate_cost(node.childs[0], trace, needed)
             return {"cost": 0, "n_r": 0, "b_r": 0, "f_r": 1, "v_a_r": {}}
     
 
@@ -1180,7 +2131,10 @@ class CostPlanner:
             parsed_query (ParsedQuery): object dengan query_tree
         
         return:
-            dict: {query, total_cost, estimated_records, blocks_read, details}
+            dict: {query, total_cost, io_cost, cpu_cost, estimated_records, blocks_read,
+                   operators, details}
+            operators: bottom-up [{operation, description, io_cost, cpu_cost}] dengan
+            cost milik operator itu saja (tanpa cost child)
         
         dipanggil oleh:
             user code (untuk debugging/analysis)
@@ -1192,13 +2146,27 @@ class CostPlanner:
                 "total_cost": 0
             }
         
-        cost_info = self.calculate_cost(parsed_query.query_tree)
+        trace = []
+        cost_info = self.calculate_cost(parsed_query.query_tree, trace)
+        infos = {id(node): info for node, info in trace}
+        operators = []
+        for node, info in trace:
+            children = [infos[id(c)] for c in node.childs if id(c) in infos]
+            operators.append({
+                "operation": info.get("operation", node.type),
+                "description": info.get("description", ""),
+                "io_cost": _io_cost(info) - sum(_io_cost(c) for c in children),
+                "cpu_cost": info.get("cpu_cost", 0) - sum(c.get("cpu_cost", 0) for c in children),
+            })
         
         return {
             "query": parsed_query.query,
             "total_cost": cost_info.get("cost", 0),
+            "io_cost": _io_cost(cost_info),
+            "cpu_cost": cost_info.get("cpu_cost", 0),
             "estimated_records": cost_info.get("n_r", 0),
             "blocks_read": cost_info.get("b_r", 0),
+            "operators": operators,
             "details": cost_info
         }
     
@@ -1219,11 +2187,15 @@ class CostPlanner:
         print("QUERY COST PLAN")
         print("=" * 60)
         print(f"Query: {cost_plan.get('query', 'N/A')}")
-        print(f"Total Cost: {cost_plan.get('total_cost', 0):.2f}")
+        print(f"Total Cost: {cost_plan.get('total_cost', 0):.2f} "
+              f"(I/O {cost_plan.get('io_cost', 0):.2f}, CPU {cost_plan.get('cpu_cost', 0):.2f})")
         print(f"Estimated Records: {cost_plan.get('estimated_records', 0)}")
         print(f"Blocks Read: {cost_plan.get('blocks_read', 0)}")
         print("=" * 60)
         
+        for op in cost_plan.get('operators', []):
+            print(f"  {op['operation']:<12} I/O {op['io_cost']:>10.2f}  CPU {op['cpu_cost']:>10.2f}  {op['description']}")
+        
         if 'details' in cost_plan:
             self._print_details(cost_plan['details'], indent=0)
     
@@ -1243,7 +2215,8 @@ class CostPlanner:
         """
         prefix = "  " * indent
         print(f"{prefix}Operation: {details.get('operation', 'Unknown')}")
-        print(f"{prefix}Cost: {details.get('cost', 0):.2f}")
+        print(f"{prefix}Cost: {details.get('cost', 0):.2f} "
+              f"(I/O {_io_cost(details):.2f}, CPU {details.get('cpu_cost', 0):.2f})")
         print(f"{prefix}Description: {details.get('description', 'N/A')}")
         print()
 
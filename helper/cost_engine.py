@@ -0,0 +1,264 @@
+"""
+Satu model cost untuk join search, top-k plan dan get_cost.
+
+CostEngine punya dua jalur atas model yang sama:
+    plan_cost(node)            : cost plan lengkap (QueryTree)
+    search_model(graph, bushy) : model inkremental untuk enumerator di
+                                 helper.join_order (leaf / join / join_cost /
+                                 cost / lower_bound / dominates, lihat
+                                 PlanCostModel; ordered_joins / sort_cost
+                                 untuk dp_join_order_orders)
+cost inkremental sebuah urutan sama dengan plan_cost(build_join_tree(urutan))
+(bushy: build_bushy_join_tree(shape)).
+
+model:
+    "planner": CostPlanner (index, join method, estimasi size dari v_a_r).
+               Jalur inkremental memanggil CostPlanner.estimate_join langsung
+               dengan atribut dan index join yang di-resolve sekali per
+               predikat, jadi tiap join O(jumlah atribut) tanpa parsing
+    "simple" : helper.plan_cost / PlanCostModel (rows = max, SIGMA / 2)
+"""
+
+from model.query_tree import QueryTree, TableReference
+from helper.cost import CostPlanner, _io_cost
+from helper.helper import plan_cost, plan_cost_breakdown, _mk_theta, _alias_map
+from helper.join_order import PlanCostModel
+
+
+COST_MODELS = ("planner", "simple")
+
+
+class PlannerCostModel:
+    """
+    model inkremental CostPlanner untuk satu join graph.
+    state subplan = (cost_info CostPlanner, mask tabel, indeks tabel paling kiri).
+    predikat join dipilih persis seperti builder plan: left-deep memakai
+    predikat dengan tabel paling kiri dulu (build_join_tree), bushy memakai
+    graph.predicate (build_bushy_join_tree).
+    """
+
+    def __init__(self, planner: CostPlanner, graph, bushy: bool = False):
+        self.planner = planner
+        self.graph = graph
+        self.bushy = bushy
+        self._leaves = {}
+        self._inputs = {}  # (predikat, mask kanan) -> ((left_attr, right_attr, left_index, right_index), join_pairs)
+
+    def leaf(self, table: str) -> tuple:
+        state = self._leaves.get(table)
+        if state is None:
+            i = self.graph.index[table]
+            info = self.planner.cost_table_scan(QueryTree("TABLE", table))
+            state = self._leaves[table] = (info, 1 << i, i)
+        return state
+
+    def _predicate(self, left_mask, right_mask, first):
+        graph = self.graph
+        if not self.bushy and right_mask & (right_mask - 1) == 0:
+            return graph.preds[first][right_mask.bit_length() - 1] or graph.predicate(left_mask, right_mask)
+        return graph.predicate(left_mask, right_mask)
+
+    def _join_inputs(self, left: tuple, right: tuple) -> tuple:
+        # (atribut dan index join, pasangan equi-join) di-cache per predikat
+        # dan input kanan (sisi predikat dicocokkan dengan input); None = cartesian
+        pred = self._predicate(left[1], right[1], left[2])
+        key = (pred, right[1])
+        cached = self._inputs.get(key)
+        if cached is None:
+            val = _mk_theta(pred) if pred else "CARTESIAN"
+            cached = (self.planner.join_inputs(val, left[0], right[0]), self.planner.join_predicates(val))
+            (left_table, _), (right_table, _) = self.planner.extract_join_attributes(val)
+            # tabel di predikat tidak lengkap: index bergantung pada input
+            if pred is not None and (left_table is None or right_table is None):
+                return cached
+            self._inputs[key] = cached
+        return cached
+
+    def join(self, left: tuple, right: tuple) -> tuple:
+        inputs, pairs = self._join_inputs(left, right)
+        info = self.planner.estimate_join(left[0], right[0], *inputs, False, pairs)
+        return (info, left[1] | right[1], left[2])
+
+    def join_cost(self, left: tuple, right: tuple):
+        """cost(join(left, right)) tanpa estimasi size hasil join"""
+        left_info, right_info = left[0], right[0]
+        _, join_cost, _, join_cpu = self.planner.choose_join_method(left_info, right_info,
+                                                                    *self._join_inputs(left, right)[0])
+        # dijumlah dengan urutan yang sama seperti estimate_join (io + cpu)
+        io_cost = _io_cost(left_info) + _io_cost(right_info) + join_cost
+        return io_cost + (left_info.get("cpu_cost", 0) + right_info.get("cpu_cost", 0) + join_cpu)
+
+    def cost(self, state: tuple):
+        return state[0]["cost"]
+
+    def lower_bound(self, state: tuple, rest) -> float:
+        # join_cost tidak pernah negatif, jadi setiap leaf sisa minimal
+        # menambah cost scan-nya
+        return state[0]["cost"] + sum(leaf[0]["cost"] for leaf in rest)
+
+    def dominates(self, a: tuple, b: tuple) -> bool:
+        # subplan untuk himpunan tabel yang sama dibandingkan dari cost, n_r
+        # dan b_r; semua yang menentukan join berikutnya harus sama: tabel
+        # paling kiri (pilihan predikat di _predicate), order (merge join /
+        # sort), v_a_r (estimasi size estimate_join) dan lebar tuple
+        x, y = a[0], b[0]
+        return (a[2] == b[2] and x["cost"] <= y["cost"] and x["n_r"] <= y["n_r"] and x["b_r"] <= y["b_r"]
+                and x.get("order") == y.get("order") and x.get("v_a_r") == y.get("v_a_r")
+                and x.get("l_r") == y.get("l_r"))
+
+    def ordered_joins(self, left: tuple, right: tuple, left_order, key) -> list:
+        """
+        kandidat join untuk dp_join_order_orders: join method termurah
+        CostPlanner, plus merge join paksa (forced_merge) kalau ada kolom
+        equi-join (key) dan CostPlanner tidak memilih merge join sendiri.
+        order diambil dari cost info (yang dicek cost_join / cost_sort
+        berikutnya), left_order tidak dipakai.
+        """
+        state = self.join(left, right)
+        out = [(state, _order(state[0]), state[0]["join_method"])]
+        if key is not None and state[0]["join_method"] != "merge-join":
+            inputs, pairs = self._join_inputs(left, right)
+            if inputs[0] and inputs[1]:
+                info = self.planner.estimate_join(left[0], right[0], *inputs, True, pairs)
+                out.append(((info, left[1] | right[1], left[2]), _order(info), "merge-join"))
+        return out
+
+    def sort_cost(self, state: tuple, column=None):
+        """cost tambahan CostPlanner.cost_sort pada column (0 kalau input sudah terurut)"""
+        info = state[0]
+        return self.planner.cost_sort(QueryTree("SORT", column), info)["cost"] - info["cost"]
+
+
+def _order(info: dict):
+    # order cost info sebagai properti order dp_join_order_orders
+    order = info.get("order")
+    return frozenset({order}) if order else None
+
+
+class CostEngine:
+    """
+    model cost yang dipakai OptimizationEngine untuk memilih dan melaporkan plan.
+    stats: format helper.stats.get_stats; aliases: alias -> nama tabel
+    (untuk predikat seperti "m.movie_id = r.movie_id"); memory: MemoryConfig /
+    int buffer_blocks / dict config (helper.memory) untuk join dan sort model
+    "planner"; cpu: CpuWeights / dict config (helper.cpu_cost) model "planner".
+    """
+
+    def __init__(self, stats: dict, model: str = "planner", aliases: dict = None, storage_manager=None,
+                 memory=None, cpu=None):
+        if model not in COST_MODELS:
+            raise ValueError(f"Unknown cost model: {model}")
+        self.stats = stats
+        self.model = model
+        self.planner = CostPlanner(storage_manager, stats, memory, cpu)
+        self.planner.alias_map.update(aliases or {})
+
+    def search_model(self, graph, bushy: bool = False):
+        if self.model == "simple":
+            return PlanCostModel(self.stats, self.planner.buffer_blocks)
+        return PlannerCostModel(self.planner, graph, bushy)
+
+    def plan_cost(self, node: QueryTree):
+        if node is None:
+            return 0
+        if self.model == "simple":
+            return plan_cost(node, self.stats)
+        self.planner.alias_map.update(_alias_map(node))
+        return self.planner.calculate_cost(node)["cost"]
+
+    def choose_best(self, plans):
+        return min(plans, key=self.plan_cost) if plans else None
+
+    def breakdown(self, node: QueryTree) -> dict:
+        """
+        rincian per join (bottom-up) dengan format plan_cost_breakdown:
+        {cost, rows, blocks, joins: [{left, right, predicate, left_rows,
+        right_blocks, join_cost, rows, blocks}]}; model planner menambahkan
+        join_method dan memory_blocks per join serta memory_blocks (peak) plan.
+        """
+        if self.model == "simple":
+            return plan_cost_breakdown(node, self.stats)
+
+        joins = []
+
+        def on_join(n, info, left, right, tl, tr):
+            joins.append({
+                "left": tl, "right": tr, "predicate": n.val,
+                "left_rows": left["n_r"], "right_blocks": right["b_r"],
+                "join_cost": info["join_cost"], "join_method": info["join_method"],
+                "memory_blocks": info["memory_blocks"], "rows": info["n_r"], "blocks": info["b_r"],
+            })
+
+        info = self._walk(node, on_join)
+        return {"cost": info["cost"], "rows": info["n_r"], "blocks": info["b_r"], "joins": joins,
+                "memory_blocks": info.get("peak_memory_blocks", 1)}
+
+    def peak_memory(self, node: QueryTree):
+        """
+        memory (blocks) operator terbesar di plan model "planner"; tidak
+        melebihi planner.buffer_blocks (grant query). model "simple": None.
+        """
+        if self.model == "simple" or node is None:
+            return None
+        return self._walk(node, lambda *_: None).get("peak_memory_blocks", 1)
+
+    def annotate_physical(self, node: QueryTree) -> QueryTree:
+        """
+        catat pilihan fisik CostPlanner di node.physical: join_method termurah
+        setiap JOIN (method yang sudah ditentukan plan, seperti star atau merge
+        join, tidak diubah) dan access_path setiap SIGMA di atas TABLE.
+        model "simple" tidak punya pilihan fisik, plan dikembalikan apa adanya.
+        """
+        if self.model != "planner" or node is None:
+            return node
+        planner = self.planner
+        self._walk(node, lambda n, info, *_: n.physical.setdefault("join_method", info["join_method"]))
+        stack = [(node, None)]
+        while stack:
+            n, columns = stack.pop()
+            needed = planner.required_columns(n, columns)
+            if n.type in ("SIGMA", "SELECT") and len(n.childs) == 1 and n.childs[0].type == "TABLE":
+                path = planner.choose_access_path(n.val, planner.cost_table_scan(n.childs[0], needed))
+                n.physical["access_path"] = path["access_path"]
+            stack.extend((c, needed) for c in n.childs)
+        return node
+
+    def _walk(self, node: QueryTree, on_join) -> dict:
+        # cost_info plan bottom-up; on_join(node, info, left, right, tabel kiri, tabel kanan)
+        planner = self.planner
+        planner.alias_map.update(_alias_map(node))
+
+        def walk(n, columns):
+            # return (cost_info, tabel); columns = kolom output yang dibutuhkan parent
+            if n.type == "TABLE":
+                t = n.val.name if isinstance(n.val, TableReference) else n.val
+                return planner.cost_table_scan(n, columns), [t]
+            needed = planner.required_columns(n, columns)
+            if n.type == "JOIN" and len(n.childs) == 2:
+                left, tl = walk(n.childs[0], needed)
+                right, tr = walk(n.childs[1], needed)
+                info = planner.cost_join(n, left, right)
+                on_join(n, info, left, right, tl, tr)
+                return info, tl + tr
+            parts = [walk(c, needed) for c in n.childs]
+            tables = [t for _, ts in parts for t in ts]
+            if len(parts) == 1:
+                return _unary_cost(planner, n, parts[0][0]), tables
+            return planner.calculate_cost(n, columns=columns), tables
+
+        return walk(node, None)[0]
+
+
+def _unary_cost(planner, node, child_info):
+    # sama dengan cabang unary CostPlanner.calculate_cost, tanpa menghitung ulang child
+    if node.type in ("SIGMA", "SELECT"):
+        return planner.cost_selection(node, child_info)
+    if node.type == "PROJECT":
+        return planner.cost_projection(node, child_info)
+    if node.type in ("SORT", "ORDER"):
+        return planner.cost_sort(node, child_info)
+    if node.type == "LIMIT":
+        return planner.cost_limit(node, child_info)
+    if node.type in ("GROUP", "AGGREGATE", "COUNT", "SUM", "AVG"):
+        return planner.cost_aggregation(node, child_info)
+    return child_info
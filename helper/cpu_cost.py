@@ -0,0 +1,61 @@
+"""
+Bobot cost CPU untuk CostPlanner, dalam satuan cost satu block I/O:
+    tuple_cost    : per tuple yang diproses operator (scan, filter, input join, ...)
+    operator_cost : per evaluasi predikat / perbandingan (filter, join, sort)
+
+Default 0.01 dan 0.0025 (satu block I/O = 1), perbandingan I/O : CPU yang umum
+dipakai planner. CpuWeights(0, 0) sama dengan model lama (block I/O saja).
+
+Format config (dict): {"tuple_cost": 0.01, "operator_cost": 0.0025}
+"""
+
+import math
+
+
+class CpuWeights:
+    """bobot CPU per tuple dan per evaluasi predikat"""
+
+    __slots__ = ("tuple_cost", "operator_cost")
+
+    def __init__(self, tuple_cost: float = 0.01, operator_cost: float = 0.0025):
+        for name, value in (("tuple_cost", tuple_cost), ("operator_cost", operator_cost)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{name} must be a non-negative number")
+        self.tuple_cost = float(tuple_cost)
+        self.operator_cost = float(operator_cost)
+
+    def cost(self, tuples=0, comparisons=0) -> float:
+        """cost CPU memproses tuples tuple dengan comparisons evaluasi predikat"""
+        return self.tuple_cost * tuples + self.operator_cost * comparisons
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CpuWeights":
+        """CpuWeights dari dict config; key yang tidak ada memakai default"""
+        unknown = set(config) - set(cls.__slots__)
+        if unknown:
+            raise ValueError(f"Unknown CPU weight keys: {', '.join(sorted(unknown))}")
+        return cls(**config)
+
+    def __eq__(self, other):
+        if not isinstance(other, CpuWeights):
+            return NotImplemented
+        return (self.tuple_cost, self.operator_cost) == (other.tuple_cost, other.operator_cost)
+
+    def __repr__(self):
+        return f"CpuWeights(tuple_cost={self.tuple_cost}, operator_cost={self.operator_cost})"
+
+
+def cpu_weights(value=None) -> CpuWeights:
+    """CpuWeights dari CpuWeights / dict config; None = default"""
+    if isinstance(value, CpuWeights):
+        return value
+    if isinstance(value, dict):
+        return CpuWeights.from_config(value)
+    if value is None:
+        return CpuWeights()
+    raise ValueError(f"Unsupported CPU weights: {value!r}")
+
+
+def sort_comparisons(n_r) -> float:
+    """jumlah perbandingan sort n_r tuple: n_r * log2(n_r)"""
+    return n_r * math.log2(n_r) if n_r > 1 else 0.0
@@ -11,6 +11,7 @@ from model.query_tree import (
     NaturalJoin,
     ThetaJoin
 )
+from helper.join_graph import JoinGraph
 import re
 
 # util kecil
@@ -76,6 +77,103 @@ def _tables_under(node: QueryTree):
     dfs(node)
     return set(out)
 
+def _alias_map(node: QueryTree) -> dict:
+    """alias (dan nama tabel itu sendiri) -> nama tabel, untuk semua TABLE di tree"""
+    out = {}
+    def dfs(n):
+        if n.type == "TABLE":
+            if isinstance(n.val, TableReference):
+                out[n.val.name] = n.val.name
+                if n.val.alias:
+                    out[n.val.alias] = n.val.name
+            else:
+                out[n.val] = n.val
+        for c in n.childs:
+            dfs(c)
+    dfs(node)
+    return out
+
+# token untuk memecah string predikat pada AND level atas: literal string, kurung,
+# BETWEEN (AND berikutnya milik BETWEEN) dan AND
+_AND_TOKEN = re.compile(r"'[^']*'|\"[^\"]*\"|[()]|\bBETWEEN\b|\bAND\b", re.IGNORECASE)
+_OR = re.compile(r"\bOR\b", re.IGNORECASE)
+
+
+def _split_and(text: str) -> list:
+    """pecah "p1 AND p2" pada AND di luar kurung, literal string dan x BETWEEN a AND b"""
+    parts, start, depth, between = [], 0, 0, 0
+    for m in _AND_TOKEN.finditer(text):
+        token = m.group().upper()
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0 and token == "BETWEEN":
+            between += 1
+        elif depth == 0 and token == "AND":
+            if between:
+                between -= 1
+            else:
+                parts.append(text[start:m.start()])
+                start = m.end()
+    parts.append(text[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+def _conjuncts(cond) -> list:
+    """pecah predikat AND bersarang menjadi list konjungsi"""
+    if isinstance(cond, LogicalNode) and cond.operator.upper() == "AND":
+        out = []
+        for c in cond.childs:
+            out.extend(_conjuncts(c))
+        return out
+    # string hasil merge_selection_into_join ("p1 AND p2"), hanya kalau tanpa OR
+    if isinstance(cond, str) and not _OR.search(cond):
+        return _split_and(cond)
+    return [cond]
+
+_QUALIFIED_COLUMN = re.compile(r"\b([A-Za-z_]\w*)\.[A-Za-z_]\w*\b")
+
+def _pred_tables(cond, aliases: dict):
+    """
+    himpunan tabel yang benar-benar direferensikan predikat (alias sudah
+    di-resolve lewat aliases). None kalau ada kolom tanpa qualifier atau
+    qualifier yang tidak dikenal, karena tabelnya tidak bisa dipastikan.
+    """
+    refs = set()
+
+    def column_table(x):
+        if isinstance(x, ColumnNode):
+            return x.table or ""
+        if isinstance(x, dict) and "column" in x:
+            return x.get("table") or ""
+        if isinstance(x, str) and _QUALIFIED_COLUMN.fullmatch(x.strip()):
+            return x.strip().split(".", 1)[0]
+        return None  # literal
+
+    def visit(c):
+        if isinstance(c, LogicalNode):
+            return all(visit(ch) for ch in c.childs)
+        if isinstance(c, ConditionNode):
+            for side in (c.attr, c.value):
+                t = column_table(side)
+                if t is None:
+                    continue
+                if t not in aliases:
+                    return False
+                refs.add(aliases[t])
+            return True
+        if isinstance(c, str):
+            found = _QUALIFIED_COLUMN.findall(c)
+            if not found or any(t not in aliases for t in found):
+                return False
+            refs.update(aliases[t] for t in found)
+            return True
+        return False
+
+    if not visit(cond):
+        return None
+    return refs
+
 # σθ(E1 × E2)  ⇒  E1 ⋈θ E2
 def fold_selection_with_cartesian(node: QueryTree):
     if node.type == "SIGMA" and node.childs and _is_cartesian(node.childs[0]):
@@ -202,6 +300,41 @@ def plan_cost(node: QueryTree, stats: dict) -> int:
     # node lain: jumlahkan anak
     return sum(plan_cost(c, stats) for c in node.childs)
 
+def plan_cost_breakdown(node: QueryTree, stats: dict) -> dict:
+    """Rincian plan_cost per join (bottom-up): tabel di kiri/kanan, left_rows,
+       right_blocks, join_cost, dan rows/blocks hasil. cost total sama dengan
+       plan_cost(node, stats)."""
+    joins = []
+
+    def walk(n):
+        # return (cost, rows, blocks, tabel)
+        if n.type == "TABLE":
+            t = n.val
+            if isinstance(t, TableReference):
+                t = t.name
+            s = stats.get(t, {})
+            return s.get("b_r", 1000), s.get("n_r", 1000), s.get("b_r", 100), [t]
+        if n.type == "SIGMA":
+            if not n.childs:
+                return 0, 1000, 100, []
+            c, r, b, ts = walk(n.childs[0])
+            return c, max(1, r // 2), max(1, b // 2), ts
+        if n.type == "JOIN":
+            cl, rl, bl, tl = walk(n.childs[0])
+            cr, rr, br, tr = walk(n.childs[1])
+            join_cost = rl * br + bl
+            joins.append({
+                "left": tl, "right": tr, "predicate": n.val,
+                "left_rows": rl, "right_blocks": br, "join_cost": join_cost,
+                "rows": max(rl, rr), "blocks": bl + br,
+            })
+            return cl + cr + join_cost, max(rl, rr), bl + br, tl + tr
+        parts = [walk(c) for c in n.childs]
+        return sum(p[0] for p in parts), 1000, 100, [t for p in parts for t in p[3]]
+
+    cost, rows, blocks, _ = walk(node)
+    return {"cost": cost, "rows": rows, "blocks": blocks, "joins": joins}
+
 def choose_best(plans, stats: dict) -> QueryTree:
     best = None
     best_cost = None
@@ -211,49 +344,29 @@ def choose_best(plans, stats: dict) -> QueryTree:
             best, best_cost = p, c
     return best
 
-def build_join_tree(order, join_conditions: dict = None) -> QueryTree:
+def build_join_tree(order, join_conditions: dict = None, graph: JoinGraph = None) -> QueryTree:
+    """Bangun join tree left-deep dari order. Predikat dicari lewat JoinGraph
+       (bitmask tabel di subtree kiri), jadi tiap langkah O(1) terhadap
+       join_conditions. graph boleh dipakai ulang asalkan memuat semua tabel."""
     if join_conditions is None:
         join_conditions = {}
 
     if not order:
         return None
 
+    if graph is None or not graph.covers(order):
+        graph = JoinGraph(order, join_conditions)
+
+    first = graph.index[order[0]]
+    mask = 1 << first
     cur = QueryTree("TABLE", order[0])
-    for i in range(1, len(order)):
-        name = order[i]
+    for name in order[1:]:
         right = QueryTree("TABLE", name)
+        j = graph.index[name]
 
-        # find representative table name for left subtree
-        try:
-            cur_table = _first_table(cur)
-        except Exception:
-            cur_table = order[0]
-
-        next_table = name
-
-        # direct key lookup
-        key = frozenset({cur_table, next_table})
-        pred = join_conditions.get(key, "")
-
-        # if not found, try any table in left subtree paired with next_table
-        if not pred:
-            left_tables = list(_tables_under(cur))
-            for lt in left_tables:
-                k2 = frozenset({lt, next_table})
-                if k2 in join_conditions:
-                    pred = join_conditions[k2]
-                    break
-
-        # if still not found, try symmetrical: any table in right subtree vs any in left
-        if not pred:
-            for jt_key in join_conditions.keys():
-                try:
-                    if isinstance(jt_key, (set, frozenset)) and next_table in jt_key:
-                        if any(lt in jt_key for lt in list(_tables_under(cur))):
-                            pred = join_conditions[jt_key]
-                            break
-                except Exception:
-                    continue
+        # predikat dengan tabel pertama dulu, lalu tabel lain di subtree kiri
+        pred = graph.preds[first][j] or graph.predicate(mask, 1 << j)
+        mask |= 1 << j
 
         val = _mk_theta(pred) if pred else "CARTESIAN"
         cur = QueryTree("JOIN", val, [cur, right])
@@ -262,6 +375,44 @@ def build_join_tree(order, join_conditions: dict = None) -> QueryTree:
 
     return cur
 
+def _shape_tables(shape) -> list:
+    if isinstance(shape, str):
+        return [shape]
+    out = []
+    for part in shape:
+        out.extend(_shape_tables(part))
+    return out
+
+def build_bushy_join_tree(shape, join_conditions: dict = None, graph: JoinGraph = None) -> QueryTree:
+    """Bangun join tree dari shape bersarang, contoh (("A","B"),("C","D")).
+       Tidak bergantung urutan left-deep, jadi dua subtree hasil join bisa
+       di-join lagi (bushy). Predikat diambil dari pasangan tabel kiri-kanan
+       pertama yang ada di join_conditions, selain itu CARTESIAN."""
+    if join_conditions is None:
+        join_conditions = {}
+
+    if shape is None:
+        return None
+
+    tables = _shape_tables(shape)
+    if graph is None or not graph.covers(tables):
+        graph = JoinGraph(tables, join_conditions)
+
+    def build(part):
+        # return (node, bitmask tabel di subtree)
+        if isinstance(part, str):
+            return QueryTree("TABLE", part), 1 << graph.index[part]
+        left, left_mask = build(part[0])
+        right, right_mask = build(part[1])
+        pred = graph.predicate(left_mask, right_mask)
+        val = _mk_theta(pred) if pred else "CARTESIAN"
+        node = QueryTree("JOIN", val, [left, right])
+        left.parent = node
+        right.parent = node
+        return node, left_mask | right_mask
+
+    return build(shape)[0]
+
 def _first_table(node: QueryTree) -> str:
     if node.type == "TABLE": 
         if isinstance(node.val, TableReference):
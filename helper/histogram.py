@@ -0,0 +1,173 @@
+"""
+Statistik distribusi per kolom: histogram equi-depth untuk selectivity range
+dan most-common-values (MCV) untuk selectivity equality pada kolom skewed.
+
+Format di table stats, di samping v_a_r:
+    "histograms": {"salary": [b0, b1, ..., bk]}
+k bucket dengan jumlah tuple sama (masing-masing 1/k bagian tabel), bucket i
+mencakup [b_i, b_(i+1)]. Boundary disimpan sebagai array('d') (8 byte per
+bound). Di dalam bucket nilai dianggap uniform, jadi fraksi tuple di bawah v
+diinterpolasi linear. Nilai tanggal ISO ("2024-01-31") dipetakan ke ordinal.
+
+Format MCV:
+    "mcv": {"genre": {"Drama": 0.25, "Action": 0.15}}
+nilai -> fraksi tuple (total <= 1). Sisa fraksi dibagi rata ke
+V(A,r) - len(mcv) nilai lain.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+def _numeric(value):
+    # angka / tanggal ISO -> float, selain itu None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip().strip("'\"")
+        try:
+            return float(text)
+        except ValueError:
+            pass
+        try:
+            return float(date.fromisoformat(text).toordinal())
+        except ValueError:
+            return None
+    return None
+
+
+class EquiDepthHistogram:
+    """boundary bucket equi-depth (terurut naik, minimal 2 bound)"""
+
+    __slots__ = ("bounds",)
+
+    def __init__(self, bounds):
+        values = [_numeric(b) for b in bounds]
+        if len(values) < 2 or any(v is None for v in values):
+            raise ValueError("histogram needs at least 2 numeric bounds")
+        if any(a > b for a, b in zip(values, values[1:])):
+            raise ValueError("histogram bounds must be sorted")
+        self.bounds = array("d", values)
+
+    @classmethod
+    def from_values(cls, values, buckets: int = 10) -> "EquiDepthHistogram":
+        """histogram dari sampel nilai kolom (minimal 1 nilai numerik)"""
+        data = sorted(v for v in (_numeric(x) for x in values) if v is not None)
+        if not data:
+            raise ValueError("histogram needs numeric values")
+        buckets = max(1, min(buckets, len(data)))
+        last = len(data) - 1
+        return cls([data[round(i * last / buckets)] for i in range(buckets + 1)])
+
+    @property
+    def buckets(self) -> int:
+        return len(self.bounds) - 1
+
+    def fraction_below(self, value, inclusive: bool = False) -> float:
+        """fraksi tuple dengan nilai < value (<= kalau inclusive)"""
+        v = _numeric(value)
+        bounds = self.bounds
+        if v is None:
+            return 0.5
+        if v < bounds[0] or (v == bounds[0] and not inclusive):
+            return 0.0
+        if v > bounds[-1] or (v == bounds[-1] and inclusive):
+            return 1.0
+        k = len(bounds) - 1
+        # bound yang sama di beberapa bucket = nilai yang sering muncul;
+        # batas < / <= mengambil seluruh bucket bernilai tunggal itu
+        lo, hi = bisect_left(bounds, v), bisect_right(bounds, v)
+        if hi - lo > 1:
+            return (hi - 1 if inclusive else lo) / k
+        i = max(0, hi - 1)
+        width = bounds[i + 1] - bounds[i]
+        inside = (v - bounds[i]) / width if width > 0 else 0.0
+        return (i + inside) / k
+
+    def range_selectivity(self, low=None, high=None, low_inclusive=True, high_inclusive=True) -> float:
+        """fraksi tuple dengan low (<|<=) nilai (<|<=) high; None = tanpa batas"""
+        top = 1.0 if high is None else self.fraction_below(high, high_inclusive)
+        bottom = 0.0 if low is None else self.fraction_below(low, not low_inclusive)
+        return max(0.0, min(1.0, top - bottom))
+
+    def selectivity(self, op: str, value) -> float:
+        """selectivity satu predikat range: >, >=, <, <= atau BETWEEN (value = (lo, hi))"""
+        if op == "<":
+            return self.range_selectivity(high=value, high_inclusive=False)
+        if op == "<=":
+            return self.range_selectivity(high=value)
+        if op == ">":
+            return self.range_selectivity(low=value, low_inclusive=False)
+        if op == ">=":
+            return self.range_selectivity(low=value)
+        if op.upper() == "BETWEEN":
+            low, high = value
+            return self.range_selectivity(low, high)
+        raise ValueError(f"Unsupported range operator: {op}")
+
+
+def _mcv_key(value):
+    # angka dibandingkan sebagai float, string tanpa tanda kutip
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        return value.strip().strip("'\"")
+    return value
+
+
+class MostCommonValues:
+    """frekuensi (fraksi tuple) nilai-nilai paling sering satu kolom"""
+
+    __slots__ = ("freqs", "total")
+
+    def __init__(self, freqs: dict):
+        self.freqs = {}
+        for value, freq in freqs.items():
+            freq = float(freq)
+            if not 0.0 <= freq <= 1.0:
+                raise ValueError("MCV frequency must be between 0 and 1")
+            self.freqs[_mcv_key(value)] = freq
+        self.total = sum(self.freqs.values())
+        if self.total > 1.0 + 1e-9:
+            raise ValueError("MCV frequencies sum to more than 1")
+
+    def __len__(self) -> int:
+        return len(self.freqs)
+
+    def equality(self, value, distinct) -> float:
+        """
+        selectivity a = value: frekuensi MCV, selain itu sisa frekuensi
+        dibagi rata ke nilai non-MCV (distinct = V(a,r), None kalau tidak tahu)
+        """
+        freq = self.freqs.get(_mcv_key(value))
+        if freq is not None:
+            return freq
+        rest = 1.0 - self.total
+        if distinct is None:
+            # tanpa V(a,r): nilai non-MCV diasumsikan tidak lebih sering dari MCV terjarang
+            return min(rest, min(self.freqs.values())) if self.freqs else rest
+        others = distinct - len(self.freqs)
+        return rest / others if others > 0 else 0.0
+
+
+def as_mcv(value):
+    """MostCommonValues dari entry stats (dict nilai -> frekuensi), None kalau tidak valid"""
+    if value is None or isinstance(value, MostCommonValues):
+        return value
+    try:
+        return MostCommonValues(value)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def as_histogram(value):
+    """EquiDepthHistogram dari entry stats (list bound atau histogram), None kalau tidak valid"""
+    if value is None or isinstance(value, EquiDepthHistogram):
+        return value
+    try:
+        return EquiDepthHistogram(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,108 @@
+"""
+Representasi join graph per query untuk optimizer.
+
+Tabel di-intern menjadi id int (posisinya di tables), himpunan tabel
+direpresentasikan sebagai bitmask int (bit i = tables[i]), tetangga dan
+predikat disimpan di array sehingga cek konektivitas tabel ke himpunan dan
+lookup predikat antar tabel O(1), tanpa _tables_under atau scan join_conditions.
+"""
+
+
+def _is_connected(nbr, mask: int) -> bool:
+    if not mask:
+        return False
+    seen = mask & -mask
+    frontier = seen
+    while frontier:
+        grow = 0
+        m = frontier
+        while m:
+            low = m & -m
+            grow |= nbr[low.bit_length() - 1]
+            m ^= low
+        frontier = grow & mask & ~seen
+        seen |= frontier
+    return seen == mask
+
+
+def _neighborhood(nbr, mask: int) -> int:
+    out = 0
+    m = mask
+    while m:
+        low = m & -m
+        out |= nbr[low.bit_length() - 1]
+        m ^= low
+    return out & ~mask
+
+
+def _bits(mask: int):
+    # indeks bit yang menyala, dari yang terkecil
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class JoinGraph:
+    """
+    join graph satu query, dibangun dari join_conditions ({frozenset({A, B}): pred}).
+        index[t]    -> id tabel
+        nbr[i]      -> bitmask tetangga tabel i
+        preds[i][j] -> predikat antara tabel i dan j (None kalau tidak ada)
+    key join_conditions yang tabelnya tidak ada di tables diabaikan.
+    """
+
+    def __init__(self, tables, join_conditions=None):
+        self.tables = list(tables)
+        self.index = {t: i for i, t in enumerate(self.tables)}
+        n = self.n = len(self.tables)
+        self.full = (1 << n) - 1
+        self.nbr = [0] * n
+        self.preds = [[None] * n for _ in range(n)]
+        for key, pred in (join_conditions or {}).items():
+            ids = [self.index[t] for t in key if t in self.index]
+            if len(ids) != 2:
+                continue
+            a, b = ids
+            self.nbr[a] |= 1 << b
+            self.nbr[b] |= 1 << a
+            if self.preds[a][b] is None:
+                self.preds[a][b] = self.preds[b][a] = pred
+
+    def covers(self, tables) -> bool:
+        return all(t in self.index for t in tables)
+
+    def mask(self, tables) -> int:
+        m = 0
+        for t in tables:
+            m |= 1 << self.index[t]
+        return m
+
+    def names(self, mask: int) -> list:
+        return [self.tables[i] for i in _bits(mask)]
+
+    def neighborhood(self, mask: int) -> int:
+        """tabel di luar mask yang punya predikat dengan mask"""
+        return _neighborhood(self.nbr, mask)
+
+    def is_connected(self, mask: int = None) -> bool:
+        return _is_connected(self.nbr, self.full if mask is None else mask)
+
+    def joins(self, mask: int, i: int) -> bool:
+        """apakah tabel i punya predikat dengan himpunan mask"""
+        return bool(self.nbr[i] & mask)
+
+    def predicate(self, left: int, right: int):
+        """predikat pertama antara himpunan left dan right, None kalau cartesian"""
+        for j in _bits(right):
+            for i in _bits(self.nbr[j] & left):
+                if self.preds[i][j]:
+                    return self.preds[i][j]
+        return None
+
+    def edges(self) -> list:
+        """edge sebagai pasangan id (i, j) dengan i < j, terurut"""
+        return [(i, j) for i in range(self.n) for j in _bits(self.nbr[i] >> (i + 1) << (i + 1))]
+
+    def __repr__(self):
+        return f"JoinGraph({self.n} tables, {len(self.edges())} edges)"
@@ -0,0 +1,995 @@
+"""
+Enumerator urutan join (join-order search) untuk OptimizationEngine.
+
+Semua enumerator di sini bekerja di atas join graph yang dibangun dari
+join_conditions ({frozenset({A, B}): pred}) hasil
+OptimizationEngine._extract_join_conditions_from_tree.  Himpunan tabel
+direpresentasikan sebagai bitmask int (bit i = tables[i]); lihat
+helper.join_graph.JoinGraph.  Setiap enumerator menerima graph opsional yang
+sudah dibangun untuk query ini (urutan tabel mengikuti graph.tables), kalau
+tidak ada dibangun dari tables dan join_conditions.
+
+Biaya dihitung secara inkremental supaya subplan tidak perlu dibangun ulang.
+Default-nya PlanCostModel (model yang sama dengan helper.plan_cost);
+OptimizationEngine memberikan model dari helper.cost_engine.CostEngine.
+
+Plan bushy direpresentasikan sebagai "shape": nama tabel untuk leaf, atau
+tuple (kiri, kanan) untuk JOIN; lihat helper.build_bushy_join_tree.
+
+Semua enumerator menerima deadline opsional (lihat Deadline) dan berhenti
+dengan (None, inf) kalau waktu habis sebelum plan lengkap ditemukan.
+"""
+
+import heapq
+import time
+
+from model.query_tree import QueryTree
+from helper.cost import CostPlanner, external_sort_cost, _EQUI_JOIN
+from helper.join_graph import JoinGraph, _is_connected, _neighborhood
+from helper.helper import _mk_theta
+
+
+class PlanCostModel:
+    """
+    versi inkremental dari plan_cost.
+    state subplan = (cost, rows, blocks):
+        TABLE: (b_r, n_r, b_r)
+        JOIN:  (cost_l + cost_r + rows_l * blocks_r + blocks_l,
+                max(rows_l, rows_r), blocks_l + blocks_r)
+    plan_cost(build_join_tree(order)) == cost(state order) untuk semua order.
+    buffer_blocks: m untuk sort di dp_join_order_orders (ordered_joins / sort_cost).
+    """
+
+    def __init__(self, stats: dict, buffer_blocks: int = 100):
+        self.stats = stats
+        self.buffer_blocks = buffer_blocks
+
+    def leaf(self, table: str) -> tuple:
+        s = self.stats.get(table, {})
+        # default sengaja sama dengan plan_cost (cost 1000, blocks 100)
+        return (s.get("b_r", 1000), s.get("n_r", 1000), s.get("b_r", 100))
+
+    def join(self, left: tuple, right: tuple) -> tuple:
+        cl, rl, bl = left
+        cr, rr, br = right
+        return (cl + cr + rl * br + bl, max(rl, rr), bl + br)
+
+    def join_cost(self, left: tuple, right: tuple):
+        """cost(join(left, right)) tanpa membangun state hasil join"""
+        return left[0] + right[0] + left[1] * right[2] + left[2]
+
+    def cost(self, state: tuple):
+        return state[0]
+
+    def lower_bound(self, state: tuple, rest) -> float:
+        """
+        batas bawah admissible cost plan left-deep lengkap yang dimulai dari
+        prefix state lalu menambahkan leaf di rest (urutan bebas).
+        setiap join menambah cost_leaf + rows * blocks_leaf + blocks, dan
+        rows/blocks prefix tidak pernah turun, jadi pakai nilai saat ini.
+        """
+        c, r, b = state
+        for lc, _, lb in rest:
+            c += lc + r * lb + b
+        return c
+
+    def dominates(self, a: tuple, b: tuple) -> bool:
+        """prefix a (himpunan tabel sama) tidak lebih buruk dari b di cost, rows dan blocks"""
+        return all(x <= y for x, y in zip(a, b))
+
+    def ordered_joins(self, left: tuple, right: tuple, left_order, key) -> list:
+        """
+        kandidat join untuk dp_join_order_orders: [(state, order, method)]
+            nested-loop: rumus join, order kiri (outer) dipertahankan
+            merge join : cost kiri + cost kanan + sort input yang belum
+                         terurut + b_r(kiri) + b_r(kanan), output terurut pada key
+        key: kolom equi-join (frozenset), None = hanya nested-loop.
+        """
+        out = [(self.join(left, right), left_order, "nested-loop")]
+        if key is not None:
+            (cl, rl, bl), (cr, rr, br) = left, right
+            left_sorted = left_order is not None and bool(left_order & key)
+            cost = cl + cr + (0 if left_sorted else self.sort_cost(left)) + self.sort_cost(right) + bl + br
+            out.append(((cost, max(rl, rr), bl + br), key, "merge-join"))
+        return out
+
+    def sort_cost(self, state: tuple, column=None):
+        """cost tambahan sort output subplan (external merge sort, m = buffer_blocks)"""
+        return external_sort_cost(state[2], self.buffer_blocks)
+
+
+class TopKPlans:
+    """
+    k plan termurah yang berbeda, key = urutan left-deep (tuple) atau shape
+    bushy. max-heap berukuran k: offer O(log k), kandidat yang tidak lebih
+    murah dari plan termahal di heap langsung ditolak.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []  # (-cost, seq, key)
+        self._keys = set()
+        self._seq = 0
+
+    def threshold(self) -> float:
+        """cost yang harus dikalahkan untuk masuk (inf kalau heap belum penuh)"""
+        if len(self._heap) < self.k:
+            return float('inf')
+        return -self._heap[0][0]
+
+    def offer(self, key, cost) -> bool:
+        if cost == float('inf') or key in self._keys or cost >= self.threshold():
+            return False
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (-cost, self._seq, key))
+        else:
+            _, _, dropped = heapq.heapreplace(self._heap, (-cost, self._seq, key))
+            self._keys.discard(dropped)
+        self._keys.add(key)
+        return True
+
+    def items(self) -> list:
+        """[(key, cost)] dari yang termurah"""
+        return [(key, -neg) for neg, _, key in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class FitnessCache:
+    """
+    cache fitness untuk satu kali optimasi GA.
+    - full: key individu -> cost, jadi elite/duplikat tidak dihitung ulang
+    - trie prefix left-deep -> state model, jadi individu dengan prefix yang
+      sama hanya menghitung join setelah prefix tersebut
+    counter: hits/misses untuk full key, prefix_hits = langkah join yang
+    dipakai ulang dari trie, join_evals = langkah join yang benar-benar dihitung
+
+    bound (default inf): individu left-deep yang batas bawahnya sudah >= bound
+    ditinggalkan di tengah jalan dan diberi cost inf (counter pruned).
+
+    top_k (TopKPlans, opsional): setiap individu yang baru dihitung ditawarkan,
+    dengan plan_key(key) sebagai key plan kalau diset (mis. decode bushy).
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.full = {}
+        self._leaves = {}
+        self._trie = {}  # table -> [state, children]
+        self.hits = 0
+        self.misses = 0
+        self.prefix_hits = 0
+        self.join_evals = 0
+        self.bound = float('inf')
+        self.pruned = 0
+        self.top_k = None
+        self.plan_key = None
+
+    def cost(self, order):
+        """cost plan left-deep untuk order (sama dengan plan_cost(build_join_tree(order)))"""
+        return self.costs([tuple(order)])[0]
+
+    def costs(self, keys, compute=None) -> list:
+        """
+        cost untuk banyak individu sekaligus (satu generasi).
+        key yang belum ada di cache (dan belum muncul di batch ini) dihitung
+        oleh compute(list_key) -> list_cost; default-nya left-deep via trie.
+        """
+        out = [None] * len(keys)
+        missing = {}
+        for i, key in enumerate(keys):
+            c = self.full.get(key)
+            if c is not None:
+                self.hits += 1
+                out[i] = c
+            elif key in missing:
+                self.hits += 1
+                missing[key].append(i)
+            else:
+                self.misses += 1
+                missing[key] = [i]
+
+        if missing:
+            todo = list(missing)
+            if compute is None:
+                values = [self._left_deep_cost(key) for key in todo]
+            else:
+                values = compute(todo)
+            for key, c in zip(todo, values):
+                self.full[key] = c
+                for i in missing[key]:
+                    out[i] = c
+                if self.top_k is not None and c < self.top_k.threshold():
+                    self.top_k.offer(self.plan_key(key) if self.plan_key else key, c)
+        return out
+
+    def _leaf(self, t):
+        leaf = self._leaves.get(t)
+        if leaf is None:
+            leaf = self._leaves[t] = self.model.leaf(t)
+        return leaf
+
+    def _left_deep_cost(self, key):
+        children = self._trie
+        state = None
+        for pos, t in enumerate(key):
+            node = children.get(t)
+            if node is None:
+                leaf = self._leaf(t)
+                if state is None:
+                    node_state = leaf
+                else:
+                    node_state = self.model.join(state, leaf)
+                    self.join_evals += 1
+                node = children[t] = [node_state, {}]
+            elif state is not None:
+                self.prefix_hits += 1
+            state, children = node
+            if self.bound != float('inf') and pos + 1 < len(key):
+                rest = [self._leaf(u) for u in key[pos + 1:]]
+                if self.model.lower_bound(state, rest) >= self.bound:
+                    self.pruned += 1
+                    return float('inf')
+        return self.model.cost(state)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "prefix_hits": self.prefix_hits,
+            "join_evals": self.join_evals,
+            "pruned": self.pruned,
+        }
+
+
+# ======================= JOIN GRAPH (bitmask) =======================
+
+def _neighbor_masks(tables, join_conditions) -> list:
+    return JoinGraph(tables, join_conditions).nbr
+
+
+def _subsets(mask: int):
+    # semua subset tidak kosong dari mask
+    sub = mask
+    while sub:
+        yield sub
+        sub = (sub - 1) & mask
+
+
+def _bfs_numbering(nbr) -> list:
+    # urutan BFS dari node 0 (syarat penomoran DPccp)
+    n = len(nbr)
+    order = []
+    seen = 0
+    for start in range(n):
+        if seen >> start & 1:
+            continue
+        queue = [start]
+        seen |= 1 << start
+        while queue:
+            v = queue.pop(0)
+            order.append(v)
+            m = nbr[v] & ~seen
+            while m:
+                low = m & -m
+                m ^= low
+                seen |= low
+                queue.append(low.bit_length() - 1)
+    return order
+
+
+def enumerate_csg(nbr) -> list:
+    """
+    enumerasi semua connected subgraph (csg) tepat satu kali,
+    mengikuti EnumerateCsg dari DPccp (Moerkotte & Neumann).
+    """
+    n = len(nbr)
+    out = []
+
+    def rec(s, x):
+        n_s = _neighborhood(nbr, s) & ~x
+        if not n_s:
+            return
+        subs = list(_subsets(n_s))
+        for sub in subs:
+            out.append(s | sub)
+        for sub in subs:
+            rec(s | sub, x | n_s)
+
+    for i in range(n - 1, -1, -1):
+        v = 1 << i
+        out.append(v)
+        rec(v, (v << 1) - 1)
+    return out
+
+
+def enumerate_ccp(nbr) -> list:
+    """
+    enumerasi semua pasangan csg-cmp (S1, S2): S1 dan S2 terhubung, disjoint,
+    dan ada edge di antara keduanya. Setiap pasangan muncul sekali (tanpa
+    simetrinya). Mengikuti EmitCsg/EnumerateCmpRec DPccp; nbr harus sudah
+    bernomor BFS.
+    """
+    n = len(nbr)
+    pairs = []
+
+    def enum_cmp(s1, s2, x):
+        n_s = _neighborhood(nbr, s2) & ~x
+        if not n_s:
+            return
+        subs = list(_subsets(n_s))
+        for sub in subs:
+            pairs.append((s1, s2 | sub))
+        for sub in subs:
+            enum_cmp(s1, s2 | sub, x | n_s)
+
+    def emit_csg(s1):
+        low = (s1 & -s1).bit_length() - 1
+        x = s1 | ((1 << (low + 1)) - 1)
+        n_s = _neighborhood(nbr, s1) & ~x
+        for i in range(n - 1, -1, -1):
+            v = 1 << i
+            if not n_s & v:
+                continue
+            pairs.append((s1, v))
+            enum_cmp(s1, v, x | (n_s & ((1 << (i + 1)) - 1)))
+
+    def rec(s, x):
+        n_s = _neighborhood(nbr, s) & ~x
+        if not n_s:
+            return
+        subs = list(_subsets(n_s))
+        for sub in subs:
+            emit_csg(s | sub)
+        for sub in subs:
+            rec(s | sub, x | n_s)
+
+    for i in range(n - 1, -1, -1):
+        v = 1 << i
+        emit_csg(v)
+        rec(v, (v << 1) - 1)
+    return pairs
+
+
+# ======================= TIME BUDGET =======================
+
+class Deadline:
+    """
+    batas waktu optimasi satu query. budget_ms None berarti tanpa batas.
+    strategi memanggil expired() di antara langkah (per csg, per generasi).
+    """
+
+    def __init__(self, budget_ms=None):
+        self.budget_ms = budget_ms
+        self.end = None if budget_ms is None else time.perf_counter() + budget_ms / 1000.0
+
+    def expired(self) -> bool:
+        return self.end is not None and time.perf_counter() >= self.end
+
+    def remaining_ms(self) -> float:
+        if self.end is None:
+            return float('inf')
+        return max(0.0, (self.end - time.perf_counter()) * 1000.0)
+
+
+def greedy_join_order(tables, join_conditions, stats, model=None, graph=None):
+    """
+    plan fallback yang murah (O(n^2) evaluasi join): mulai dari tabel dengan
+    leaf termurah, lalu tambahkan tetangga yang menghasilkan join termurah.
+    cartesian hanya dipakai kalau tidak ada tetangga tersisa.
+
+    return: (order, cost)
+    """
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    tables = graph.tables
+    if model is None:
+        model = PlanCostModel(stats)
+    if not tables:
+        return [], 0
+
+    n = len(tables)
+    nbr = graph.nbr
+    leaves = [model.leaf(t) for t in tables]
+    first = min(range(n), key=lambda i: model.cost(leaves[i]))
+    order = [first]
+    mask = 1 << first
+    state = leaves[first]
+    while len(order) < n:
+        candidates = [i for i in range(n) if not mask >> i & 1 and nbr[i] & mask]
+        if not candidates:
+            candidates = [i for i in range(n) if not mask >> i & 1]
+        nxt = min(candidates, key=lambda i: model.join_cost(state, leaves[i]))
+        state = model.join(state, leaves[nxt])
+        order.append(nxt)
+        mask |= 1 << nxt
+    return [tables[i] for i in order], model.cost(state)
+
+
+# ======================= DYNAMIC PROGRAMMING =======================
+
+def dp_join_order(tables, join_conditions, stats, model=None, deadline=None, graph=None, top_k=None):
+    """
+    DP atas connected subgraph join graph: simpan subplan left-deep termurah
+    per himpunan tabel, lalu perluas dengan satu tabel tetangga.
+    Kalau graph tidak terhubung, cartesian product diizinkan di mana saja.
+    top_k (TopKPlans, opsional): DP menyimpan top_k.k subplan termurah per
+    himpunan tabel (bukan satu), dan semua subplan lengkap ditawarkan ke top_k.
+    hasilnya k urutan left-deep termurah kalau cost join hanya bergantung pada
+    cost prefix, himpunan tabel prefix dan tabel yang ditambahkan (seperti
+    PlanCostModel); untuk model lain asumsi principle of optimality DP berlaku
+    per subplan. plan terbaik bisa lebih murah dari DP tanpa top_k, tidak
+    pernah lebih mahal.
+
+    return: (order, cost) dengan order = list nama tabel (urutan left-deep),
+    atau (None, inf) kalau deadline habis.
+    """
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    tables = graph.tables
+    if model is None:
+        model = PlanCostModel(stats)
+    n = len(tables)
+    if n == 0:
+        return [], 0
+    if n == 1:
+        return tables[:], model.cost(model.leaf(tables[0]))
+
+    full = (1 << n) - 1
+    nbr = graph.nbr
+    if not _is_connected(nbr, full):
+        nbr = [full & ~(1 << i) for i in range(n)]
+
+    leaves = [model.leaf(t) for t in tables]
+    csgs = enumerate_csg(nbr)
+    csgs.sort(key=lambda m: bin(m).count("1"))
+    if top_k is not None:
+        return _dp_k_best(model, tables, leaves, nbr, csgs, top_k, deadline)
+
+    # best[mask] = (state, prefix_mask, last_table_index)
+    best = {}
+    for i in range(n):
+        best[1 << i] = (leaves[i], 0, i)
+
+    for s in csgs:
+        if s in best:
+            continue
+        if deadline is not None and deadline.expired():
+            return None, float('inf')
+        cur = None
+        m = s
+        while m:
+            low = m & -m
+            m ^= low
+            rest = s ^ low
+            if rest not in best or not (nbr[low.bit_length() - 1] & rest):
+                continue
+            i = low.bit_length() - 1
+            # state hasil join hanya dibangun untuk kandidat termurah per himpunan
+            cost = model.join_cost(best[rest][0], leaves[i])
+            if cur is None or cost < cur[0]:
+                cur = (cost, rest, i)
+        if cur is not None:
+            _, rest, i = cur
+            best[s] = (model.join(best[rest][0], leaves[i]), rest, i)
+
+    return _dp_order(best, full, tables), model.cost(best[full][0])
+
+
+def _dp_k_best(model, tables, leaves, nbr, csgs, top_k, deadline):
+    # DP dengan k subplan termurah per himpunan: kbest[mask] = [(cost, urutan indeks, state)]
+    n = len(tables)
+    full = (1 << n) - 1
+    k = max(1, top_k.k)
+    kbest = {1 << i: [(model.cost(leaves[i]), (i,), leaves[i])] for i in range(n)}
+    for s in csgs:
+        if s in kbest:
+            continue
+        if deadline is not None and deadline.expired():
+            return None, float('inf')
+        candidates = []
+        m = s
+        while m:
+            low = m & -m
+            m ^= low
+            rest = s ^ low
+            i = low.bit_length() - 1
+            if rest not in kbest or not (nbr[i] & rest):
+                continue
+            for _, order, state in kbest[rest]:
+                candidates.append((model.join_cost(state, leaves[i]), order + (i,), state))
+        if not candidates:
+            continue
+        kept = heapq.nsmallest(k, candidates, key=lambda c: (c[0], c[1]))
+        kbest[s] = [(cost, order, model.join(state, leaves[order[-1]])) for cost, order, state in kept]
+
+    for cost, order, _ in kbest[full]:
+        top_k.offer(tuple(tables[i] for i in order), cost)
+    cost, order, state = kbest[full][0]
+    return [tables[i] for i in order], model.cost(state)
+
+
+def _dp_order(best, mask, tables) -> list:
+    # urutan left-deep untuk mask dari tabel DP best[mask] = (state, rest, i)
+    order = []
+    while mask:
+        _, rest, i = best[mask]
+        order.append(tables[i])
+        mask = rest
+    order.reverse()
+    return order
+
+
+# ======================= BRANCH AND BOUND =======================
+
+def bnb_join_order(tables, join_conditions, stats, model=None, deadline=None, counters=None, graph=None,
+                   top_k=None):
+    """
+    branch-and-bound atas urutan left-deep tanpa cartesian product (kecuali
+    graph tidak terhubung), DFS dengan perluasan termurah dicoba dulu.
+    incumbent awal dari greedy_join_order; cabang dibuang kalau
+    model.lower_bound(prefix, sisa) >= cost incumbent, atau kalau prefix lain
+    dengan himpunan tabel yang sama sudah mendominasi (model.dominates).
+
+    anytime: kalau deadline habis, incumbent terbaik sejauh ini dikembalikan.
+    counters (dict, opsional) diisi nodes (prefix yang diperluas) dan pruned.
+    top_k (TopKPlans, opsional): semua urutan lengkap ditawarkan, cabang
+    dibuang terhadap plan ke-k (bukan incumbent) dan tanpa dominance, jadi
+    hasilnya k plan left-deep termurah.
+
+    return: (order, cost)
+    """
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    tables = graph.tables
+    if model is None:
+        model = PlanCostModel(stats)
+    n = len(tables)
+    if n <= 1:
+        return tables[:], (model.cost(model.leaf(tables[0])) if n else 0)
+
+    full = (1 << n) - 1
+    nbr = graph.nbr
+    if not _is_connected(nbr, full):
+        nbr = [full & ~(1 << i) for i in range(n)]
+
+    leaves = [model.leaf(t) for t in tables]
+    greedy_order, greedy_cost = greedy_join_order(tables, join_conditions, stats, model, graph)
+    best = [greedy_cost, [graph.index[t] for t in greedy_order]]
+    seen = {}  # mask -> prefix yang sudah diperluas dan tidak saling mendominasi
+    nodes = pruned = 0
+    stopped = False
+    if top_k is not None:
+        top_k.offer(tuple(greedy_order), greedy_cost)
+
+    def bound():
+        return best[0] if top_k is None else top_k.threshold()
+
+    def dominated(mask, state):
+        if top_k is not None:
+            return False
+        return any(model.dominates(other, state) for other in seen.get(mask, ()))
+
+    def extend(mask, state, order):
+        nonlocal nodes, pruned, stopped
+        if mask == full:
+            if top_k is not None:
+                top_k.offer(tuple(tables[i] for i in order), model.cost(state))
+            if model.cost(state) < best[0]:
+                best[0], best[1] = model.cost(state), order[:]
+            return
+        if deadline is not None and deadline.expired():
+            stopped = True
+            return
+        nodes += 1
+        children = [
+            (model.join(state, leaves[i]), i)
+            for i in range(n) if not mask >> i & 1 and nbr[i] & mask
+        ]
+        children.sort(key=lambda c: model.cost(c[0]))
+        for child, i in children:
+            if stopped:
+                return
+            m = mask | 1 << i
+            rest = [leaves[j] for j in range(n) if not m >> j & 1]
+            if model.lower_bound(child, rest) >= bound() or dominated(m, child):
+                pruned += 1
+                continue
+            if top_k is None:
+                seen[m] = [other for other in seen.get(m, ()) if not model.dominates(child, other)] + [child]
+            order.append(i)
+            extend(m, child, order)
+            order.pop()
+
+    for i in sorted(range(n), key=lambda i: model.cost(leaves[i])):
+        if stopped:
+            break
+        rest = [leaves[j] for j in range(n) if j != i]
+        if model.lower_bound(leaves[i], rest) >= bound():
+            pruned += 1
+            continue
+        extend(1 << i, leaves[i], [i])
+
+    if counters is not None:
+        counters.update(nodes=nodes, pruned=pruned, complete=not stopped)
+    return [tables[i] for i in best[1]], best[0]
+
+
+def _merge_key(pred):
+    """kolom equi-join pertama di predikat sebagai frozenset nama kolom, None kalau tidak ada"""
+    if not pred:
+        return None
+    found = _EQUI_JOIN.findall(str(pred))
+    if not found:
+        return None
+    _, left, _, right = found[0]
+    return frozenset({left, right})
+
+
+def dp_join_order_orders(tables, join_conditions, stats, required_order=None, model=None,
+                         deadline=None, graph=None, buffer_blocks=100, merge_joins=True):
+    """
+    DP left-deep seperti dp_join_order, tetapi setiap subplan membawa properti
+    fisik order (frozenset nama kolom yang urutannya dijamin, None = tidak
+    terurut). Per himpunan tabel disimpan subplan termurah per order; subplan
+    terurut hanya disimpan kalau lebih murah dari subplan termurah + sort.
+
+    kandidat join dan cost sort berasal dari model (search_model CostEngine):
+        model.ordered_joins(left, right, left_order, key) -> [(state, order, method)]
+        model.sort_cost(state, column)                   -> cost tambahan sort
+    PlanCostModel (default, m = buffer_blocks): nested-loop atau merge join;
+    PlannerCostModel: join method termurah CostPlanner plus merge join paksa.
+    required_order (nama kolom): plan yang belum terurut ditambah sort di akhir.
+    merge_joins=False: tanpa merge join paksa (sama dengan dp_join_order + sort akhir).
+
+    return: (order, methods, cost, sorted_output) dengan methods sejajar
+    order[1:] (nama join method dari model) dan sorted_output = required_order
+    terpenuhi tanpa sort tambahan; (None, None, inf, False) kalau deadline habis.
+    """
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    tables = graph.tables
+    if model is None:
+        model = PlanCostModel(stats, buffer_blocks)
+    n = len(tables)
+    if n == 0:
+        return [], [], 0, False
+
+    full = (1 << n) - 1
+    nbr = graph.nbr
+    if not _is_connected(nbr, full):
+        nbr = [full & ~(1 << i) for i in range(n)]
+
+    leaves = [model.leaf(t) for t in tables]
+    # plans[mask][order] = (state, prev_mask, prev_order, table_index, method)
+    plans = {1 << i: {None: (leaves[i], 0, None, i, None)} for i in range(n)}
+
+    csgs = enumerate_csg(nbr) if n > 1 else []
+    csgs.sort(key=lambda m: bin(m).count("1"))
+    for s in csgs:
+        if s in plans:
+            continue
+        if deadline is not None and deadline.expired():
+            return None, None, float('inf'), False
+        cur = {}
+
+        m = s
+        while m:
+            low = m & -m
+            m ^= low
+            rest = s ^ low
+            i = low.bit_length() - 1
+            if rest not in plans or not (nbr[i] & rest):
+                continue
+            key = _merge_key(graph.predicate(rest, low)) if merge_joins else None
+            for prev_order, entry in plans[rest].items():
+                for state, order, method in model.ordered_joins(entry[0], leaves[i], prev_order, key):
+                    old = cur.get(order)
+                    if old is None or model.cost(state) < model.cost(old[0]):
+                        cur[order] = (state, rest, prev_order, i, method)
+
+        if cur:
+            # subplan terurut yang tidak lebih murah dari termurah + sort dibuang
+            cheapest = min((e[0] for e in cur.values()), key=model.cost)
+            limit = model.cost(cheapest) + model.sort_cost(cheapest, None)
+            plans[s] = {
+                order: e for order, e in cur.items()
+                if order is None or model.cost(e[0]) < limit
+            }
+
+    def satisfied(order):
+        return required_order is not None and order is not None and required_order in order
+
+    def total(order, entry):
+        cost = model.cost(entry[0])
+        if required_order is not None and not satisfied(order):
+            cost += model.sort_cost(entry[0], required_order)
+        return cost
+
+    final_order, entry = min(plans[full].items(), key=lambda oe: total(*oe))
+    cost = total(final_order, entry)
+    sorted_output = satisfied(final_order)
+
+    order, methods = [], []
+    mask, key = full, final_order
+    while mask:
+        _, rest, prev_order, i, method = plans[mask][key]
+        order.append(tables[i])
+        if method is not None:
+            methods.append(method)
+        mask, key = rest, prev_order
+    order.reverse()
+    methods.reverse()
+    return order, methods, cost, sorted_output
+
+
+def dp_bushy_join_order(tables, join_conditions, stats, model=None, deadline=None, graph=None):
+    """
+    DPccp: DP atas semua pasangan csg-cmp, sehingga subplan termurah per
+    himpunan tabel boleh berupa join dua subplan hasil join (bushy).
+    Kedua orientasi (kiri/kanan) dicoba karena plan_cost tidak simetris.
+
+    return: (shape, cost), bangun plannya dengan build_bushy_join_tree;
+    (None, inf) kalau deadline habis.
+    """
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    tables = graph.tables
+    if model is None:
+        model = PlanCostModel(stats)
+    n = len(tables)
+    if n == 0:
+        return None, 0
+    if n == 1:
+        return tables[0], model.cost(model.leaf(tables[0]))
+
+    full = (1 << n) - 1
+    nbr = graph.nbr
+    if not _is_connected(nbr, full):
+        nbr = [full & ~(1 << i) for i in range(n)]
+
+    # penomoran ulang BFS, bfs[k] = indeks tabel untuk node k
+    bfs = _bfs_numbering(nbr)
+    pos = {old: k for k, old in enumerate(bfs)}
+    renum = [0] * n
+    for k, old in enumerate(bfs):
+        m = nbr[old]
+        while m:
+            low = m & -m
+            m ^= low
+            renum[k] |= 1 << pos[low.bit_length() - 1]
+
+    # best[mask] = (state, shape)
+    best = {}
+    for k in range(n):
+        name = tables[bfs[k]]
+        best[1 << k] = (model.leaf(name), name)
+
+    pairs = enumerate_ccp(renum)
+    pairs.sort(key=lambda p: bin(p[0] | p[1]).count("1"))
+    for s1, s2 in pairs:
+        if deadline is not None and deadline.expired():
+            return None, float('inf')
+        if s1 not in best or s2 not in best:
+            continue
+        a, b = best[s1], best[s2]
+        s = s1 | s2
+        for left, right in ((a, b), (b, a)):
+            state = model.join(left[0], right[0])
+            if s not in best or model.cost(state) < model.cost(best[s][0]):
+                best[s] = (state, (left[1], right[1]))
+
+    state, shape = best[full]
+    return shape, model.cost(state)
+
+
+# ======================= GREEDY OPERATOR ORDERING =======================
+
+def shape_cost(shape, model) -> tuple:
+    """state model untuk shape bushy (nama tabel atau tuple (kiri, kanan))"""
+    if isinstance(shape, str):
+        return model.leaf(shape)
+    return model.join(shape_cost(shape[0], model), shape_cost(shape[1], model))
+
+
+def goo_join_order(tables, join_conditions, stats, model=None, planner=None, graph=None):
+    """
+    Greedy Operator Ordering: mulai dari satu subplan per tabel, lalu berulang
+    kali gabungkan pasangan subplan terhubung dengan estimasi kardinalitas hasil
+    (n_r dari CostPlanner.cost_join dengan predikat join pasangan itu) terkecil. Orientasi dipilih dari cost
+    CostPlanner yang lebih kecil. Pasangan tanpa predikat (cartesian) baru
+    dipertimbangkan kalau tidak ada pasangan terhubung.
+    deterministik, O(n^2 log n) estimasi join (heap dengan lazy deletion).
+
+    return: (shape, cost) dengan cost menurut model (sama dengan plan_cost).
+    """
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    tables = graph.tables
+    if model is None:
+        model = PlanCostModel(stats)
+    if planner is None:
+        planner = CostPlanner()
+    n = len(tables)
+    if n == 0:
+        return None, 0
+
+    nbr = graph.nbr
+    # alive[id] = (mask, shape, cost_info CostPlanner)
+    alive = {}
+    for i, t in enumerate(tables):
+        alive[i] = (1 << i, t, planner.cost_table_scan(QueryTree("TABLE", t)))
+    next_id = n
+    heap = []
+
+    def push(a, b):
+        (ma, sa, ia), (mb, sb, ib) = alive[a], alive[b]
+        # estimasi dengan predikat join antar subplan, cartesian kalau tidak ada edge
+        pred = graph.predicate(ma, mb)
+        node = QueryTree("JOIN", _mk_theta(pred) if pred else "CARTESIAN")
+        ab = planner.cost_join(node, ia, ib)
+        ba = planner.cost_join(node, ib, ia)
+        if ab["cost"] <= ba["cost"]:
+            heapq.heappush(heap, (ab["n_r"], ab["cost"], a, b, (sa, sb), ab))
+        else:
+            heapq.heappush(heap, (ba["n_r"], ba["cost"], a, b, (sb, sa), ba))
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            if nbr[i] >> j & 1:
+                push(i, j)
+
+    while len(alive) > 1:
+        while heap and (heap[0][2] not in alive or heap[0][3] not in alive):
+            heapq.heappop(heap)
+        if not heap:
+            ids = sorted(alive)
+            for x in range(len(ids)):
+                for y in range(x + 1, len(ids)):
+                    push(ids[x], ids[y])
+            continue
+        _, _, a, b, shape, info = heapq.heappop(heap)
+        mask = alive.pop(a)[0] | alive.pop(b)[0]
+        alive[next_id] = (mask, shape, info)
+        reach = _neighborhood(nbr, mask)
+        for other in sorted(alive):
+            if other != next_id and alive[other][0] & reach:
+                push(next_id, other)
+        next_id += 1
+
+    (_, shape, _), = alive.values()
+    return shape, model.cost(shape_cost(shape, model))
+
+
+# ======================= BUSHY GA ENCODING =======================
+
+def join_graph_edges(tables, join_conditions, graph=None) -> list:
+    """edge join graph sebagai pasangan (A, B), urut sesuai posisi di tables"""
+    graph = graph if graph is not None else JoinGraph(tables, join_conditions)
+    return [(graph.tables[a], graph.tables[b]) for a, b in graph.edges()]
+
+
+def decode_edge_order(edge_order, tables, model):
+    """
+    decode individu GA bushy: permutasi edge join graph.
+    edge diproses berurutan; edge yang menghubungkan dua komponen berbeda
+    menggabungkan subplan keduanya (orientasi termurah menurut model).
+    komponen yang tersisa (graph tidak terhubung) digabung dengan cartesian.
+    setiap bushy tree tanpa cartesian product bisa dicapai oleh suatu urutan.
+
+    return: (shape, cost)
+    """
+    parent = {t: t for t in tables}
+    plans = {t: (model.leaf(t), t) for t in tables}
+
+    def find(t):
+        while parent[t] != t:
+            parent[t] = parent[parent[t]]
+            t = parent[t]
+        return t
+
+    def merge(a, b):
+        (sa, pa), (sb, pb) = plans[a], plans[b]
+        ab = model.join(sa, sb)
+        ba = model.join(sb, sa)
+        return (ab, (pa, pb)) if model.cost(ab) <= model.cost(ba) else (ba, (pb, pa))
+
+    for a, b in edge_order:
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        plans[ra] = merge(ra, rb)
+        del plans[rb]
+        parent[rb] = ra
+
+    roots = [t for t in tables if find(t) == t]
+    cur = roots[0]
+    for r in roots[1:]:
+        plans[cur] = merge(cur, r)
+        del plans[r]
+    state, shape = plans[cur]
+    return shape, model.cost(state)
+
+
+# ======================= PARALLEL FITNESS =======================
+
+class FitnessEvaluator:
+    """
+    evaluator fitness yang dikirim sekali ke setiap worker per optimasi.
+    individu dikirim dalam bentuk kompak: bytes/tuple indeks ke genes
+    (tabel untuk left-deep, edge untuk bushy).
+    """
+
+    def __init__(self, tables, genes, model, bushy=False):
+        self.tables = list(tables)
+        self.genes = list(genes)
+        self.model = model
+        self.bushy = bushy
+        self._cache = None
+
+    def __getstate__(self):
+        # cache tidak ikut dikirim ke worker, tiap proses punya sendiri
+        state = self.__dict__.copy()
+        state["_cache"] = None
+        return state
+
+    def costs(self, keys) -> list:
+        """evaluasi individu (tuple genes) dengan FitnessCache milik evaluator ini"""
+        if self._cache is None:
+            self._cache = FitnessCache(self.model)
+        compute = None
+        if self.bushy:
+            def compute(todo):
+                return [decode_edge_order(list(k), self.tables, self.model)[1] for k in todo]
+        return self._cache.costs(keys, compute)
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats() if self._cache else {}
+
+    def encode(self, individual, index: dict):
+        codes = [index[g] for g in individual]
+        return bytes(codes) if len(self.genes) <= 256 else tuple(codes)
+
+    def evaluate(self, batch) -> list:
+        cache = FitnessCache(self.model)
+        out = []
+        for code in batch:
+            individual = [self.genes[i] for i in code]
+            if self.bushy:
+                out.append(decode_edge_order(individual, self.tables, self.model)[1])
+            else:
+                out.append(cache.cost(individual))
+        return out
+
+
+_WORKER_EVALUATOR = None
+
+
+def _init_fitness_worker(evaluator):
+    # initializer ProcessPoolExecutor: simpan evaluator di proses worker
+    global _WORKER_EVALUATOR
+    _WORKER_EVALUATOR = evaluator
+
+
+def _evaluate_in_worker(batch):
+    return _WORKER_EVALUATOR.evaluate(batch)
+
+
+def _worker_evaluator():
+    return _WORKER_EVALUATOR
+
+
+def parallel_costs(executor, evaluate, codes, n_chunks: int) -> list:
+    """
+    bagi codes menjadi n_chunks batch dan evaluasi paralel lewat executor.
+    codes diurutkan dulu supaya prefix yang sama jatuh di batch yang sama;
+    hasil dikembalikan sesuai urutan input.
+    """
+    if not codes:
+        return []
+    order = sorted(range(len(codes)), key=lambda i: codes[i])
+    size = -(-len(order) // max(1, n_chunks))
+    chunks = [order[i:i + size] for i in range(0, len(order), size)]
+    futures = [executor.submit(evaluate, [codes[i] for i in chunk]) for chunk in chunks]
+
+    out = [None] * len(codes)
+    for chunk, future in zip(chunks, futures):
+        for i, c in zip(chunk, future.result()):
+            out[i] = c
+    return out
@@ -0,0 +1,215 @@
+"""
+Registry strategi join-order dan selector berdasarkan bentuk join graph.
+
+Setiap strategi mendeklarasikan:
+    - exact: menjamin plan optimal di ruang pencariannya (DP, branch-and-bound)
+    - rank: urutan preferensi (kecil = lebih murah/lebih dipilih) di antara
+      strategi yang berlaku
+    - max_tables(engine, shape): jumlah tabel terbesar yang masih wajar untuk
+      strategi ini pada bentuk graph tersebut (scaling)
+    - shapes: bentuk graph yang didukung (None = semua)
+    - auto: ikut dipilih otomatis atau hanya kalau diminta lewat nama
+    - matches(engine, tables, join_conditions, stats): syarat tambahan yang
+      butuh statistik (mis. deteksi star schema); None = selalu cocok
+
+run(engine, tables, join_conditions, stats, deadline) -> (plan, cost), dengan
+(None, inf) kalau deadline habis sebelum ada plan lengkap.
+"""
+
+from helper.join_graph import JoinGraph
+from helper.star_schema import detect_star_schema
+
+
+# bentuk graph dengan jumlah connected subgraph polinomial (DP tetap murah)
+POLYNOMIAL_SHAPES = ("single", "chain", "cycle")
+
+
+class JoinStrategy:
+    def __init__(self, name, run, exact=False, rank=0, max_tables=None,
+                 shapes=None, enabled=None, auto=True, matches=None, description=""):
+        self.name = name
+        self.run = run
+        self.exact = exact
+        self.rank = rank
+        self._max_tables = max_tables
+        self.shapes = shapes
+        self._enabled = enabled
+        self.auto = auto
+        self._matches = matches
+        self.description = description
+
+    def max_tables(self, engine, shape) -> float:
+        if self._max_tables is None:
+            return float('inf')
+        return self._max_tables(engine, shape)
+
+    def enabled(self, engine) -> bool:
+        return self._enabled is None or self._enabled(engine)
+
+    def applies(self, engine, shape, n_tables) -> bool:
+        if not self.auto or not self.enabled(engine):
+            return False
+        if self.shapes is not None and shape not in self.shapes:
+            return False
+        return n_tables <= self.max_tables(engine, shape)
+
+    def matches(self, engine, tables, join_conditions, stats) -> bool:
+        # tanpa statistik, strategi yang punya syarat tambahan tidak dipilih
+        if self._matches is None:
+            return True
+        return stats is not None and self._matches(engine, tables, join_conditions, stats)
+
+    def __repr__(self):
+        return f"JoinStrategy({self.name})"
+
+
+JOIN_STRATEGIES = {}
+
+
+def register_join_strategy(strategy: JoinStrategy):
+    """daftarkan (atau ganti) strategi berdasarkan namanya"""
+    JOIN_STRATEGIES[strategy.name] = strategy
+    return strategy
+
+
+def get_join_strategy(name: str) -> JoinStrategy:
+    if name not in JOIN_STRATEGIES:
+        raise ValueError(f"Unknown join strategy: {name}")
+    return JOIN_STRATEGIES[name]
+
+
+def classify_join_graph(tables, join_conditions) -> str:
+    """
+    bentuk join graph: single, chain, star, cycle, clique, tree (acyclic
+    lainnya), cyclic (siklik lainnya) atau disconnected.
+    """
+    n = len(tables)
+    if n <= 1:
+        return "single"
+    graph = JoinGraph(tables, join_conditions)
+    if not graph.is_connected():
+        return "disconnected"
+
+    degrees = [bin(m).count("1") for m in graph.nbr]
+    edges = sum(degrees) // 2
+    if edges == n - 1:
+        if max(degrees) <= 2:
+            return "chain"
+        if max(degrees) == n - 1:
+            return "star"
+        return "tree"
+    if n > 3 and edges == n * (n - 1) // 2:
+        return "clique"
+    if edges == n and all(d == 2 for d in degrees):
+        return "cycle"
+    return "cyclic"
+
+
+def select_join_strategy(engine, tables, join_conditions, stats=None) -> JoinStrategy:
+    """
+    strategi dengan rank terkecil yang berlaku untuk bentuk graph, jumlah
+    tabel dan statistik query; kalau engine.join_strategy bukan "auto",
+    strategi itu dipakai.
+    """
+    if engine.join_strategy != "auto":
+        return get_join_strategy(engine.join_strategy)
+
+    shape = classify_join_graph(tables, join_conditions)
+    candidates = [
+        s for s in JOIN_STRATEGIES.values()
+        if s.applies(engine, shape, len(tables)) and s.matches(engine, tables, join_conditions, stats)
+    ]
+    if not candidates:
+        return get_join_strategy("greedy")
+    return min(candidates, key=lambda s: s.rank)
+
+
+# ======================= STRATEGI BAWAAN =======================
+
+def _exhaustive_max_tables(engine, shape):
+    if shape in POLYNOMIAL_SHAPES:
+        return float('inf')
+    if engine.use_goo:
+        return min(engine.dp_max_tables, engine.goo_threshold_tables - 1)
+    return engine.dp_max_tables
+
+
+def _approximate_max_tables(engine, shape):
+    # di atas threshold GOO, strategi randomized dianggap terlalu lambat
+    if engine.use_goo:
+        return engine.goo_threshold_tables - 1
+    return float('inf')
+
+
+register_join_strategy(JoinStrategy(
+    "star",
+    lambda engine, *args: engine._star_optimize(*args),
+    rank=-1,
+    # star dengan dua dimensi berbentuk chain
+    shapes=("chain", "star", "tree"),
+    enabled=lambda engine: engine.use_star_plans,
+    matches=lambda engine, tables, join_conditions, stats: detect_star_schema(
+        tables, join_conditions, stats, engine.star_fact_ratio) is not None,
+    description="star/snowflake: fact dulu, dimensi urut selectivity filter",
+))
+
+register_join_strategy(JoinStrategy(
+    "dp",
+    lambda engine, *args: engine._dp_optimize(*args),
+    exact=True, rank=0,
+    max_tables=_exhaustive_max_tables,
+    enabled=lambda engine: engine.join_enumerator == "dp",
+    description="DP atas connected subgraph (DPccp kalau bushy_plans)",
+))
+
+register_join_strategy(JoinStrategy(
+    "bnb",
+    lambda engine, *args: engine._bnb_optimize(*args),
+    exact=True, rank=0,
+    max_tables=_exhaustive_max_tables,
+    enabled=lambda engine: engine.join_enumerator == "bnb",
+    description="branch-and-bound left-deep, anytime",
+))
+
+register_join_strategy(JoinStrategy(
+    "sa",
+    lambda engine, *args: engine._simulated_annealing_optimize(*args),
+    rank=1,
+    max_tables=_approximate_max_tables,
+    shapes=("star", "tree", "cyclic", "clique", "disconnected"),
+    enabled=lambda engine: engine.use_sa,
+    description="simulated annealing, satu trajektori dengan evaluation cap",
+))
+
+register_join_strategy(JoinStrategy(
+    "ga",
+    lambda engine, *args: engine._genetic_algorithm_optimize(*args),
+    rank=2,
+    max_tables=_approximate_max_tables,
+    # chain/cycle selalu murah untuk DP, GA tidak pernah dipakai
+    shapes=("star", "tree", "cyclic", "clique", "disconnected"),
+    enabled=lambda engine: engine.use_ga,
+    description="genetic algorithm (left-deep atau edge order bushy)",
+))
+
+register_join_strategy(JoinStrategy(
+    "goo",
+    lambda engine, tables, join_conditions, stats, deadline: engine._goo_optimize(tables, join_conditions, stats),
+    rank=3,
+    enabled=lambda engine: engine.use_goo,
+    description="Greedy Operator Ordering, O(n^2 log n)",
+))
+
+register_join_strategy(JoinStrategy(
+    "greedy",
+    lambda engine, tables, join_conditions, stats, deadline: engine._greedy_optimize(tables, join_conditions, stats),
+    rank=4,
+    description="greedy left-deep, fallback termurah",
+))
+
+register_join_strategy(JoinStrategy(
+    "heuristic",
+    lambda engine, *args: engine._heuristic_optimize(*args),
+    auto=False,
+    description="DP/bushy DP sampai dp_max_tables, selain itu sampel permutasi",
+))
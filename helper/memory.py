@@ -0,0 +1,98 @@
+"""
+Konfigurasi memory untuk cost model (semua dalam blocks): ukuran buffer pool,
+ukuran block/page, dan memory grant per query dari executor.
+
+Sumber konfigurasi (lihat memory_config):
+    - MemoryConfig langsung
+    - int: buffer_blocks saja
+    - dict config: {"buffer_blocks", "block_size", "page_size", "query_grant_blocks"}
+    - storage manager: get_buffer_pool_size(), dan kalau ada get_block_size(),
+      get_page_size(), get_query_memory_grant()
+
+Rumus yang bergantung memory (external sort, block nested-loop, hash join)
+memakai work_blocks = min(buffer_blocks, query_grant_blocks), jadi setiap
+operator plan muat di grant query.
+"""
+
+
+# minimal 3 block: dua input + satu output (block nested-loop, merge)
+MIN_BUFFER_BLOCKS = 3
+
+
+def _blocks(value, name):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer number of blocks")
+    if value < MIN_BUFFER_BLOCKS:
+        raise ValueError(f"{name} must be at least {MIN_BUFFER_BLOCKS} blocks")
+    return value
+
+
+class MemoryConfig:
+    """buffer pool dan memory grant per query untuk CostPlanner"""
+
+    __slots__ = ("buffer_blocks", "block_size", "page_size", "query_grant_blocks")
+
+    def __init__(self, buffer_blocks: int = 100, block_size: int = 4096, page_size: int = 4096,
+                 query_grant_blocks: int = None):
+        self.buffer_blocks = _blocks(buffer_blocks, "buffer_blocks")
+        self.block_size = block_size
+        self.page_size = page_size
+        self.query_grant_blocks = (None if query_grant_blocks is None
+                                   else _blocks(query_grant_blocks, "query_grant_blocks"))
+
+    @property
+    def work_blocks(self) -> int:
+        """m untuk rumus cost: buffer pool, dibatasi grant query kalau ada"""
+        if self.query_grant_blocks is None:
+            return self.buffer_blocks
+        return min(self.buffer_blocks, self.query_grant_blocks)
+
+    def with_grant(self, query_grant_blocks) -> "MemoryConfig":
+        """salinan config dengan memory grant query lain (None = tanpa grant)"""
+        return MemoryConfig(self.buffer_blocks, self.block_size, self.page_size, query_grant_blocks)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "MemoryConfig":
+        """MemoryConfig dari dict config; key yang tidak ada memakai default"""
+        known = {k: config[k] for k in cls.__slots__ if k in config}
+        unknown = set(config) - set(known)
+        if unknown:
+            raise ValueError(f"Unknown memory config keys: {', '.join(sorted(unknown))}")
+        return cls(**known)
+
+    @classmethod
+    def from_storage_manager(cls, storage_manager) -> "MemoryConfig":
+        """MemoryConfig dari storage manager (minimal get_buffer_pool_size())"""
+        def ask(method, default):
+            getter = getattr(storage_manager, method, None)
+            return getter() if callable(getter) else default
+
+        return cls(buffer_blocks=ask("get_buffer_pool_size", 100),
+                   block_size=ask("get_block_size", 4096),
+                   page_size=ask("get_page_size", 4096),
+                   query_grant_blocks=ask("get_query_memory_grant", None))
+
+    def __eq__(self, other):
+        if not isinstance(other, MemoryConfig):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        return (f"MemoryConfig(buffer_blocks={self.buffer_blocks}, block_size={self.block_size}, "
+                f"page_size={self.page_size}, query_grant_blocks={self.query_grant_blocks})")
+
+
+def memory_config(value=None, storage_manager=None) -> MemoryConfig:
+    """
+    MemoryConfig dari MemoryConfig / int (buffer_blocks) / dict config; None
+    memakai storage manager kalau ada get_buffer_pool_size(), selain itu default
+    """
+    if isinstance(value, MemoryConfig):
+        return value
+    if isinstance(value, dict):
+        return MemoryConfig.from_config(value)
+    if value is not None:
+        return MemoryConfig(buffer_blocks=value)
+    if storage_manager is not None and callable(getattr(storage_manager, "get_buffer_pool_size", None)):
+        return MemoryConfig.from_storage_manager(storage_manager)
+    return MemoryConfig()
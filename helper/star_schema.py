@@ -0,0 +1,192 @@
+"""
+Deteksi skema star / snowflake di join graph dan plan langsung untuknya.
+
+Fact = tabel dengan n_r terbesar, minimal fact_ratio kali n_r setiap dimensi
+yang di-join langsung. Join graph harus berupa tree berakar di fact: dimensi
+menempel ke fact, sub-dimensi (snowflake) menempel ke dimensinya dengan n_r
+tidak lebih besar. Setiap edge harus equi-join ke kolom yang terbukti key di
+tabel anak: primary_key, direferensikan foreign_keys, atau V(A, t) == n_r(t);
+tanpa statistik kolom itu bukan star.
+
+Plan: left-deep mulai dari fact, cabang dimensi diurutkan dari filter paling
+selektif, join method tiap join dipilih CostPlanner (hash join atau index
+nested-loop ke key dimensi, dst.).
+"""
+
+import math
+import re
+
+from helper.join_graph import JoinGraph, _bits
+from helper.cost import CostPlanner
+from helper.cost_engine import PlannerCostModel
+
+
+_COLUMN = re.compile(r"\b([A-Za-z_]\w*)\.([A-Za-z_]\w*)\b")
+
+
+class StarSchema:
+    def __init__(self, fact, branches, keys, graph=None):
+        self.fact = fact
+        self.branches = branches  # list cabang, tiap cabang [dim, subdim, ...] urutan BFS
+        self.keys = keys          # {tabel: kolom key yang di-join dari parent-nya}
+        self.graph = graph        # JoinGraph tempat skema dideteksi
+
+    @property
+    def dimensions(self) -> list:
+        return [t for branch in self.branches for t in branch]
+
+    @property
+    def snowflake(self) -> bool:
+        return any(len(branch) > 1 for branch in self.branches)
+
+    def __repr__(self):
+        kind = "snowflake" if self.snowflake else "star"
+        return f"StarSchema({kind}, fact={self.fact}, branches={self.branches})"
+
+
+def _n_r(stats, table):
+    return stats.get(table, {}).get("n_r", 1000)
+
+
+def _b_r(stats, table):
+    return stats.get(table, {}).get("b_r", 100)
+
+
+def _key_column(pred, table, stats):
+    """kolom predikat yang dikenal di stats tabel (qualifier = nama tabel didahulukan)"""
+    table_stats = stats.get(table, {})
+    known = set(table_stats.get("v_a_r", {})) | set(_primary_key(table_stats))
+    columns = sorted(_COLUMN.findall(str(pred)), key=lambda qc: qc[0] != table)
+    for _, column in columns:
+        if column in known or column in _referenced(table, stats):
+            return column
+    return None
+
+
+def _primary_key(table_stats) -> list:
+    primary_key = table_stats.get("primary_key") or []
+    return [primary_key] if isinstance(primary_key, str) else list(primary_key)
+
+
+def _referenced(table, stats) -> set:
+    # kolom table yang direferensikan foreign_keys tabel lain ("table.kolom")
+    out = set()
+    for other in stats.values():
+        for ref in (other.get("foreign_keys") or {}).values():
+            ref_table, _, ref_column = str(ref).partition(".")
+            if ref_table == table and ref_column:
+                out.add(ref_column)
+    return out
+
+
+def _is_key_join(pred, table, stats) -> bool:
+    # equi-join ke kolom yang terbukti unik di tabel: primary key satu kolom,
+    # kolom yang direferensikan foreign key, atau V(A, t) == n_r(t)
+    if " = " not in str(pred):
+        return False
+    column = _key_column(pred, table, stats)
+    if column is None:
+        return False
+    table_stats = stats[table]
+    if _primary_key(table_stats) == [column] or column in _referenced(table, stats):
+        return True
+    v = table_stats.get("v_a_r", {}).get(column)
+    return v is not None and v >= _n_r(stats, table)
+
+
+def detect_star_schema(tables, join_conditions, stats, fact_ratio=2.0, graph=None):
+    """
+    StarSchema kalau join graph berbentuk star/snowflake menurut n_r dan
+    predikat key, None kalau tidak.
+    """
+    if len(tables) < 3:
+        return None
+    if graph is None:
+        graph = JoinGraph(tables, join_conditions)
+    if not graph.is_connected() or len(graph.edges()) != graph.n - 1:
+        return None
+
+    fact = max(range(graph.n), key=lambda i: _n_r(stats, graph.tables[i]))
+    fact_rows = _n_r(stats, graph.tables[fact])
+    if bin(graph.nbr[fact]).count("1") < 2:
+        return None
+
+    branches = []
+    keys = {}
+    for dim in _bits(graph.nbr[fact]):
+        branch = []
+        frontier = [(fact, dim)]
+        while frontier:
+            parent, child = frontier.pop(0)
+            p_name, c_name = graph.tables[parent], graph.tables[child]
+            pred = graph.preds[parent][child]
+            if not _is_key_join(pred, c_name, stats):
+                return None
+            if parent == fact:
+                if fact_rows < fact_ratio * _n_r(stats, c_name):
+                    return None
+            elif _n_r(stats, c_name) > _n_r(stats, p_name):
+                return None
+            branch.append(c_name)
+            keys[c_name] = _key_column(pred, c_name, stats)
+            frontier.extend((child, g) for g in _bits(graph.nbr[child] & ~(1 << parent)))
+        branches.append(branch)
+
+    return StarSchema(graph.tables[fact], branches, keys, graph)
+
+
+def star_join_order(schema, stats, filters=None) -> list:
+    """
+    fact dulu, lalu cabang dimensi dari yang paling selektif (hasil kali
+    selectivity filter di cabang), seri diputus dengan n_r dimensi terkecil.
+    """
+    filters = filters or {}
+
+    def rank(branch):
+        selectivity = 1.0
+        for t in branch:
+            selectivity *= filters.get(t, 1.0)
+        return (selectivity, _n_r(stats, branch[0]))
+
+    order = [schema.fact]
+    for branch in sorted(schema.branches, key=rank):
+        order.extend(branch)
+    return order
+
+
+def choose_star_join_methods(schema, order, stats, filters=None, planner=None) -> list:
+    """
+    metode fisik untuk setiap join di order left-deep (sejajar order[1:]),
+    dipilih CostPlanner.estimate_join sambil berjalan di order seperti
+    CostEngine (PlannerCostModel): input kiri = hasil join sebelumnya, jadi
+    n_r, b_r, lebar tuple dan cost CPU ikut tumbuh. filter mengecilkan n_r
+    dan b_r scan tabelnya sebesar selectivity-nya, sehingga index
+    nested-loop dipilih setelah filter yang selektif.
+    estimated_cost = join_cost CostPlanner (sama dengan CostEngine.breakdown
+    untuk plan yang sama tanpa filter).
+    """
+    filters = filters or {}
+    planner = planner if planner is not None else CostPlanner(stats=stats)
+    graph = schema.graph if schema.graph is not None else JoinGraph(order, {})
+    model = PlannerCostModel(planner, graph)
+
+    def scan(table):
+        info, mask, i = model.leaf(table)
+        selectivity = filters.get(table, 1.0)
+        if selectivity < 1.0:
+            info = dict(info, n_r=max(1, int(info["n_r"] * selectivity)),
+                        b_r=max(1, math.ceil(info["b_r"] * selectivity)))
+        return (info, mask, i)
+
+    methods = []
+    state = scan(order[0])
+    for table in order[1:]:
+        state = model.join(state, scan(table))
+        info = state[0]
+        method = {"join_method": info["join_method"], "estimated_cost": info["join_cost"]}
+        if info["join_method"] == "hash-join":
+            method["build"] = table
+        elif info["join_method"].startswith("index-nested-loop"):
+            method["index"] = schema.keys.get(table)
+        methods.append(method)
+    return methods
@@ -11,11 +11,16 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 60,                 # Total number of storage blocks
             "l_r": 512,                # Size of a single movie record (in bytes)
             "f_r": 16,                 # Blocking factor (movies per block)
+            "primary_key": ["movie_id"],
             "v_a_r": {                 # Distinct values for attributes
                 "movie_id": 1000,      # Each movie has a unique ID
                 "title": 980,          # Number of unique movie titles (some may repeat)
                 "genre": 20,           # Number of distinct genres
                 "age_rating": 4
+            },
+            "mcv": {                   # Most common values (fraction of movies)
+                "genre": {"Drama": 0.3, "Action": 0.18, "Comedy": 0.12},
+                "age_rating": {"PG-13": 0.45, "R": 0.3}
             }
         },
         "reviews": {
@@ -23,11 +28,16 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 100,                # Total number of storage blocks
             "l_r": 256,                # Size of a single review record (in bytes)
             "f_r": 50,                 # Blocking factor (reviews per block)
+            "primary_key": ["review_id"],
+            "foreign_keys": {"movie_id": "movies.movie_id"},
             "v_a_r": {                 # Distinct values for attributes
                 "review_id": 5000,     # Each review has a unique ID
                 "movie_id": 1000,      # Matches the number of movies in the movies table
                 "rating": 10,          # Ratings are distinct values (e.g., 1-10)
                 "description": 4500    # Number of unique review descriptions
+            },
+            "histograms": {            # Equi-depth bucket bounds (10 buckets, 500 reviews each)
+                "rating": [1, 4, 6, 7, 7, 8, 8, 9, 9, 10, 10]
             }
         },
         "directors": {
@@ -35,6 +45,7 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 10,
             "l_r": 512,
             "f_r": 20,
+            "primary_key": ["director_id"],
             "v_a_r": {
                 "director_id": 200,    # Each director has a unique ID
                 "name": 180            # Number of unique director names
@@ -45,6 +56,7 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 150,
             "l_r": 512,
             "f_r": 20,
+            "primary_key": ["actor_id"],
             "v_a_r": {
                 "actor_id": 3000,      # Each actor has a unique ID
                 "name": 2900           # Number of unique actor names
@@ -55,6 +67,8 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 25,
             "l_r": 256,
             "f_r": 20,
+            "primary_key": ["award_id"],
+            "foreign_keys": {"movie_id": "movies.movie_id"},
             "v_a_r": {
                 "award_id": 500,
                 "award_name": 450,
@@ -66,6 +80,8 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 100,
             "l_r": 128,
             "f_r": 40,
+            "primary_key": ["movie_id", "actor_id"],
+            "foreign_keys": {"movie_id": "movies.movie_id", "actor_id": "actors.actor_id"},
             "v_a_r": {
                 "movie_id": 1000,      # Matches the number of movies
                 "actor_id": 3000       # Matches the number of actors
@@ -76,6 +92,8 @@ def get_stats() -> Dict[str, Dict[str, Any]]:
             "b_r": 50,
             "l_r": 128,
             "f_r": 20,
+            "primary_key": ["movie_id", "director_id"],
+            "foreign_keys": {"movie_id": "movies.movie_id", "director_id": "directors.director_id"},
             "v_a_r": {
                 "movie_id": 1000,      # Matches the number of movies
                 "director_id": 200     # Matches the number of directors
@@ -0,0 +1,80 @@
+"""
+Lebar kolom (byte) untuk estimasi l_r / f_r / b_r hasil projection dan join.
+
+Sumber per tabel (stats, format helper.stats.get_stats), urutan prioritas:
+    widths : {kolom: byte}
+    schema : [ColumnDefinition, ...] seperti CREATE TABLE (atau dict
+             {kolom: ColumnDefinition / {"data_type": ..., "size": ...}})
+    l_r    : sisa l_r dibagi rata ke kolom v_a_r yang belum diketahui lebarnya
+
+char(n) / varchar(n) = n byte (varchar dihitung penuh), tipe tanpa size
+memakai TYPE_WIDTHS, tipe tidak dikenal DEFAULT_WIDTH.
+"""
+
+from model.query_tree import ColumnDefinition
+
+
+TYPE_WIDTHS = {
+    "int": 4, "integer": 4, "smallint": 2, "bigint": 8,
+    "float": 8, "double": 8, "real": 4, "decimal": 8, "numeric": 8,
+    "bool": 1, "boolean": 1, "date": 4, "time": 8, "timestamp": 8,
+    "char": 1, "varchar": 1, "text": 256,
+}
+
+DEFAULT_WIDTH = 8
+
+
+def column_width(definition) -> int:
+    """lebar satu kolom dari ColumnDefinition, dict {data_type, size} atau angka byte"""
+    if isinstance(definition, bool):
+        raise ValueError(f"Unsupported column width: {definition!r}")
+    if isinstance(definition, (int, float)):
+        if definition <= 0:
+            raise ValueError(f"Column width must be positive: {definition!r}")
+        return definition
+    if isinstance(definition, ColumnDefinition):
+        data_type, size = definition.data_type, definition.size
+    elif isinstance(definition, dict):
+        data_type = definition.get("data_type", definition.get("type"))
+        size = definition.get("size")
+    else:
+        raise ValueError(f"Unsupported column width: {definition!r}")
+    if size and str(data_type).lower() in ("char", "varchar"):
+        return size
+    return TYPE_WIDTHS.get(str(data_type).lower(), DEFAULT_WIDTH)
+
+
+def column_widths(table_stats: dict) -> dict:
+    """
+    {kolom: byte} untuk satu tabel dari widths / schema / l_r di stats;
+    kosong kalau lebar tidak bisa ditentukan
+    """
+    widths = {}
+    schema = table_stats.get("schema") or ()
+    if isinstance(schema, dict):
+        schema = [(name, d) for name, d in schema.items()]
+    else:
+        schema = [(d.name, d) for d in schema]
+    for name, definition in schema:
+        widths[name] = column_width(definition)
+    for name, width in (table_stats.get("widths") or {}).items():
+        widths[name] = column_width(width)
+
+    # kolom sisanya berbagi l_r yang belum terpakai
+    unknown = [a for a in table_stats.get("v_a_r", {}) if a not in widths]
+    l_r = table_stats.get("l_r") or 0
+    if unknown and l_r:
+        share = max(1, l_r - sum(widths.values())) / len(unknown)
+        for name in unknown:
+            widths[name] = share
+    elif unknown and widths:
+        for name in unknown:
+            widths[name] = DEFAULT_WIDTH
+    return widths
+
+
+def tuple_width(widths: dict, columns=None) -> float:
+    """lebar tuple: jumlah lebar columns (None = semua); kolom tanpa lebar DEFAULT_WIDTH"""
+    if columns is None:
+        return sum(widths.values())
+    return sum(widths.get(c, DEFAULT_WIDTH) for c in columns)
@@ -155,6 +155,7 @@ class QueryTree:
         self.val = val
         self.childs = list(childs) if childs else []
         self.parent = parent
+        self.physical = {}  # anotasi plan fisik, mis. {"join_method": "hash-join"}
 
     def add_child(self, node: "QueryTree"):
         node.parent = self
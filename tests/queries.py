@@ -0,0 +1,26 @@
+"""
+Query sintetis bersama untuk test join ordering (dan benchmark.py):
+(tables, join_conditions, stats) dengan format yang sama seperti
+_extract_join_conditions_from_tree / helper.stats.get_stats.
+"""
+
+import random
+
+
+def star_query(n, seed=0):
+    """star t0 (fact) dengan beberapa sub-dimensi (snowflake), stats acak per seed"""
+    rng = random.Random(seed)
+    tables = [f"t{i}" for i in range(n)]
+    conds = {frozenset({"t0", f"t{i}"}): f"t0.k{i} = t{i}.id" for i in range(1, n)}
+    for i in range(1, n // 3):
+        conds[frozenset({f"t{i}", f"t{n - i}"})] = f"t{i}.s = t{n - i}.id"
+    stats = {t: {"n_r": rng.randint(100, 20000), "b_r": rng.randint(5, 400)} for t in tables}
+    return tables, conds, stats
+
+
+def chain_query(n):
+    """chain t0 - t1 - ... - t(n-1), tabel makin besar ke kanan"""
+    tables = [f"t{i}" for i in range(n)]
+    conds = {frozenset({f"t{i}", f"t{i+1}"}): f"t{i}.id = t{i+1}.id" for i in range(n - 1)}
+    stats = {t: {"n_r": 100 * (i + 1), "b_r": 10 * (i + 1)} for i, t in enumerate(tables)}
+    return tables, conds, stats
@@ -0,0 +1,104 @@
+"""
+Test untuk pemilihan access path SIGMA di atas TABLE (CostPlanner.choose_access_path):
+table scan vs index scan b+ / hash, primary (clustering) vs secondary, untuk
+predikat =, IN dan range.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree, ConditionNode, LogicalNode, ColumnNode
+from helper.cost import CostPlanner
+
+
+def _cond(attr, op, value):
+    return ConditionNode(ColumnNode(attr), op, value)
+
+
+def _select(condition, table="students"):
+    return QueryTree("SIGMA", condition, [QueryTree("TABLE", table)])
+
+
+class TestAccessPaths(unittest.TestCase):
+
+    def setUp(self):
+        # dummy stats: students.student_id b+ primary (depth 4), name hash (10 bucket)
+        self.planner = CostPlanner()
+
+    def _cost(self, condition, table="students"):
+        return self.planner.calculate_cost(_select(condition, table))
+
+    def test_point_lookup_on_primary_index(self):
+        result = self._cost(_cond("student_id", "=", 5))
+        self.assertEqual(result["access_path"], "index-scan (b+, primary) on student_id")
+        self.assertEqual(result["io_cost"], 4 + 1)
+        self.assertEqual(result["order"], "student_id")
+
+    def test_secondary_hash_equality(self):
+        result = self._cost(_cond("name", "=", "'Budi'"))
+        self.assertEqual(result["access_path"], "index-scan (hash) on name")
+        # 1 lookup bucket + ceil(10000 / 9500) tuple, satu block per tuple
+        self.assertEqual(result["io_cost"], 1 + 2)
+        self.assertIsNone(result["order"])
+
+    def test_hash_cannot_range(self):
+        self.assertEqual(self._cost(_cond("name", ">", "'M'"))["access_path"], "table-scan")
+
+    def test_unindexed_column_scans(self):
+        result = self._cost(_cond("age", "=", 20))
+        self.assertEqual((result["access_path"], result["io_cost"]), ("table-scan", 500))
+
+    def test_in_list(self):
+        result = self._cost(_cond("student_id", "IN", [1, 2, 3]))
+        self.assertEqual(result["io_cost"], 3 * 4 + 3)
+
+    def test_range_primary_vs_secondary(self):
+        planner = CostPlanner(stats={
+            "t": {"n_r": 10000, "b_r": 500, "v_a_r": {"x": 10000, "y": 10000},
+                  "histograms": {"x": [0, 10000], "y": [0, 10000]},
+                  "indexes": {"x": {"type": "b+", "value": 3, "primary": True},
+                              "y": {"type": "b+", "value": 3}}}})
+        # 1% tuple: clustering index membaca block berurutan, secondary satu block per tuple
+        primary = planner.calculate_cost(_select(_cond("x", "<", 100), "t"))
+        secondary = planner.calculate_cost(_select(_cond("y", "<", 100), "t"))
+        self.assertEqual(primary["io_cost"], 3 + 100 / 20)
+        self.assertEqual(secondary["io_cost"], 3 + 100)
+        # 50% tuple lewat secondary index lebih mahal dari full scan
+        wide = planner.calculate_cost(_select(_cond("y", "<", 5000), "t"))
+        self.assertEqual(wide["access_path"], "table-scan")
+        # range dua sisi pada kolom yang sama = satu range index
+        both = LogicalNode("AND", [_cond("x", ">=", 1000), _cond("x", "<", 1100)])
+        self.assertEqual(planner.calculate_cost(_select(both, "t"))["io_cost"], 3 + 5)
+
+    def test_conjunction_uses_best_index(self):
+        condition = LogicalNode("AND", [_cond("age", ">", 20), _cond("student_id", "=", 7)])
+        result = self._cost(condition)
+        self.assertEqual(result["access_path"], "index-scan (b+, primary) on student_id")
+        # predikat age dicek pada tuple hasil index
+        self.assertEqual(result["io_cost"], 5)
+
+    def test_selection_over_join_unchanged(self):
+        join = QueryTree("JOIN", "THETA:students.student_id = enrollments.student_id",
+                         [QueryTree("TABLE", "students"), QueryTree("TABLE", "enrollments")])
+        result = self.planner.calculate_cost(QueryTree("SIGMA", _cond("student_id", "=", 5), [join]))
+        self.assertIsNone(result["access_path"])
+
+
+class TestEngineAccessPath(unittest.TestCase):
+
+    def test_access_path_recorded(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query("SELECT * FROM students WHERE students.student_id = 5;")
+        optimized = engine.optimize_query(parsed)
+        sigma = optimized.query_tree
+        while sigma.type != "SIGMA":
+            sigma = sigma.childs[0]
+        self.assertEqual(sigma.physical["access_path"], "index-scan (b+, primary) on student_id")
+        self.assertLess(engine.get_cost(optimized), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Test untuk branch-and-bound join ordering (bnb_join_order) dan pruning
+individu GA lewat FitnessCache.bound.
+"""
+
+import sys
+import os
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.cost_engine import CostEngine, PlannerCostModel
+from helper.join_graph import JoinGraph
+from helper.helper import build_join_tree, plan_cost, _tables_under
+from helper.join_order import (
+    PlanCostModel,
+    FitnessCache,
+    Deadline,
+    bnb_join_order,
+    dp_join_order,
+    greedy_join_order,
+)
+
+
+def _random_query(n, extra_edges, seed):
+    rng = random.Random(seed)
+    tables = [f"t{i}" for i in range(n)]
+    conds = {}
+    # spanning tree acak lalu tambah beberapa edge
+    for i in range(1, n):
+        j = rng.randrange(i)
+        conds[frozenset({tables[i], tables[j]})] = f"{tables[i]}.k = {tables[j]}.k"
+    for _ in range(extra_edges):
+        a, b = rng.sample(tables, 2)
+        conds[frozenset({a, b})] = f"{a}.x = {b}.x"
+    stats = {t: {"n_r": rng.randint(10, 5000), "b_r": rng.randint(1, 200)} for t in tables}
+    return tables, conds, stats
+
+
+def _random_query_with_indexes(n, extra_edges, seed):
+    tables, conds, stats = _random_query(n, extra_edges, seed)
+    rng = random.Random(seed)
+    for t in tables:
+        n_r = stats[t]["n_r"]
+        stats[t]["v_a_r"] = {"k": rng.randint(2, n_r), "x": rng.randint(2, 500)}
+        if rng.random() < 0.4:
+            stats[t]["indexes"] = {"k": {"type": rng.choice(["b+", "hash"]), "value": 3}}
+    return tables, conds, stats
+
+
+class TestBranchAndBound(unittest.TestCase):
+
+    def test_matches_dp(self):
+        for seed, n in [(1, 8), (2, 9), (3, 10), (4, 11)]:
+            tables, conds, stats = _random_query(n, n // 3, seed)
+            counters = {}
+            order, cost = bnb_join_order(tables, conds, stats, counters=counters)
+            _, dp_cost = dp_join_order(tables, conds, stats)
+            self.assertEqual(cost, dp_cost)
+            self.assertEqual(cost, plan_cost(build_join_tree(order, conds), stats))
+            self.assertTrue(counters["complete"])
+            print(f"\nB&B {n} tabel: {counters}")
+
+    def test_matches_dp_planner_model(self):
+        # dominance model planner tidak boleh membuang prefix dengan tabel
+        # paling kiri / v_a_r berbeda (predikat dan size join berikutnya)
+        for seed in range(60):
+            tables, conds, stats = _random_query_with_indexes(4 + seed % 4, seed % 3, seed)
+            engine = CostEngine(stats)
+            graph = JoinGraph(tables, conds)
+            _, expected = dp_join_order(tables, conds, stats, engine.search_model(graph), graph=graph)
+            _, cost = bnb_join_order(tables, conds, stats, engine.search_model(graph), graph=graph)
+            self.assertLessEqual(cost, expected * (1 + 1e-9), seed)
+
+    def test_dominated_prefix_never_extended(self):
+        # prefix yang didominasi prefix lain (himpunan tabel sama) yang sudah
+        # diperluas tidak boleh diperluas, walaupun ada prefix lain di antaranya
+        extended = []
+
+        class Spy(PlannerCostModel):
+            def join(self, left, right):
+                extended.append(left)
+                return super().join(left, right)
+
+        for seed in range(40):
+            tables, conds, stats = _random_query_with_indexes(6, 3, seed)
+            graph = JoinGraph(tables, conds)
+            model = Spy(CostEngine(stats).planner, graph)
+            # join dari incumbent greedy awal bukan perluasan B&B
+            greedy_join_order(tables, conds, stats, model, graph)
+            skip = len(extended)
+            bnb_join_order(tables, conds, stats, model, graph=graph)
+            expanded = {}
+            for state in extended[2 * skip:]:
+                earlier = expanded.setdefault(state[1], [])
+                if any(state is o for o in earlier):
+                    continue
+                self.assertFalse(any(model.dominates(o, state) for o in earlier), seed)
+                earlier.append(state)
+            del extended[:]
+
+    def test_lower_bound_is_admissible(self):
+        tables, conds, stats = _random_query(7, 2, 5)
+        model = PlanCostModel(stats)
+        rng = random.Random(0)
+        for _ in range(50):
+            order = tables[:]
+            rng.shuffle(order)
+            state = model.leaf(order[0])
+            total = plan_cost(build_join_tree(order, conds), stats)
+            for k in range(1, len(order)):
+                rest = [model.leaf(t) for t in order[k:]]
+                self.assertLessEqual(model.lower_bound(state, rest), total)
+                state = model.join(state, model.leaf(order[k]))
+
+    def test_expired_deadline_returns_incumbent(self):
+        tables, conds, stats = _random_query(10, 3, 6)
+        counters = {}
+        order, cost = bnb_join_order(tables, conds, stats, deadline=Deadline(0), counters=counters)
+        self.assertFalse(counters["complete"])
+        self.assertEqual(sorted(order), sorted(tables))
+        self.assertLessEqual(cost, greedy_join_order(tables, conds, stats)[1])
+
+    def test_heuristic_uses_bnb(self):
+        tables, conds, stats = _random_query(9, 2, 7)
+        engine = OptimizationEngine()
+        engine.cost_model = "simple"
+        engine.join_enumerator = "bnb"
+        plan, cost = engine._heuristic_optimize(tables, conds, stats)
+        self.assertEqual(cost, dp_join_order(tables, conds, stats)[1])
+        self.assertEqual(cost, plan_cost(plan, stats))
+        engine.join_enumerator = "exhaustive"
+        with self.assertRaises(ValueError):
+            engine._heuristic_optimize(tables, conds, stats)
+
+    def test_cache_bound_prunes(self):
+        cache = FitnessCache(PlanCostModel({"a": {"n_r": 10, "b_r": 1}}))
+        best = cache.cost(["a", "b", "c"])
+        cache.bound = best
+        self.assertEqual(cache.cost(["b", "c", "a"]), float('inf'))
+        self.assertEqual(cache.pruned, 1)
+        # yang sudah ada di cache tetap cost aslinya
+        self.assertEqual(cache.cost(["a", "b", "c"]), best)
+
+    def test_ga_prune(self):
+        tables, conds, stats = _random_query(12, 4, 8)
+        engine = OptimizationEngine()
+        engine.ga_prune = True
+        random.seed(3)
+        plan, cost = engine._genetic_algorithm_optimize(tables, conds, stats)
+        self.assertEqual(_tables_under(plan), set(tables))
+        self.assertEqual(cost, engine._cost_engine(stats).plan_cost(plan))
+        self.assertGreater(engine.last_ga_stats["pruned"], 0)
+        print(f"\nGA prune: {engine.last_ga_stats}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Test untuk bushy plan space: build_bushy_join_tree, DPccp (dp_bushy_join_order)
+dan encoding edge order untuk GA.
+"""
+
+import sys
+import os
+import random
+import unittest
+from functools import lru_cache
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import build_bushy_join_tree, plan_cost, _tables_under
+from helper.cost import CostPlanner
+from helper.join_order import (
+    PlanCostModel,
+    dp_join_order,
+    dp_bushy_join_order,
+    enumerate_ccp,
+    join_graph_edges,
+    decode_edge_order,
+    _neighbor_masks,
+)
+from helper.stats import get_stats
+
+
+# snowflake kecil: movies di tengah, dua dimensi dengan sub-dimensi
+TABLES = ["movies", "movie_actors", "actors", "movie_directors", "directors", "reviews"]
+CONDITIONS = {
+    frozenset({"movies", "movie_actors"}): "movies.movie_id = movie_actors.movie_id",
+    frozenset({"movie_actors", "actors"}): "movie_actors.actor_id = actors.actor_id",
+    frozenset({"movies", "movie_directors"}): "movies.movie_id = movie_directors.movie_id",
+    frozenset({"movie_directors", "directors"}): "movie_directors.director_id = directors.director_id",
+    frozenset({"movies", "reviews"}): "movies.movie_id = reviews.movie_id",
+}
+
+
+def _brute_force_bushy(tables, join_conditions, stats):
+    model = PlanCostModel(stats)
+
+    def connected(subset):
+        subset = set(subset)
+        seen = {next(iter(subset))}
+        frontier = list(seen)
+        while frontier:
+            t = frontier.pop()
+            for u in subset - seen:
+                if frozenset({t, u}) in join_conditions:
+                    seen.add(u)
+                    frontier.append(u)
+        return seen == subset
+
+    @lru_cache(maxsize=None)
+    def best(subset):
+        if len(subset) == 1:
+            return model.leaf(next(iter(subset)))
+        items = sorted(subset)
+        result = None
+        for mask in range(1, (1 << len(items)) - 1):
+            s1 = frozenset(t for i, t in enumerate(items) if mask >> i & 1)
+            s2 = subset - s1
+            if not connected(s1) or not connected(s2):
+                continue
+            if not any(frozenset({a, b}) in join_conditions for a in s1 for b in s2):
+                continue
+            state = model.join(best(s1), best(s2))
+            if result is None or state[0] < result[0]:
+                result = state
+        return result
+
+    return best(frozenset(tables))[0]
+
+
+class TestBushyJoin(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = get_stats()
+
+    def test_build_bushy_join_tree(self):
+        shape = (("movies", "reviews"), ("movie_actors", "actors"))
+        tree = build_bushy_join_tree(shape, CONDITIONS)
+        self.assertEqual(tree.type, "JOIN")
+        self.assertEqual(tree.childs[0].type, "JOIN")
+        self.assertEqual(tree.childs[1].type, "JOIN")
+        self.assertIn("movie_actors", tree.val)
+        self.assertEqual(_tables_under(tree), set(["movies", "reviews", "movie_actors", "actors"]))
+
+    def test_ccp_counts(self):
+        chain = {frozenset({f"t{i}", f"t{i+1}"}): "p" for i in range(3)}
+        tables = [f"t{i}" for i in range(4)]
+        # chain: (n^3 - n) / 6, clique: (3^n - 2^(n+1) + 1) / 2
+        self.assertEqual(len(enumerate_ccp(_neighbor_masks(tables, chain))), 10)
+        clique = [0b1110, 0b1101, 0b1011, 0b0111]
+        self.assertEqual(len(enumerate_ccp(clique)), 25)
+
+    def test_dp_bushy_is_optimal(self):
+        shape, cost = dp_bushy_join_order(TABLES, CONDITIONS, self.stats)
+        self.assertEqual(cost, plan_cost(build_bushy_join_tree(shape, CONDITIONS), self.stats))
+        self.assertEqual(cost, _brute_force_bushy(TABLES, CONDITIONS, self.stats))
+
+        _, left_deep_cost = dp_join_order(TABLES, CONDITIONS, self.stats)
+        self.assertLessEqual(cost, left_deep_cost)
+
+    def test_decode_edge_order(self):
+        edges = join_graph_edges(TABLES, CONDITIONS)
+        self.assertEqual(len(edges), 5)
+        random.seed(7)
+        random.shuffle(edges)
+        shape, cost = decode_edge_order(edges, TABLES, PlanCostModel(self.stats))
+        tree = build_bushy_join_tree(shape, CONDITIONS)
+        self.assertEqual(_tables_under(tree), set(TABLES))
+        self.assertEqual(cost, plan_cost(tree, self.stats))
+
+    def test_ga_bushy_encoding(self):
+        random.seed(1)
+        engine = OptimizationEngine()
+        engine.bushy_plans = True
+        plan, cost = engine._genetic_algorithm_optimize(TABLES, CONDITIONS, self.stats)
+        self.assertEqual(_tables_under(plan), set(TABLES))
+        self.assertEqual(cost, engine._cost_engine(self.stats).plan_cost(plan))
+
+    def test_cost_planner_handles_bushy_plan(self):
+        shape, _ = dp_bushy_join_order(TABLES, CONDITIONS, self.stats)
+        cost_info = CostPlanner().calculate_cost(build_bushy_join_tree(shape, CONDITIONS))
+        self.assertGreater(cost_info["cost"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
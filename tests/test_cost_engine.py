@@ -0,0 +1,138 @@
+"""
+Test untuk CostEngine: jalur inkremental (search_model) harus sama dengan cost
+plan lengkap (plan_cost), dan OptimizationEngine memakai model yang sama untuk
+join search dan get_cost.
+"""
+
+import sys
+import os
+import time
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from helper.cost import CostPlanner
+from helper.cost_engine import CostEngine, PlannerCostModel
+from helper.helper import build_join_tree, build_bushy_join_tree, plan_cost
+from helper.join_graph import JoinGraph
+from helper.join_order import dp_join_order
+from helper.stats import get_stats
+from tests.queries import star_query
+
+
+def _star_with_indexes(n, seed=0):
+    tables, conds, stats = star_query(n, seed)
+    rng = random.Random(seed)
+    for t in tables:
+        stats[t]["v_a_r"] = {"id": stats[t]["n_r"], "s": rng.randint(10, 500)}
+        if rng.random() < 0.5:
+            stats[t]["indexes"] = {"id": {"type": "hash", "value": 10}}
+    return tables, conds, stats
+
+
+def _left_deep(model, order):
+    state = model.leaf(order[0])
+    for t in order[1:]:
+        state = model.join(state, model.leaf(t))
+    return state
+
+
+class TestPlannerCostModel(unittest.TestCase):
+
+    def setUp(self):
+        self.tables, self.conds, self.stats = _star_with_indexes(8, seed=4)
+        self.graph = JoinGraph(self.tables, self.conds)
+        self.engine = CostEngine(self.stats)
+
+    def test_left_deep_matches_plan_cost(self):
+        model = self.engine.search_model(self.graph)
+        self.assertIsInstance(model, PlannerCostModel)
+        rng = random.Random(1)
+        for _ in range(20):
+            order = self.tables[:]
+            rng.shuffle(order)
+            tree = build_join_tree(order, self.conds, self.graph)
+            self.assertAlmostEqual(model.cost(_left_deep(model, order)), self.engine.plan_cost(tree))
+
+    def test_bushy_matches_plan_cost(self):
+        model = self.engine.search_model(self.graph, bushy=True)
+        t = self.tables
+        shape = ((t[0], (t[1], t[7])), ((t[2], t[3]), (t[4], (t[5], t[6]))))
+
+        def cost(part):
+            if isinstance(part, str):
+                return model.leaf(part)
+            return model.join(cost(part[0]), cost(part[1]))
+
+        tree = build_bushy_join_tree(shape, self.conds, self.graph)
+        self.assertAlmostEqual(model.cost(cost(shape)), self.engine.plan_cost(tree))
+
+    def test_join_cost_matches_join(self):
+        model = self.engine.search_model(self.graph)
+        left = _left_deep(model, self.tables[:4])
+        for t in self.tables[4:]:
+            right = model.leaf(t)
+            self.assertEqual(model.join_cost(left, right), model.cost(model.join(left, right)))
+
+    def test_dp_uses_planner_model(self):
+        order, cost = dp_join_order(self.tables, self.conds, self.stats, self.engine.search_model(self.graph),
+                                    graph=self.graph)
+        self.assertAlmostEqual(cost, self.engine.plan_cost(build_join_tree(order, self.conds, self.graph)))
+
+    def test_incremental_faster_than_rebuild(self):
+        model = self.engine.search_model(self.graph)
+        rng = random.Random(2)
+        orders = []
+        for _ in range(200):
+            order = self.tables[:]
+            rng.shuffle(order)
+            orders.append(order)
+
+        start = time.perf_counter()
+        for order in orders:
+            self.engine.plan_cost(build_join_tree(order, self.conds, self.graph))
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        for order in orders:
+            _left_deep(model, order)
+        incremental = time.perf_counter() - start
+        print(f"\n200 plan x 8 tabel: rebuild + calculate_cost {full * 1000:.1f}ms, inkremental {incremental * 1000:.1f}ms")
+        self.assertLess(incremental, full)
+
+
+class TestCostEngine(unittest.TestCase):
+
+    def test_unknown_model(self):
+        with self.assertRaises(ValueError):
+            CostEngine({}, "exact")
+
+    def test_planner_uses_given_stats(self):
+        planner = CostPlanner(stats={"t": {"n_r": 500, "b_r": 20, "v_a_r": {"id": 500}}})
+        info = planner.get_table_stats("t")
+        self.assertEqual((info["n_r"], info["b_r"], info["f_r"]), (500, 20, 25))
+        scan = planner.cost_table_scan(QueryTree("TABLE", "t"))
+        self.assertEqual((scan["io_cost"], scan["cost"]), (20, 20 + 500 * planner.cpu.tuple_cost))
+
+    def test_simple_model_is_plan_cost(self):
+        tables, conds, stats = star_query(5, seed=1)
+        engine = CostEngine(stats, "simple")
+        order, cost = dp_join_order(tables, conds, stats, engine.search_model(JoinGraph(tables, conds)))
+        self.assertEqual(cost, engine.plan_cost(build_join_tree(order, conds)))
+
+    def test_get_cost_matches_search(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query(
+            "SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id "
+            "JOIN directors d ON d.director_id = m.movie_id;"
+        )
+        optimized = engine.optimize_query(parsed)
+        self.assertEqual(engine.get_cost(optimized), int(engine.last_top_plans[0]["cost"]))
+
+        engine.cost_model = "simple"
+        self.assertEqual(engine.get_cost(optimized), plan_cost(optimized.query_tree, get_stats()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Test untuk komponen CPU di CostPlanner (helper.cpu_cost.CpuWeights): bobot
+per tuple dan per evaluasi predikat, io_cost / cpu_cost terpisah, dan
+rincian per operator di plan_query.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.parsed_query import ParsedQuery
+from model.query_tree import QueryTree, ConditionNode, LogicalNode, ColumnNode
+from helper.cost import CostPlanner
+from helper.cpu_cost import CpuWeights, cpu_weights, sort_comparisons
+
+
+STATS = {"emp": {"n_r": 10000, "b_r": 500, "v_a_r": {"id": 10000, "dept": 50, "age": 40}},
+         "dept": {"n_r": 50, "b_r": 2, "v_a_r": {"id": 50}}}
+
+
+def _cond(attr, op, value):
+    return ConditionNode(ColumnNode(attr), op, value)
+
+
+def _plan():
+    scan = QueryTree("TABLE", "emp")
+    sigma = QueryTree("SIGMA", LogicalNode("AND", [_cond("dept", "=", 3), _cond("age", ">", 30)]), [scan])
+    join = QueryTree("JOIN", "THETA:emp.dept = dept.id", [sigma, QueryTree("TABLE", "dept")])
+    return QueryTree("SORT", "id", [join])
+
+
+class TestCpuWeights(unittest.TestCase):
+
+    def test_config(self):
+        self.assertEqual(cpu_weights(), CpuWeights(0.01, 0.0025))
+        self.assertEqual(cpu_weights({"operator_cost": 0.5}).operator_cost, 0.5)
+        self.assertAlmostEqual(CpuWeights(0.1, 0.01).cost(10, 100), 2.0)
+        for bad in ({"tuple_cost": -1}, {"io_cost": 1}, 3):
+            with self.assertRaises(ValueError):
+                cpu_weights(bad)
+        self.assertEqual(sort_comparisons(1), 0)
+        self.assertEqual(sort_comparisons(8), 24)
+
+
+class TestPlannerCpuCost(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner(stats=STATS)
+
+    def test_scan_and_selection(self):
+        scan = self.planner.cost_table_scan(QueryTree("TABLE", "emp"))
+        self.assertEqual(scan["io_cost"], 500)
+        self.assertAlmostEqual(scan["cpu_cost"], 10000 * 0.01)
+        sigma = QueryTree("SIGMA", LogicalNode("AND", [_cond("dept", "=", 3), _cond("age", ">", 30)]))
+        result = self.planner.cost_selection(sigma, scan)
+        # selection tidak menambah I/O, CPU: tiap tuple + dua predikat per tuple
+        self.assertEqual(result["io_cost"], 500)
+        self.assertAlmostEqual(result["cpu_cost"] - scan["cpu_cost"], 10000 * 0.01 + 2 * 10000 * 0.0025)
+        self.assertAlmostEqual(result["cost"], result["io_cost"] + result["cpu_cost"])
+
+    def test_io_only_weights_keep_block_costs(self):
+        io_only = CostPlanner(stats=STATS, cpu=CpuWeights(0, 0)).calculate_cost(_plan())
+        full = self.planner.calculate_cost(_plan())
+        self.assertEqual(io_only["cpu_cost"], 0)
+        self.assertEqual(io_only["cost"], io_only["io_cost"])
+        self.assertEqual(full["io_cost"], io_only["io_cost"])
+        self.assertGreater(full["cost"], io_only["cost"])
+
+    def test_in_memory_sort_is_not_free(self):
+        # input muat di buffer: I/O sort = b_r, CPU n log n tetap dihitung
+        scan = self.planner.cost_table_scan(QueryTree("TABLE", "dept"))
+        result = self.planner.cost_sort(QueryTree("SORT", "name"), scan)
+        self.assertEqual(result["sort_cost"], 2)
+        self.assertAlmostEqual(result["cpu_cost"] - scan["cpu_cost"], 50 * 0.01 + sort_comparisons(50) * 0.0025)
+
+    def test_plan_query_reports_io_and_cpu(self):
+        plan = self.planner.plan_query(ParsedQuery("q", _plan()))
+        self.assertAlmostEqual(plan["total_cost"], plan["io_cost"] + plan["cpu_cost"])
+        operations = [op["operation"] for op in plan["operators"]]
+        self.assertEqual(operations, ["TABLE_SCAN", "SELECTION", "TABLE_SCAN", "JOIN", "SORT"])
+        self.assertAlmostEqual(sum(op["io_cost"] for op in plan["operators"]), plan["io_cost"])
+        self.assertAlmostEqual(sum(op["cpu_cost"] for op in plan["operators"]), plan["cpu_cost"])
+        self.assertEqual(plan["operators"][1]["io_cost"], 0)
+        self.assertGreater(plan["operators"][1]["cpu_cost"], 0)
+
+
+class TestEngineCpuWeights(unittest.TestCase):
+
+    QUERY = "SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id;"
+
+    def test_weights_reach_planner(self):
+        engine = OptimizationEngine()
+        parsed = engine.optimize_query(engine.parse_query(self.QUERY))
+        with_cpu = engine.get_cost(parsed)
+        engine.cpu_weights = CpuWeights(0, 0)
+        self.assertIs(engine._cost_engine({}).planner.cpu, engine.cpu_weights)
+        self.assertLess(engine.get_cost(parsed), with_cpu)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test untuk operator GA yang menjaga konektivitas join graph
+(ga_connected_operators): seeding, repair setelah crossover dan mutasi.
+"""
+
+import sys
+import os
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import plan_cost, _tables_under
+from helper.join_graph import JoinGraph
+from helper.join_order import dp_join_order
+from tests.queries import star_query
+
+
+def _connected(order, graph):
+    mask = 1 << graph.index[order[0]]
+    for t in order[1:]:
+        if not graph.joins(mask, graph.index[t]):
+            return False
+        mask |= 1 << graph.index[t]
+    return True
+
+
+def _count_cartesian(node):
+    if node.type != "JOIN":
+        return 0
+    return (node.val == "CARTESIAN") + _count_cartesian(node.childs[0]) + _count_cartesian(node.childs[1])
+
+
+class TestConnectedGAOperators(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OptimizationEngine()
+        self.tables, self.conds, self.stats = star_query(12)
+        self.graph = JoinGraph(self.tables, self.conds)
+
+    def test_population_stays_connected(self):
+        rng = random.Random(1)
+        population = self.engine._ga_initialize_population(self.tables, rng, self.graph)
+        self.assertEqual(len(population), self.engine.ga_population_size)
+        for _ in range(10):
+            self.assertTrue(all(_connected(ind, self.graph) for ind in population))
+            self.assertTrue(all(sorted(ind) == sorted(self.tables) for ind in population))
+            scores = [(ind, rng.random()) for ind in population]
+            scores.sort(key=lambda x: x[1])
+            population = self.engine._ga_next_generation(scores, rng, 1.0, 1.0, self.graph)
+
+    def test_repair_keeps_relative_order(self):
+        graph = JoinGraph(["a", "b", "c", "d"], {
+            frozenset({"a", "b"}): "p", frozenset({"b", "c"}): "p", frozenset({"c", "d"}): "p",
+        })
+        self.assertEqual(self.engine._ga_repair(["a", "c", "d", "b"], graph), ["a", "b", "c", "d"])
+        self.assertEqual(self.engine._ga_repair(["c", "a", "d", "b"], graph), ["c", "d", "b", "a"])
+
+    def test_short_chain_population(self):
+        # chain 3 tabel hanya punya 4 urutan terhubung
+        tables = ["a", "b", "c"]
+        graph = JoinGraph(tables, {frozenset({"a", "b"}): "p", frozenset({"b", "c"}): "p"})
+        population = self.engine._ga_initialize_population(tables, random.Random(0), graph)
+        self.assertEqual(len(population), self.engine.ga_population_size)
+        self.assertEqual({tuple(p) for p in population},
+                         {("a", "b", "c"), ("b", "a", "c"), ("b", "c", "a"), ("c", "b", "a")})
+
+    def test_disconnected_graph_falls_back_to_cartesian(self):
+        tables = ["a", "b", "c", "d"]
+        conds = {frozenset({"a", "b"}): "a.x = b.x", frozenset({"c", "d"}): "c.y = d.y"}
+        random.seed(2)
+        plan, cost = self.engine._genetic_algorithm_optimize(tables, conds, {})
+        self.assertEqual(_tables_under(plan), set(tables))
+        self.assertEqual(_count_cartesian(plan), 1)
+
+    def test_converges_without_cartesian(self):
+        # plan_cost tidak menghukum cartesian, jadi pembanding yang adil adalah
+        # optimum DP di ruang tanpa cartesian
+        optimum = dp_join_order(self.tables, self.conds, self.stats)[1]
+        self.engine.cost_model = "simple"
+        self.engine.ga_generations = 15
+        ratios = []
+        for seed in range(5):
+            random.seed(seed)
+            plan, cost = self.engine._genetic_algorithm_optimize(self.tables, self.conds, self.stats)
+            self.assertEqual(cost, plan_cost(plan, self.stats))
+            self.assertEqual(_count_cartesian(plan), 0)
+            ratios.append(cost / optimum)
+        print(f"\nGA 15 generasi / optimum: {[round(r, 3) for r in ratios]}")
+        self.assertLess(max(ratios), 1.1)
+
+        self.engine.ga_connected_operators = False
+        random.seed(0)
+        plan, _ = self.engine._genetic_algorithm_optimize(self.tables, self.conds, self.stats)
+        self.assertGreater(_count_cartesian(plan), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
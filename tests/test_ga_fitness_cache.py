@@ -0,0 +1,67 @@
+"""
+Test untuk FitnessCache di genetic algorithm join ordering.
+"""
+
+import sys
+import os
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import build_join_tree, plan_cost, _tables_under
+from helper.join_order import PlanCostModel, FitnessCache
+from helper.stats import get_stats
+from tests.queries import chain_query
+
+
+class TestFitnessCache(unittest.TestCase):
+
+    def test_cost_matches_plan_cost(self):
+        stats = get_stats()
+        tables = ["movies", "reviews", "awards", "movie_actors", "actors"]
+        cache = FitnessCache(PlanCostModel(stats))
+        rng = random.Random(3)
+        for _ in range(30):
+            order = tables[:]
+            rng.shuffle(order)
+            self.assertEqual(cache.cost(order), plan_cost(build_join_tree(order), stats))
+
+    def test_hits_and_prefix_sharing(self):
+        cache = FitnessCache(PlanCostModel({}))
+        cache.cost(["a", "b", "c", "d"])
+        cache.cost(["a", "b", "c", "d"])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.join_evals, 3)
+
+        # prefix (a, b) dipakai ulang, hanya 2 join baru
+        cache.cost(["a", "b", "d", "c"])
+        self.assertEqual(cache.prefix_hits, 1)
+        self.assertEqual(cache.join_evals, 5)
+
+    def test_ga_reports_cache_stats(self):
+        tables, conds, stats = chain_query(10)
+        engine = OptimizationEngine()
+        random.seed(11)
+        plan, cost = engine._genetic_algorithm_optimize(tables, conds, stats)
+
+        self.assertEqual(_tables_under(plan), set(tables))
+        self.assertEqual(cost, engine._cost_engine(stats).plan_cost(plan))
+        counters = engine.last_ga_stats
+        self.assertGreater(counters["hits"], 0)
+        self.assertGreater(counters["prefix_hits"], 0)
+        print(f"\nGA 10 tabel: {counters}")
+
+    def test_ga_deterministic_for_seed(self):
+        tables, conds, stats = chain_query(8)
+        engine = OptimizationEngine()
+        random.seed(5)
+        _, cost1 = engine._genetic_algorithm_optimize(tables, conds, stats)
+        random.seed(5)
+        _, cost2 = engine._genetic_algorithm_optimize(tables, conds, stats)
+        self.assertEqual(cost1, cost2)
+
+
+if __name__ == "__main__":
+    unittest.main()
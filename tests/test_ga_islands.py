@@ -0,0 +1,110 @@
+"""
+Test untuk island model GA (ga_islands / ga_migration_interval / ga_migration_size).
+"""
+
+import sys
+import os
+import random
+import time
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import plan_cost, _tables_under
+from helper.join_order import Deadline
+
+
+def _cycle_query(n):
+    tables = [f"t{i}" for i in range(n)]
+    conds = {frozenset({f"t{i}", f"t{(i + 1) % n}"}): f"t{i}.id = t{(i + 1) % n}.id" for i in range(n)}
+    stats = {t: {"n_r": 40 * (i % 4 + 2) ** 3, "b_r": 4 * (i + 1)} for i, t in enumerate(tables)}
+    return tables, conds, stats
+
+
+def _run(workers, islands=4, seed=9, top_k=1):
+    tables, conds, stats = _cycle_query(10)
+    engine = OptimizationEngine()
+    engine.ga_islands = islands
+    engine.ga_workers = workers
+    engine.plan_top_k = top_k
+    random.seed(seed)
+    plan, cost = engine._genetic_algorithm_optimize(tables, conds, stats)
+    return engine, plan, cost, (tables, stats)
+
+
+class TestGAIslands(unittest.TestCase):
+
+    def test_plan_is_valid(self):
+        engine, plan, cost, (tables, stats) = _run(0)
+        self.assertEqual(_tables_under(plan), set(tables))
+        self.assertEqual(cost, engine._cost_engine(stats).plan_cost(plan))
+        self.assertEqual(engine.last_ga_stats["islands"], 4)
+        self.assertEqual(
+            engine.last_ga_stats["epochs"],
+            -(-engine.ga_generations // engine.ga_migration_interval)
+        )
+        print(f"\nGA 4 island: cost={cost}, {engine.last_ga_stats}")
+
+    def test_process_islands_match_serial(self):
+        _, plan1, cost1, _ = _run(0)
+        _, plan2, cost2, _ = _run(2)
+        self.assertEqual(cost1, cost2)
+        self.assertEqual(_tables_under(plan1), _tables_under(plan2))
+
+    def test_stats_and_top_k_in_both_modes(self):
+        results = []
+        for workers in (0, 2):
+            engine, plan, cost, (tables, stats) = _run(workers, top_k=3)
+            ga_stats = engine.last_ga_stats
+            self.assertGreater(ga_stats["misses"], 0)
+            self.assertGreater(ga_stats["hits"] + ga_stats["misses"], engine.ga_population_size)
+            plans = engine.last_top_plans
+            self.assertEqual(len(plans), 3)
+            costs = [p["cost"] for p in plans]
+            self.assertEqual(costs, sorted(costs))
+            self.assertEqual(costs[0], cost)
+            for p in plans:
+                self.assertEqual(p["cost"], engine._cost_engine(stats).plan_cost(p["plan"]))
+            results.append(costs)
+        self.assertEqual(results[0], results[1])
+
+    def test_budget_checked_inside_epoch(self):
+        # satu epoch panjang: deadline harus dicek per generasi, bukan per epoch
+        tables, conds, stats = _cycle_query(10)
+        for workers in (0, 2):
+            engine = OptimizationEngine()
+            engine.ga_islands = 2
+            engine.ga_workers = workers
+            engine.ga_generations = engine.ga_migration_interval = 100000
+            random.seed(3)
+            start = time.perf_counter()
+            plan, cost = engine._genetic_algorithm_optimize(tables, conds, stats, Deadline(50))
+            elapsed = time.perf_counter() - start
+            self.assertLess(elapsed, 2.0, workers)
+            self.assertEqual(_tables_under(plan), set(tables))
+            self.assertEqual(engine.last_ga_stats["epochs"], 1)
+
+    def test_island_rates_spread(self):
+        engine = OptimizationEngine()
+        rates = [engine._ga_island_rates(i, 3) for i in range(3)]
+        mutation = [m for m, _ in rates]
+        crossover = [c for _, c in rates]
+        self.assertEqual(mutation, sorted(mutation))
+        self.assertEqual(crossover, sorted(crossover, reverse=True))
+        self.assertTrue(all(0 <= r <= 1 for r in mutation + crossover))
+
+    def test_migration_replaces_worst(self):
+        engine = OptimizationEngine()
+        engine.ga_population_size = 4
+        engine.ga_migration_size = 1
+        islands = [
+            {"population": [["a", "b"], ["b", "a"], ["a", "b"], ["x", "y"]]},
+            {"population": [["c", "d"], ["d", "c"], ["c", "d"], ["z", "w"]]},
+        ]
+        engine._ga_migrate(islands)
+        self.assertEqual(islands[0]["population"][-1], ["c", "d"])
+        self.assertEqual(islands[1]["population"][-1], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
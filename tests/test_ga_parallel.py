@@ -0,0 +1,72 @@
+"""
+Test untuk evaluasi fitness GA paralel (ga_workers / ga_executor).
+Hasil harus identik dengan mode serial untuk seed yang sama.
+"""
+
+import sys
+import os
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import _tables_under
+from helper.join_order import PlanCostModel, FitnessEvaluator
+from tests.queries import star_query
+
+
+def _run(executor, workers, bushy=False, seed=21):
+    tables, conds, stats = star_query(9)
+    engine = OptimizationEngine()
+    engine.ga_executor = executor
+    engine.ga_workers = workers
+    engine.bushy_plans = bushy
+    random.seed(seed)
+    plan, cost = engine._genetic_algorithm_optimize(tables, conds, stats)
+    counters = engine.last_ga_stats
+    # prefix_hits/join_evals worker tidak dikirim balik, cukup hits/misses
+    return repr_tree(plan), cost, counters["hits"], counters["misses"]
+
+
+def repr_tree(node):
+    if node.type == "TABLE":
+        return node.val
+    return (repr_tree(node.childs[0]), repr_tree(node.childs[1]))
+
+
+class TestParallelFitness(unittest.TestCase):
+
+    def test_process_pool_matches_serial(self):
+        serial = _run("process", 0)
+        parallel = _run("process", 3)
+        self.assertEqual(serial, parallel)
+
+    def test_thread_pool_matches_serial(self):
+        serial = _run("thread", 0)
+        parallel = _run("thread", 4)
+        self.assertEqual(serial, parallel)
+
+    def test_bushy_process_pool_matches_serial(self):
+        serial = _run("process", 0, bushy=True)
+        parallel = _run("process", 2, bushy=True)
+        self.assertEqual(serial, parallel)
+
+    def test_compact_encoding(self):
+        tables, _, stats = star_query(5)
+        evaluator = FitnessEvaluator(tables, tables, PlanCostModel(stats))
+        index = {t: i for i, t in enumerate(tables)}
+        code = evaluator.encode(["t3", "t0", "t1", "t2", "t4"], index)
+        self.assertEqual(code, bytes([3, 0, 1, 2, 4]))
+        self.assertEqual(len(evaluator.evaluate([code])), 1)
+
+    def test_unknown_executor(self):
+        engine = OptimizationEngine()
+        engine.ga_workers = 2
+        engine.ga_executor = "gpu"
+        tables, conds, stats = star_query(5)
+        with self.assertRaises(ValueError):
+            engine._genetic_algorithm_optimize(tables, conds, stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
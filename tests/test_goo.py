@@ -0,0 +1,116 @@
+"""
+Test untuk Greedy Operator Ordering (goo_join_order) pada query sangat besar.
+"""
+
+import sys
+import os
+import time
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from model.parsed_query import ParsedQuery
+from helper.helper import build_bushy_join_tree, plan_cost, _tables_under
+from helper.join_order import goo_join_order, shape_cost, PlanCostModel
+from helper.stats import get_stats
+from helper.cost import CostPlanner
+
+
+def _eager_loading_query(n, seed=0):
+    # pola ORM eager-loading: root dengan banyak relasi, sebagian bersarang
+    rng = random.Random(seed)
+    tables = [f"t{i}" for i in range(n)]
+    conds = {}
+    for i in range(1, n):
+        parent = 0 if i < n // 3 else rng.randrange(1, i)
+        conds[frozenset({tables[parent], tables[i]})] = f"{tables[parent]}.id = {tables[i]}.parent_id"
+    return tables, conds
+
+
+class TestGOO(unittest.TestCase):
+
+    def test_large_query_is_fast_and_deterministic(self):
+        tables, conds = _eager_loading_query(80)
+        stats = get_stats()
+        start = time.perf_counter()
+        shape, cost = goo_join_order(tables, conds, stats)
+        elapsed = time.perf_counter() - start
+        tree = build_bushy_join_tree(shape, conds)
+        self.assertEqual(_tables_under(tree), set(tables))
+        self.assertEqual(cost, plan_cost(tree, stats))
+        self.assertEqual(goo_join_order(tables, conds, stats), (shape, cost))
+        self.assertLess(elapsed, 5.0)
+        print(f"\nGOO 80 tabel: {elapsed * 1000:.1f}ms")
+
+    def test_smallest_result_merged_first(self):
+        tables = ["students", "enrollments", "courses", "departments"]
+        conds = {
+            frozenset({"students", "enrollments"}): "students.student_id = enrollments.student_id",
+            frozenset({"enrollments", "courses"}): "enrollments.course_id = courses.course_id",
+            frozenset({"courses", "departments"}): "courses.dept_id = departments.dept_id",
+        }
+        planner = CostPlanner()
+        scans = {t: planner.cost_table_scan(QueryTree("TABLE", t)) for t in tables}
+        estimates = {
+            key: planner.cost_join(QueryTree("JOIN", f"THETA:{conds[key]}"), *[scans[t] for t in key])["n_r"]
+            for key in conds
+        }
+        first = min(estimates, key=estimates.get)
+
+        shape, _ = goo_join_order(tables, conds, {})
+        # pasangan yang digabung pertama muncul sebagai join dua tabel dasar
+        self.assertIn(first, _base_pairs(shape))
+
+    def test_predicate_decides_merge_order(self):
+        # cartesian b x c (40000) lebih kecil dari a x b, tapi a.id key: a join b = 1000
+        stats = {
+            "a": {"n_r": 1000, "b_r": 50, "v_a_r": {"id": 1000}},
+            "b": {"n_r": 1000, "b_r": 50, "v_a_r": {"a_id": 1000, "y": 1}},
+            "c": {"n_r": 40, "b_r": 2, "v_a_r": {"y": 1}},
+        }
+        conds = {frozenset({"a", "b"}): "a.id = b.a_id", frozenset({"b", "c"}): "b.y = c.y"}
+        shape, _ = goo_join_order(["a", "b", "c"], conds, stats, PlanCostModel(stats), CostPlanner(stats=stats))
+        self.assertEqual(_base_pairs(shape), [frozenset({"a", "b"})])
+
+    def test_disconnected_uses_cartesian_last(self):
+        tables = ["a", "b", "c", "d"]
+        conds = {frozenset({"a", "b"}): "a.x = b.x", frozenset({"c", "d"}): "c.y = d.y"}
+        shape, cost = goo_join_order(tables, conds, {})
+        self.assertEqual({frozenset(_leaves(shape[0])), frozenset(_leaves(shape[1]))},
+                         {frozenset("ab"), frozenset("cd")})
+        self.assertEqual(cost, shape_cost(shape, PlanCostModel({}))[0])
+
+    def test_engine_uses_goo_above_threshold(self):
+        engine = OptimizationEngine()
+        engine.goo_threshold_tables = 6
+        names = [f"T{i}" for i in range(8)]
+        node = QueryTree("TABLE", val=names[0])
+        for name in names[1:]:
+            node = QueryTree("JOIN", childs=[node, QueryTree("TABLE", val=name)])
+        root = QueryTree("SELECT", val="dummy")
+        root.add_child(node)
+        out = engine.optimize_query(ParsedQuery("SELECT * FROM " + ", ".join(names), root))
+        self.assertEqual(_tables_under(out.query_tree), set(names))
+        self.assertEqual(engine.last_strategy, "goo")
+        # GA tidak jalan
+        self.assertEqual(engine.last_ga_stats, {})
+
+
+def _base_pairs(shape):
+    if isinstance(shape, str):
+        return []
+    if isinstance(shape[0], str) and isinstance(shape[1], str):
+        return [frozenset(shape)]
+    return _base_pairs(shape[0]) + _base_pairs(shape[1])
+
+
+def _leaves(shape):
+    if isinstance(shape, str):
+        return [shape]
+    return _leaves(shape[0]) + _leaves(shape[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Test untuk histogram equi-depth dan MCV list (helper.histogram) serta
+estimasi selectivity range / equality di CostPlanner.
+"""
+
+import sys
+import os
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree, ConditionNode, LogicalNode, ColumnNode
+from helper.cost import CostPlanner
+from helper.histogram import EquiDepthHistogram, MostCommonValues, as_histogram, as_mcv
+from helper.stats import get_stats
+
+
+def _cond(attr, op, value):
+    return ConditionNode(ColumnNode(attr), op, value)
+
+
+class TestEquiDepthHistogram(unittest.TestCase):
+
+    def test_interpolation(self):
+        h = EquiDepthHistogram([0, 10, 20, 40])
+        self.assertEqual(h.buckets, 3)
+        self.assertEqual(h.bounds.typecode, "d")
+        self.assertAlmostEqual(h.fraction_below(5), 1 / 6)
+        self.assertAlmostEqual(h.fraction_below(30), 2.5 / 3)
+        self.assertEqual(h.fraction_below(-1), 0.0)
+        self.assertEqual(h.fraction_below(50), 1.0)
+        self.assertAlmostEqual(h.selectivity(">", 30), 0.5 / 3)
+        self.assertAlmostEqual(h.selectivity("BETWEEN", (5, 15)), 1 / 3)
+
+    def test_from_values_close_to_data(self):
+        rng = random.Random(0)
+        values = [rng.expovariate(1 / 1000) for _ in range(5000)]
+        h = EquiDepthHistogram.from_values(values, 20)
+        for cut in (100, 500, 2000, 5000):
+            actual = sum(v < cut for v in values) / len(values)
+            # error equi-depth paling besar satu bucket
+            self.assertAlmostEqual(h.selectivity("<", cut), actual, delta=1 / h.buckets)
+
+    def test_frequent_value(self):
+        # nilai 7 memenuhi dua bucket penuh
+        h = EquiDepthHistogram([1, 7, 7, 7, 10])
+        self.assertAlmostEqual(h.selectivity("<=", 7), 0.75)
+        self.assertAlmostEqual(h.selectivity("<", 7), 0.25)
+
+    def test_dates_and_invalid(self):
+        h = EquiDepthHistogram(["2024-01-01", "2024-07-01", "2025-01-01"])
+        self.assertAlmostEqual(h.selectivity(">=", "'2024-07-01'"), 0.5)
+        self.assertIsNone(as_histogram([5]))
+        self.assertIsNone(as_histogram([3, 1]))
+        self.assertIsNone(as_histogram(["a", "b"]))
+
+
+class TestRangeSelectivity(unittest.TestCase):
+
+    def setUp(self):
+        stats = {"emp": {"n_r": 10000, "b_r": 500, "v_a_r": {"salary": 800},
+                         "histograms": {"salary": [1000, 2000, 2500, 3000, 4000, 20000]}}}
+        self.planner = CostPlanner(stats=stats)
+        self.scan = self.planner.cost_table_scan(QueryTree("TABLE", "emp"))
+        self.histograms = self.scan["histograms"]
+
+    def test_without_histogram_falls_back(self):
+        self.assertEqual(self.planner.estimate_selectivity(_cond("salary", ">", 3000), {"salary": 800}), 0.5)
+        self.assertEqual(self.planner.estimate_selectivity(_cond("age", ">", 3000), {}, self.histograms), 0.5)
+        # pembanding kolom lain, bukan literal
+        self.assertEqual(self.planner.estimate_selectivity(_cond("salary", ">", ColumnNode("bonus")), {},
+                                                           self.histograms), 0.5)
+
+    def test_range_and_between(self):
+        self.assertAlmostEqual(self.planner.estimate_selectivity(_cond("salary", ">", 4000), {}, self.histograms), 0.2)
+        self.assertAlmostEqual(self.planner.estimate_selectivity(_cond("salary", "<", 1500), {}, self.histograms), 0.1)
+        self.assertAlmostEqual(self.planner.estimate_selectivity(_cond("salary", "BETWEEN", (2000, 3000)), {},
+                                                                 self.histograms), 0.4)
+
+    def test_and_on_same_column_is_one_range(self):
+        both = LogicalNode("AND", [_cond("salary", ">=", 2000), _cond("salary", "<", 3000),
+                                   _cond("salary", "<", 4000)])
+        self.assertAlmostEqual(self.planner._calculate_logical_node_selectivity(both, {}, self.histograms), 0.4)
+
+    def test_table_selectivity(self):
+        both = LogicalNode("AND", [_cond("salary", ">=", 2000), _cond("salary", "<", 3000)])
+        self.assertAlmostEqual(self.planner.selectivity(both, "emp"), 0.4)
+        self.assertAlmostEqual(self.planner.selectivity(_cond("salary", ">", 4000), "emp"), 0.2)
+        self.assertEqual(self.planner.selectivity("salary > 4000", "emp"), 1.0)
+
+    def test_selection_uses_histogram(self):
+        sigma = QueryTree("SIGMA", _cond("salary", ">", 4000))
+        result = self.planner.cost_selection(sigma, self.scan)
+        self.assertAlmostEqual(result["n_r"], 2000, delta=1)
+        self.assertIs(result["histograms"], self.histograms)
+
+
+class TestMostCommonValues(unittest.TestCase):
+
+    def setUp(self):
+        stats = {"orders": {"n_r": 100000, "b_r": 2000, "v_a_r": {"status": 10},
+                            "mcv": {"status": {"'shipped'": 0.7, "pending": 0.2}}}}
+        self.planner = CostPlanner(stats=stats)
+        self.scan = self.planner.cost_table_scan(QueryTree("TABLE", "orders"))
+        self.v_a_r, self.mcv = self.scan["v_a_r"], self.scan["mcv"]
+
+    def _sel(self, cond):
+        return self.planner.estimate_selectivity(cond, self.v_a_r, {}, self.mcv)
+
+    def test_mcv_list(self):
+        mcv = MostCommonValues({"a": 0.5, 3: 0.25})
+        self.assertEqual(mcv.equality("'a'", 10), 0.5)
+        self.assertEqual(mcv.equality(3.0, 10), 0.25)
+        self.assertAlmostEqual(mcv.equality("b", 10), 0.25 / 8)
+        self.assertEqual(mcv.equality("b", 2), 0.0)
+        self.assertIsNone(as_mcv({"a": 0.8, "b": 0.5}))
+        self.assertIsNone(as_mcv([0.1]))
+
+    def test_equality_and_inequality(self):
+        self.assertAlmostEqual(self._sel(_cond("status", "=", "shipped")), 0.7)
+        self.assertAlmostEqual(self._sel(_cond("status", "=", "returned")), 0.1 / 8)
+        self.assertAlmostEqual(self._sel(_cond("status", "<>", "shipped")), 0.3)
+        # tanpa MCV tetap 1/V(A,r)
+        self.assertEqual(self.planner.estimate_selectivity(_cond("status", "=", "shipped"), self.v_a_r), 0.1)
+
+    def test_in_list(self):
+        self.assertAlmostEqual(self._sel(_cond("status", "IN", ["shipped", "pending", "lost"])), 0.9 + 0.1 / 8)
+        self.assertAlmostEqual(self.planner.estimate_selectivity(_cond("status", "IN", ["a", "b"]), self.v_a_r), 0.2)
+
+    def test_or_and_selection(self):
+        either = LogicalNode("OR", [_cond("status", "=", "shipped"), _cond("status", "=", "pending")])
+        self.assertAlmostEqual(self.planner._calculate_logical_node_selectivity(either, self.v_a_r, {}, self.mcv),
+                               1 - 0.3 * 0.8)
+        result = self.planner.cost_selection(QueryTree("SIGMA", _cond("status", "=", "pending")), self.scan)
+        self.assertAlmostEqual(result["n_r"], 20000, delta=1)
+
+
+class TestEngineHistograms(unittest.TestCase):
+
+    def test_filter_selectivity(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query(
+            "SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id WHERE r.rating > 7;"
+        )
+        selectivity = engine._filter_selectivity(parsed.query_tree, get_stats())
+        self.assertAlmostEqual(selectivity["reviews"], 0.6)
+
+    def test_filter_selectivity_mcv(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query(
+            "SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id WHERE m.genre = 'Drama';"
+        )
+        self.assertAlmostEqual(engine._filter_selectivity(parsed.query_tree, get_stats())["movies"], 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
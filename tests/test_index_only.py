@@ -0,0 +1,130 @@
+"""
+Test untuk index-only (covering) scan: kolom yang dibutuhkan scan dihitung dari
+PROJECT / predikat di atasnya (CostPlanner.required_columns), dan index b+ atau
+hash yang mencakup semua kolom itu tidak membaca heap sama sekali.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree, ConditionNode, ColumnNode
+from helper.cost import CostPlanner
+
+
+def _cond(attr, op, value):
+    return ConditionNode(ColumnNode(attr), op, value)
+
+
+def _project(columns, child):
+    return QueryTree("PROJECT", [ColumnNode(c) for c in columns], [child])
+
+
+def _trace(planner, node):
+    trace = []
+    planner.calculate_cost(node, trace)
+    return {n.type: info for n, info in trace}
+
+
+class TestRequiredColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner()
+
+    def test_project_and_predicates(self):
+        sigma = QueryTree("SIGMA", _cond("age", ">", 20), [QueryTree("TABLE", "students")])
+        project = _project(["name"], sigma)
+        self.assertEqual(self.planner.required_columns(project, None), {"name"})
+        self.assertEqual(self.planner.required_columns(sigma, {"name"}), {"name", "age"})
+        # tanpa PROJECT (SELECT *) semua kolom dibutuhkan
+        self.assertIsNone(self.planner.required_columns(sigma, None))
+
+    def test_join_and_aggregate_columns(self):
+        join = QueryTree("JOIN", "THETA:students.student_id = enrollments.student_id",
+                         [QueryTree("TABLE", "students"), QueryTree("TABLE", "enrollments")])
+        self.assertEqual(self.planner.required_columns(join, {"name"}), {"name", "student_id"})
+        count = QueryTree("PROJECT", [ColumnNode("rating)", "COUNT(r")], [join])
+        self.assertEqual(self.planner.required_columns(count, None), {"rating"})
+        star = QueryTree("PROJECT", [ColumnNode("*")], [join])
+        self.assertIsNone(self.planner.required_columns(star, None))
+
+
+class TestIndexOnlyScan(unittest.TestCase):
+
+    def setUp(self):
+        # dummy stats: students.student_id b+ primary (depth 4), l_r 200, 5 kolom
+        self.planner = CostPlanner()
+
+    def test_covering_lookup_skips_heap(self):
+        sigma = QueryTree("SIGMA", _cond("student_id", "=", 5), [QueryTree("TABLE", "students")])
+        costs = _trace(self.planner, _project(["student_id"], sigma))
+        self.assertEqual(costs["SIGMA"]["access_path"], "index-only scan (b+) on student_id")
+        # hanya turun index (h), tanpa block heap
+        self.assertEqual(costs["PROJECT"]["io_cost"], 4)
+
+    def test_full_index_only_scan(self):
+        costs = _trace(self.planner, _project(["student_id"], QueryTree("TABLE", "students")))
+        scan = costs["TABLE"]
+        self.assertEqual(scan["access_path"], "index-only scan (b+) on student_id")
+        # entry = 200 / 5 + 8 byte pointer, 4096 // 48 = 85 entry per leaf
+        self.assertEqual(scan["io_cost"], 118)
+        self.assertEqual(scan["order"], "student_id")
+
+    def test_non_covering_reads_heap(self):
+        costs = _trace(self.planner, _project(["student_id", "age"], QueryTree("TABLE", "students")))
+        self.assertEqual((costs["TABLE"]["access_path"], costs["TABLE"]["io_cost"]), ("table-scan", 500))
+        sigma = QueryTree("SIGMA", _cond("student_id", "=", 5), [QueryTree("TABLE", "students")])
+        costs = _trace(self.planner, _project(["name"], sigma))
+        self.assertEqual(costs["SIGMA"]["access_path"], "index-scan (b+, primary) on student_id")
+        self.assertEqual(costs["SIGMA"]["io_cost"], 4 + 1)
+
+    def test_unknown_column_not_covered(self):
+        # email tidak ada di stats students: index student_id tidak bisa mencakupnya
+        costs = _trace(self.planner, _project(["email"], QueryTree("TABLE", "students")))
+        self.assertEqual((costs["TABLE"]["access_path"], costs["TABLE"]["io_cost"]), ("table-scan", 500))
+        sigma = QueryTree("SIGMA", _cond("student_id", ">", 5), [QueryTree("TABLE", "students")])
+        costs = _trace(self.planner, _project(["email"], sigma))
+        self.assertNotIn("index-only", costs["SIGMA"]["access_path"])
+        engine = OptimizationEngine()
+        optimized = engine.optimize_query(engine.parse_query(
+            "SELECT students.email FROM students WHERE students.student_id > 5;"))
+        node = optimized.query_tree
+        while node.type != "SIGMA":
+            node = node.childs[0]
+        self.assertNotIn("index-only", node.physical["access_path"])
+
+    def test_select_star_never_index_only(self):
+        sigma = QueryTree("SIGMA", _cond("student_id", "=", 5), [QueryTree("TABLE", "students")])
+        self.assertEqual(self.planner.calculate_cost(sigma)["access_path"],
+                         "index-scan (b+, primary) on student_id")
+
+    def test_include_columns_and_leaf_blocks(self):
+        planner = CostPlanner(stats={
+            "t": {"n_r": 10000, "b_r": 500, "f_r": 20, "v_a_r": {"x": 10000, "y": 100, "z": 50},
+                  "indexes": {"x": {"type": "b+", "value": 3, "include": ["y"], "leaf_blocks": 40}}}})
+        covered = _trace(planner, _project(["x", "y"], QueryTree("TABLE", "t")))
+        self.assertEqual(covered["TABLE"]["io_cost"], 40)
+        uncovered = _trace(planner, _project(["x", "z"], QueryTree("TABLE", "t")))
+        self.assertEqual(uncovered["TABLE"]["io_cost"], 500)
+        # range 10% lewat index: h + leaf berikutnya, 250 entry per leaf
+        sigma = QueryTree("SIGMA", _cond("x", "<", 1000), [QueryTree("TABLE", "t")])
+        costs = _trace(planner, _project(["y"], sigma))
+        self.assertEqual(costs["SIGMA"]["access_path"], "index-only scan (b+) on x")
+
+
+class TestEngineIndexOnly(unittest.TestCase):
+
+    def test_access_path_recorded(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query("SELECT students.student_id FROM students WHERE students.student_id = 5;")
+        optimized = engine.optimize_query(parsed)
+        sigma = optimized.query_tree
+        while sigma.type != "SIGMA":
+            sigma = sigma.childs[0]
+        self.assertEqual(sigma.physical["access_path"], "index-only scan (b+) on student_id")
+
+
+if __name__ == "__main__":
+    unittest.main()
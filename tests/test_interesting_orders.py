@@ -0,0 +1,186 @@
+"""
+Test untuk interesting orders: sort yang dilewati / merge join di CostPlanner,
+dp_join_order_orders, dan operator hasil (PROJECT/SORT) yang dipertahankan
+OptimizationEngine di atas plan join.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from helper.cost import CostPlanner, external_sort_cost, order_column
+from helper.cost_engine import CostEngine
+from helper.helper import build_join_tree
+from helper.join_graph import JoinGraph
+from helper.join_order import dp_join_order, dp_join_order_orders
+from tests.queries import star_query
+
+
+ORDER_BY_QUERY = (
+    "SELECT m.title FROM movies m JOIN reviews r ON m.movie_id = r.movie_id "
+    "JOIN directors d ON d.director_id = m.movie_id ORDER BY m.movie_id;"
+)
+
+
+def _input(order=None, b_r=500, n_r=5000):
+    return {"cost": 10, "n_r": n_r, "b_r": b_r, "f_r": 10, "v_a_r": {"id": 100}, "order": order}
+
+
+class TestSortAvoidance(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner()
+
+    def test_order_column(self):
+        self.assertEqual(order_column("s.id DESC"), "id")
+        self.assertEqual(order_column([{"column": "gpa"}]), "gpa")
+        self.assertIsNone(order_column([]))
+
+    def test_sort_skipped_when_input_ordered(self):
+        sort = QueryTree("SORT", "s.id")
+        self.assertEqual(self.planner.cost_sort(sort, _input("id"))["sort_cost"], 0)
+        result = self.planner.cost_sort(sort, _input("gpa"))
+        self.assertEqual(result["sort_cost"], external_sort_cost(500))
+        self.assertEqual(result["order"], "id")
+
+    def test_sorted_aggregation(self):
+        group = QueryTree("GROUP", "id")
+        self.assertEqual(self.planner.cost_aggregation(group, _input("id"))["io_cost"], 10)
+        self.assertEqual(self.planner.cost_aggregation(group, _input())["io_cost"], 510)
+
+    def test_string_join_attributes(self):
+        self.assertEqual(self.planner.extract_join_attributes("THETA:Cond(a.x = b.y)"), (("a", "x"), ("b", "y")))
+        self.assertEqual(self.planner.extract_join_attributes("Cond(a.x = b.y AND a.z = b.z)"), ((None, None), (None, None)))
+
+    def test_merge_join_on_sorted_input(self):
+        join = QueryTree("JOIN", "THETA:a.id = b.id")
+        # kedua input terurut: merge join lebih murah dari hash join (grace)
+        left, right = _input("id", b_r=800), _input("id", b_r=900)
+        result = self.planner.cost_join(join, left, right)
+        self.assertEqual(result["join_method"], "merge-join")
+        self.assertEqual(result["join_cost"], 800 + 900)
+        self.assertEqual(result["order"], "id")
+        right = _input(b_r=900)
+
+        # tanpa input terurut nested-loop tetap dipakai, kecuali dipaksa plan
+        self.assertNotEqual(self.planner.cost_join(join, _input(b_r=800), right)["join_method"], "merge-join")
+        join.physical["join_method"] = "merge-join"
+        forced = self.planner.cost_join(join, _input(b_r=800), right)
+        self.assertEqual(forced["join_method"], "merge-join")
+        self.assertEqual(forced["join_cost"], 800 + 900 + external_sort_cost(800) + external_sort_cost(900))
+
+
+class TestOrdersDP(unittest.TestCase):
+
+    def test_without_merge_matches_dp(self):
+        tables, conds, stats = star_query(7, seed=2)
+        _, expected = dp_join_order(tables, conds, stats)
+        order, methods, cost, sorted_output = dp_join_order_orders(tables, conds, stats, merge_joins=False)
+        self.assertEqual(cost, expected)
+        self.assertEqual(set(methods), {"nested-loop"})
+        self.assertFalse(sorted_output)
+
+        # order yang diminta tanpa merge join = plan termurah + satu sort
+        _, _, cost, sorted_output = dp_join_order_orders(tables, conds, stats, "id", merge_joins=False)
+        self.assertFalse(sorted_output)
+        self.assertGreater(cost, expected)
+
+    def test_required_order_from_merge(self):
+        tables = ["a", "b", "c"]
+        conds = {frozenset({"a", "b"}): "a.k = b.k", frozenset({"b", "c"}): "b.j = c.j"}
+        stats = {"a": {"n_r": 20000, "b_r": 2000}, "b": {"n_r": 20000, "b_r": 2000}, "c": {"n_r": 50, "b_r": 1}}
+        order, methods, cost, sorted_output = dp_join_order_orders(tables, conds, stats, "k")
+        self.assertTrue(sorted_output)
+        self.assertIn("merge-join", methods)
+        plain = dp_join_order_orders(tables, conds, stats, "k", merge_joins=False)[2]
+        self.assertLess(cost, plain)
+
+    def test_planner_model(self):
+        tables = ["a", "b", "c"]
+        conds = {frozenset({"a", "b"}): "a.k = b.k", frozenset({"b", "c"}): "b.j = c.j"}
+        stats = {"a": {"n_r": 20000, "b_r": 2000, "v_a_r": {"k": 200}},
+                 "b": {"n_r": 20000, "b_r": 2000, "v_a_r": {"k": 200, "j": 50}},
+                 "c": {"n_r": 50, "b_r": 1, "v_a_r": {"j": 50}}}
+        engine = CostEngine(stats)
+        graph = JoinGraph(tables, conds)
+        order, methods, cost, sorted_output = dp_join_order_orders(
+            tables, conds, stats, "k", engine.search_model(graph), graph=graph)
+        # join method dari CostPlanner, merge join terakhir dipaksa demi order k
+        self.assertEqual(methods, ["hash-join", "merge-join"])
+        self.assertTrue(sorted_output)
+
+        # cost DP = cost CostPlanner untuk plan yang sama + SORT di atasnya
+        plan = build_join_tree(order, conds, graph)
+        plan.physical["join_method"] = "merge-join"
+        self.assertAlmostEqual(cost, engine.plan_cost(QueryTree("SORT", "k", [plan])))
+        plain, _ = dp_join_order(tables, conds, stats, engine.search_model(graph), graph=graph)
+        self.assertLess(cost, engine.plan_cost(QueryTree("SORT", "k", [build_join_tree(plain, conds, graph)])))
+
+
+class TestEngineOrders(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OptimizationEngine()
+
+    def test_result_operators_kept(self):
+        optimized = self.engine.optimize_query(self.engine.parse_query(ORDER_BY_QUERY))
+        root = optimized.query_tree
+        self.assertEqual(root.type, "PROJECT")
+        sort = root.childs[0]
+        self.assertEqual(sort.type, "SORT")
+        self.assertIs(sort.parent, root)
+        self.assertEqual(sort.childs[0].type, "JOIN")
+        self.assertEqual(self.engine.required_order, "movie_id")
+        self.assertEqual(sort.physical.get("sort") == "avoided", self.engine.last_sort_avoided)
+
+    def test_sort_avoided_by_forced_merge(self):
+        tables = ["a", "b", "c"]
+        conds = {frozenset({"a", "b"}): "a.k = b.k", frozenset({"b", "c"}): "b.j = c.j"}
+        stats = {"a": {"n_r": 20000, "b_r": 2000, "v_a_r": {"k": 200}},
+                 "b": {"n_r": 20000, "b_r": 2000, "v_a_r": {"k": 200, "j": 50}},
+                 "c": {"n_r": 50, "b_r": 1, "v_a_r": {"j": 50}}}
+        self.engine.required_order = "k"
+        plan, _ = self.engine._dp_orders_optimize(tables, conds, stats, JoinGraph(tables, conds))
+        self.assertTrue(self.engine.last_sort_avoided)
+        # hanya merge join yang dicatat, hash join dipilih CostPlanner sendiri
+        self.assertEqual(plan.physical.get("join_method"), "merge-join")
+        self.assertNotIn("join_method", plan.childs[0].physical)
+        self.assertEqual(CostPlanner(stats=stats).calculate_cost(QueryTree("SORT", "k", [plan]))["sort_cost"], 0)
+
+    def test_never_costlier_than_plain_dp(self):
+        queries = [
+            ORDER_BY_QUERY,
+            "SELECT m.title FROM movies m JOIN reviews r ON m.movie_id = r.movie_id GROUP BY m.movie_id;",
+            "SELECT m.title FROM movies m JOIN reviews r ON m.movie_id = r.movie_id "
+            "JOIN directors d ON d.director_id = m.movie_id ORDER BY r.rating;",
+        ]
+        for model in ("planner", "simple"):
+            for query in queries:
+                costs = []
+                for use_orders in (True, False):
+                    engine = OptimizationEngine()
+                    engine.cost_model = model
+                    engine.use_interesting_orders = use_orders
+                    costs.append(engine.get_cost(engine.optimize_query(engine.parse_query(query))))
+                self.assertLessEqual(costs[0], costs[1], (model, query))
+
+            for n, seed in ((4, 2), (6, 5), (7, 1)):
+                tables, conds, stats = star_query(n, seed=seed)
+                graph = JoinGraph(tables, conds)
+                for column, operator in (("id", "SORT"), ("k1", "SORT"), ("k1", "GROUP")):
+                    engine = OptimizationEngine()
+                    engine.cost_model = model
+                    engine.required_order, engine._order_operator = column, operator
+                    plan, _ = engine._dp_orders_optimize(tables, conds, stats, graph)
+                    engine.use_interesting_orders = False
+                    plain, _ = engine._dp_optimize(tables, conds, stats)
+                    cost_engine = engine._cost_engine(stats)
+                    self.assertLessEqual(engine._ordered_cost(cost_engine, plan),
+                                         engine._ordered_cost(cost_engine, plain), (model, n, column, operator))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test untuk estimasi size join dari atribut join (CostPlanner.estimate_join):
+pasangan equi-join, deteksi key / foreign key, join multi-predikat dan
+cartesian product.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.query_tree import QueryTree, ConditionNode, LogicalNode, ColumnNode
+from helper.cost import CostPlanner
+from helper.stats import get_stats
+
+
+def _table(name):
+    return QueryTree("TABLE", name)
+
+
+def _join(pred, left, right):
+    return QueryTree("JOIN", pred, [left, right])
+
+
+class TestJoinPredicates(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner()
+
+    def test_string_predicates(self):
+        self.assertEqual(self.planner.join_predicates("THETA:Cond(a.x = b.y)"), [(("a", "x"), ("b", "y"))])
+        self.assertEqual(self.planner.join_predicates("a.x = b.x AND a.y = b.y"),
+                         [(("a", "x"), ("b", "x")), (("a", "y"), ("b", "y"))])
+        self.assertEqual(self.planner.join_predicates("CARTESIAN"), [])
+        self.assertIsNone(self.planner.join_predicates("a.x = b.x OR a.y = b.y"))
+        self.assertIsNone(self.planner.join_predicates("a.x < b.y"))
+
+    def test_condition_nodes(self):
+        eq = ConditionNode(ColumnNode("x", "a"), "=", ColumnNode("y", "b"))
+        literal = ConditionNode(ColumnNode("z", "a"), "=", 5)
+        self.assertEqual(self.planner.join_predicates(LogicalNode("AND", [eq, literal])), [(("a", "x"), ("b", "y"))])
+        self.assertIsNone(self.planner.join_predicates(literal))
+        self.assertIsNone(self.planner.join_predicates(LogicalNode("OR", [eq, eq])))
+
+
+class TestJoinCardinality(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner(stats=get_stats())
+
+    def _rows(self, tree):
+        return self.planner.calculate_cost(tree)["n_r"]
+
+    def test_keys_from_stats_and_schema(self):
+        keys = self.planner.table_keys("movie_actors", self.planner.get_table_stats("movie_actors"))
+        self.assertIn(frozenset({"movie_id", "actor_id"}), keys)
+        self.assertIn(frozenset({"movie_id"}), self.planner.table_keys("movies", self.planner.get_table_stats("movies")))
+        # V(movie_id) > n_r di awards: stats tidak konsisten, bukan key
+        awards = self.planner.table_keys("awards", self.planner.get_table_stats("awards"))
+        self.assertNotIn(frozenset({"movie_id"}), awards)
+
+        # key dari foreign key tabel lain saja
+        planner = CostPlanner(stats={"a": {"n_r": 100, "v_a_r": {"id": 90}},
+                                     "b": {"n_r": 500, "foreign_keys": {"a_id": "a.id"}}})
+        self.assertIn(frozenset({"id"}), planner.table_keys("a", planner.get_table_stats("a")))
+
+    def test_foreign_key_join(self):
+        # setiap review punya tepat satu movie
+        self.assertEqual(self._rows(_join("THETA:movies.movie_id = reviews.movie_id", _table("movies"), _table("reviews"))), 5000)
+        self.assertEqual(self._rows(_join("THETA:movies.movie_id = reviews.movie_id", _table("reviews"), _table("movies"))), 5000)
+        chain = _join("THETA:movie_actors.actor_id = actors.actor_id",
+                      _join("THETA:movies.movie_id = movie_actors.movie_id", _table("movies"), _table("movie_actors")),
+                      _table("actors"))
+        self.assertEqual(self._rows(chain), 5000)
+
+    def test_keys_propagate(self):
+        result = self.planner.calculate_cost(_join("THETA:movies.movie_id = reviews.movie_id",
+                                                   _table("movies"), _table("reviews")))
+        self.assertIn(frozenset({"review_id"}), result["keys"])
+        self.assertNotIn(frozenset({"movie_id"}), result["keys"])
+        self.assertEqual(result["v_a_r"]["movie_id"], 1000)
+
+    def test_cartesian(self):
+        self.assertEqual(self._rows(_join("CARTESIAN", _table("movies"), _table("directors"))), 200000)
+
+    def test_multi_predicate(self):
+        stats = {"r": {"n_r": 10000, "v_a_r": {"x": 100, "y": 50}},
+                 "s": {"n_r": 2000, "v_a_r": {"x": 20, "y": 40}},
+                 "k": {"n_r": 300, "primary_key": ["x", "y"], "v_a_r": {"x": 3, "y": 2}},
+                 "t": {"n_r": 10000, "v_a_r": {"x": 3, "y": 2}}}
+        planner = CostPlanner(stats=stats)
+        both = "THETA:r.x = s.x AND r.y = s.y"
+        self.assertEqual(planner.calculate_cost(_join(both, _table("r"), _table("s")))["n_r"],
+                         int(10000 * 2000 / 100 / 50))
+        # atribut join mencakup composite key k: paling banyak satu k per tuple t
+        rows = planner.calculate_cost(_join("THETA:t.x = k.x AND t.y = k.y", _table("t"), _table("k")))["n_r"]
+        self.assertEqual(rows, 10000)
+
+    def test_unknown_attributes_keep_heuristic(self):
+        planner = CostPlanner(stats={"a": {"n_r": 1000}, "b": {"n_r": 3000}})
+        self.assertEqual(planner.calculate_cost(_join("THETA:a.x = b.y", _table("a"), _table("b")))["n_r"],
+                         1000 * 3000 // 100)
+        self.assertEqual(planner.calculate_cost(_join("THETA:a.x < b.y", _table("a"), _table("b")))["n_r"],
+                         1000 * 3000 // 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
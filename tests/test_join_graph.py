@@ -0,0 +1,95 @@
+"""
+Test untuk JoinGraph (helper/join_graph.py) dan build_join_tree /
+build_bushy_join_tree yang memakainya.
+"""
+
+import sys
+import os
+import time
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helper.helper import build_join_tree, build_bushy_join_tree, _tables_under, _theta_pred
+from helper.join_graph import JoinGraph
+
+
+CONDITIONS = {
+    frozenset({"movies", "reviews"}): "movies.movie_id = reviews.movie_id",
+    frozenset({"movies", "movie_actors"}): "movies.movie_id = movie_actors.movie_id",
+    frozenset({"movie_actors", "actors"}): "movie_actors.actor_id = actors.actor_id",
+    frozenset({"movies", "ghost"}): "movies.x = ghost.x",
+}
+TABLES = ["movies", "reviews", "movie_actors", "actors"]
+
+
+def _joins(node):
+    if node.type != "JOIN":
+        return []
+    return _joins(node.childs[0]) + _joins(node.childs[1]) + [node]
+
+
+class TestJoinGraph(unittest.TestCase):
+
+    def test_structure(self):
+        g = JoinGraph(TABLES, CONDITIONS)
+        self.assertEqual(g.index["movie_actors"], 2)
+        self.assertEqual(g.nbr[0], 0b0110)
+        self.assertEqual(g.edges(), [(0, 1), (0, 2), (2, 3)])
+        self.assertEqual(g.mask(["reviews", "actors"]), 0b1010)
+        self.assertEqual(g.names(0b1010), ["reviews", "actors"])
+        self.assertEqual(g.neighborhood(0b0001), 0b0110)
+        self.assertTrue(g.joins(0b0100, 3))
+        self.assertFalse(g.joins(0b0010, 3))
+        self.assertTrue(g.is_connected())
+        self.assertFalse(g.is_connected(0b1010))
+
+    def test_predicate_lookup(self):
+        g = JoinGraph(TABLES, CONDITIONS)
+        self.assertEqual(g.predicate(0b0011, 0b0100), CONDITIONS[frozenset({"movies", "movie_actors"})])
+        self.assertIsNone(g.predicate(0b0010, 0b1000))
+        # tabel yang tidak ada di query diabaikan
+        self.assertNotIn("ghost", g.index)
+
+    def test_build_join_tree_predicates(self):
+        tree = build_join_tree(["reviews", "movies", "movie_actors", "actors"], CONDITIONS)
+        preds = [_theta_pred(j) for j in _joins(tree)]
+        self.assertEqual(preds, [
+            CONDITIONS[frozenset({"movies", "reviews"})],
+            CONDITIONS[frozenset({"movies", "movie_actors"})],
+            CONDITIONS[frozenset({"movie_actors", "actors"})],
+        ])
+
+        tree = build_join_tree(["reviews", "actors", "movies", "movie_actors"], CONDITIONS)
+        self.assertEqual(_joins(tree)[0].val, "CARTESIAN")
+
+    def test_build_join_tree_reuses_graph(self):
+        g = JoinGraph(TABLES, CONDITIONS)
+        a = build_join_tree(["actors", "movie_actors", "movies", "reviews"], CONDITIONS, g)
+        b = build_join_tree(["actors", "movie_actors", "movies", "reviews"], CONDITIONS)
+        self.assertEqual([j.val for j in _joins(a)], [j.val for j in _joins(b)])
+        # graph yang tidak memuat semua tabel dibangun ulang
+        c = build_join_tree(["actors", "movie_actors", "directors"], CONDITIONS, g)
+        self.assertEqual(_tables_under(c), {"actors", "movie_actors", "directors"})
+
+    def test_bushy_predicates(self):
+        shape = (("movies", "reviews"), ("movie_actors", "actors"))
+        tree = build_bushy_join_tree(shape, CONDITIONS, JoinGraph(TABLES, CONDITIONS))
+        self.assertEqual(_theta_pred(tree), CONDITIONS[frozenset({"movies", "movie_actors"})])
+
+    def test_large_chain_is_fast(self):
+        n = 300
+        tables = [f"t{i}" for i in range(n)]
+        conds = {frozenset({tables[i], tables[i + 1]}): f"t{i}.id = t{i+1}.id" for i in range(n - 1)}
+        order = tables[:]
+        random.Random(0).shuffle(order)
+        start = time.perf_counter()
+        tree = build_join_tree(order, conds)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(_joins(tree)), n - 1)
+        self.assertLess(elapsed, 1.0)
+        print(f"\nbuild_join_tree {n} tabel: {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Test untuk pemilihan join method CostPlanner terhadap buffer m: block
+nested-loop, index nested-loop, hash join (in-memory / grace) dan sort-merge,
+serta join method yang dicatat OptimizationEngine di plan.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from helper.memory import MemoryConfig
+from helper.cost import CostPlanner, block_nested_loop_cost, hash_join_cost, external_sort_cost
+
+
+def _input(b_r, n_r=None, order=None):
+    n_r = n_r if n_r is not None else b_r * 10
+    return {"cost": b_r, "n_r": n_r, "b_r": b_r, "f_r": 10, "v_a_r": {"id": n_r}, "order": order}
+
+
+def _join(pred="THETA:a.id = b.id"):
+    return QueryTree("JOIN", pred)
+
+
+class TestJoinFormulas(unittest.TestCase):
+
+    def test_block_nested_loop(self):
+        self.assertEqual(block_nested_loop_cost(1000, 50, 100), 1050)
+        self.assertEqual(block_nested_loop_cost(1000, 500, 100), 11 * 500 + 1000)
+
+    def test_hash_join(self):
+        self.assertEqual(hash_join_cost(1000, 50, 100), 1050)
+        self.assertEqual(hash_join_cost(1000, 500, 100), 3 * 1500)
+        # build side > (m - 1)^2: partisi rekursif
+        self.assertEqual(hash_join_cost(20000, 20000, 100), 2 * 40000 * 2 + 40000)
+
+
+class TestJoinMethodChoice(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner()
+
+    def _method(self, left, right, pred="THETA:a.id = b.id", planner=None):
+        return (planner or self.planner).cost_join(_join(pred), left, right)
+
+    def test_hash_join_without_indexes(self):
+        result = self._method(_input(1000), _input(500))
+        self.assertEqual(result["join_method"], "hash-join")
+        self.assertEqual(result["join_cost"], hash_join_cost(1000, 500, 100))
+        self.assertIsNone(result["order"])
+
+    def test_small_inner_uses_block_nested_loop(self):
+        # I/O saja: inner muat di memory, block nested-loop sama murah dengan hash join
+        io_only = CostPlanner(cpu={"tuple_cost": 0, "operator_cost": 0})
+        result = self._method(_input(1000, order="x"), _input(20), planner=io_only)
+        self.assertEqual(result["join_method"], "block-nested-loop")
+        self.assertEqual(result["order"], "x")
+        # dengan cost CPU, membandingkan setiap pasangan tuple lebih mahal dari hash
+        self.assertEqual(self._method(_input(1000, order="x"), _input(20))["join_method"], "hash-join")
+
+    def test_cartesian_only_nested_loop(self):
+        result = self._method(_input(1000), _input(500), pred="CARTESIAN")
+        self.assertEqual(result["join_method"], "block-nested-loop")
+        self.assertEqual(result["join_cost"], block_nested_loop_cost(1000, 500, 100))
+
+    def test_index_nested_loop_for_selective_outer(self):
+        planner = CostPlanner(stats={"b": {"indexes": {"id": {"type": "b+", "value": 3}}}})
+        right = _input(5000)
+        self.assertEqual(self._method(_input(2, n_r=5), right, planner=planner)["join_method"], "index-nested-loop (b+)")
+        self.assertEqual(self._method(_input(2000), right, planner=planner)["join_method"], "hash-join")
+
+    def test_predicate_written_either_way(self):
+        planner = CostPlanner(stats={
+            "small": {"n_r": 10, "b_r": 1, "v_a_r": {"big_id": 10}},
+            "big": {"n_r": 50000, "b_r": 5000, "v_a_r": {"id": 50000},
+                    "indexes": {"id": {"type": "b+", "value": 3}}},
+        })
+        results = []
+        for pred in ("THETA:small.big_id = big.id", "THETA:big.id = small.big_id"):
+            join = QueryTree("JOIN", pred, [QueryTree("TABLE", "small"), QueryTree("TABLE", "big")])
+            results.append(planner.calculate_cost(join))
+        self.assertEqual([r["join_method"] for r in results], ["index-nested-loop (b+)"] * 2)
+        self.assertEqual(results[0]["cost"], results[1]["cost"])
+
+        # input terurut dikenali dari sisi input, bukan urutan predikat
+        left = dict(_input(800, order="x"), v_a_r={"x": 8000})
+        right = dict(_input(900, order="y"), v_a_r={"y": 9000})
+        for pred in ("THETA:a.x = b.y", "THETA:b.y = a.x"):
+            result = self._method(left, right, pred)
+            self.assertEqual((result["join_method"], result["join_cost"], result["order"]), ("merge-join", 1700, "x"))
+
+    def test_buffer_budget(self):
+        left, right = _input(1000), _input(500)
+        small = CostPlanner(memory=10)
+        large = CostPlanner(memory=1000)
+        costs = [self._method(left, right, planner=p)["join_cost"] for p in (small, self.planner, large)]
+        self.assertGreater(costs[0], costs[1])
+        self.assertGreater(costs[1], costs[2])
+        self.assertEqual(costs[2], 1500)
+
+        sort = QueryTree("SORT", "id")
+        self.assertEqual(small.cost_sort(sort, _input(1000))["sort_cost"], external_sort_cost(1000, 10))
+
+
+class TestEngineJoinMethods(unittest.TestCase):
+
+    QUERY = ("SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id "
+             "JOIN movie_actors ma ON ma.movie_id = m.movie_id;")
+
+    def _joins(self, engine):
+        joins, stack = [], [engine.optimize_query(engine.parse_query(self.QUERY)).query_tree]
+        while stack:
+            node = stack.pop()
+            if node.type == "JOIN":
+                joins.append(node)
+            stack.extend(node.childs)
+        return joins
+
+    def test_methods_recorded_on_plan(self):
+        engine = OptimizationEngine()
+        joins = self._joins(engine)
+        self.assertEqual(len(joins), 2)
+        for join in joins:
+            self.assertIn(join.physical.get("join_method"),
+                          {"block-nested-loop", "hash-join", "merge-join",
+                           "index-nested-loop (b+)", "index-nested-loop (hash)"})
+
+    def test_memory_reaches_planner(self):
+        engine = OptimizationEngine()
+        engine.memory = MemoryConfig(buffer_blocks=7)
+        self.assertEqual(engine._cost_engine({}).planner.buffer_blocks, 7)
+        self._joins(engine)
+        small = engine.last_top_plans[0]["cost"]
+        engine.memory = MemoryConfig(buffer_blocks=1000)
+        self._joins(engine)
+        self.assertLess(engine.last_top_plans[0]["cost"], small)
+
+
+if __name__ == "__main__":
+    unittest.main()
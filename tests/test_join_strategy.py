@@ -0,0 +1,141 @@
+"""
+Test untuk registry strategi join-order, klasifikasi bentuk join graph dan
+ekstraksi join graph dari predikat (alias di-resolve).
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import _tables_under
+from helper.join_strategy import (
+    JoinStrategy,
+    JOIN_STRATEGIES,
+    classify_join_graph,
+    select_join_strategy,
+    register_join_strategy,
+)
+
+
+def _tables(n):
+    return [f"t{i}" for i in range(n)]
+
+
+def _chain(n):
+    return {frozenset({f"t{i}", f"t{i+1}"}): "p" for i in range(n - 1)}
+
+
+def _star(n):
+    return {frozenset({"t0", f"t{i}"}): "p" for i in range(1, n)}
+
+
+def _cycle(n):
+    return {frozenset({f"t{i}", f"t{(i + 1) % n}"}): "p" for i in range(n)}
+
+
+def _clique(n):
+    return {frozenset({f"t{i}", f"t{j}"}): "p" for i in range(n) for j in range(i + 1, n)}
+
+
+class TestJoinGraphShape(unittest.TestCase):
+
+    def test_classify(self):
+        self.assertEqual(classify_join_graph(_tables(5), _chain(5)), "chain")
+        self.assertEqual(classify_join_graph(_tables(5), _star(5)), "star")
+        self.assertEqual(classify_join_graph(_tables(5), _cycle(5)), "cycle")
+        self.assertEqual(classify_join_graph(_tables(5), _clique(5)), "clique")
+        self.assertEqual(classify_join_graph(_tables(4), _chain(2)), "disconnected")
+        tree = _chain(4)
+        tree[frozenset({"t1", "t4"})] = "p"
+        tree[frozenset({"t1", "t5"})] = "p"
+        self.assertEqual(classify_join_graph(_tables(6), tree), "tree")
+        cyclic = _chain(5)
+        cyclic[frozenset({"t0", "t2"})] = "p"
+        self.assertEqual(classify_join_graph(_tables(5), cyclic), "cyclic")
+
+
+class TestStrategySelection(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OptimizationEngine()
+
+    def test_chain_never_uses_ga(self):
+        for n in (5, 20, 60):
+            strategy = select_join_strategy(self.engine, _tables(n), _chain(n))
+            self.assertEqual(strategy.name, "dp")
+
+    def test_star_by_size(self):
+        pick = lambda n: select_join_strategy(self.engine, _tables(n), _star(n)).name
+        self.assertEqual(pick(10), "dp")
+        self.assertEqual(pick(25), "ga")
+        self.assertEqual(pick(50), "goo")
+        self.engine.use_ga = False
+        self.assertEqual(pick(25), "goo")
+
+    def test_bnb_replaces_dp(self):
+        self.engine.join_enumerator = "bnb"
+        self.assertEqual(select_join_strategy(self.engine, _tables(8), _clique(8)).name, "bnb")
+
+    def test_forced_and_unknown_strategy(self):
+        self.engine.join_strategy = "greedy"
+        self.assertEqual(select_join_strategy(self.engine, _tables(5), _chain(5)).name, "greedy")
+        self.engine.join_strategy = "tabu"
+        with self.assertRaises(ValueError):
+            select_join_strategy(self.engine, _tables(5), _chain(5))
+
+    def test_register_custom_strategy(self):
+        calls = []
+
+        def run(engine, tables, join_conditions, stats, deadline):
+            calls.append(len(tables))
+            return engine._greedy_optimize(tables, join_conditions, stats)
+
+        register_join_strategy(JoinStrategy("first", run, rank=-1, shapes=("clique",)))
+        try:
+            self.assertEqual(select_join_strategy(self.engine, _tables(6), _clique(6)).name, "first")
+            self.assertEqual(select_join_strategy(self.engine, _tables(6), _chain(6)).name, "dp")
+        finally:
+            del JOIN_STRATEGIES["first"]
+
+
+class TestJoinConditionExtraction(unittest.TestCase):
+
+    def test_aliases_resolved_to_real_edges(self):
+        engine = OptimizationEngine()
+        pq = engine.parse_query(
+            "SELECT * FROM students s JOIN enrollments e ON s.student_id = e.student_id "
+            "JOIN courses c ON e.course_id = c.course_id "
+            "JOIN departments d ON c.dept_id = d.dept_id;"
+        )
+        conds = engine._extract_join_conditions_from_tree(pq.query_tree)
+        self.assertEqual(set(conds), {
+            frozenset({"students", "enrollments"}),
+            frozenset({"enrollments", "courses"}),
+            frozenset({"courses", "departments"}),
+        })
+        self.assertIn("c.dept_id", conds[frozenset({"courses", "departments"})])
+        tables = _tables_under(pq.query_tree)
+        self.assertEqual(classify_join_graph(sorted(tables), conds), "chain")
+
+        out = engine.optimize_query(pq)
+        self.assertEqual(engine.last_strategy, "dp")
+        self.assertEqual(_tables_under(out.query_tree), tables)
+
+    def test_where_join_predicates(self):
+        engine = OptimizationEngine()
+        pq = engine.parse_query(
+            "SELECT * FROM students, enrollments, courses "
+            "WHERE students.student_id = enrollments.student_id "
+            "AND enrollments.course_id = courses.course_id;"
+        )
+        conds = engine._extract_join_conditions_from_tree(pq.query_tree)
+        self.assertEqual(set(conds), {
+            frozenset({"students", "enrollments"}),
+            frozenset({"enrollments", "courses"}),
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
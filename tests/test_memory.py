@@ -0,0 +1,120 @@
+"""
+Test untuk konfigurasi memory (helper.memory.MemoryConfig): sumber config,
+grant per query yang membatasi m di CostPlanner, dan memory per operator
+(memory_blocks / peak_memory_blocks) yang dilaporkan planner.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from helper.cost import CostPlanner, external_sort_cost
+from helper.memory import MemoryConfig, memory_config
+
+
+class FakeStorageManager:
+    """pengganti storage manager: hanya ukuran buffer pool dan grant"""
+
+    def __init__(self, pool, grant=None):
+        self.pool, self.grant = pool, grant
+
+    def get_buffer_pool_size(self):
+        return self.pool
+
+    def get_query_memory_grant(self):
+        return self.grant
+
+
+def _input(b_r, order=None):
+    return {"cost": b_r, "n_r": b_r * 10, "b_r": b_r, "f_r": 10, "v_a_r": {"id": b_r * 10}, "order": order}
+
+
+class TestMemoryConfig(unittest.TestCase):
+
+    def test_grant_limits_work_blocks(self):
+        self.assertEqual(MemoryConfig().work_blocks, 100)
+        self.assertEqual(MemoryConfig(200, query_grant_blocks=50).work_blocks, 50)
+        self.assertEqual(MemoryConfig(20, query_grant_blocks=50).work_blocks, 20)
+        self.assertEqual(MemoryConfig(200).with_grant(30).work_blocks, 30)
+
+    def test_invalid(self):
+        for bad in (2, 0, 10.5, "100", True):
+            with self.assertRaises(ValueError):
+                MemoryConfig(buffer_blocks=bad)
+        with self.assertRaises(ValueError):
+            MemoryConfig(query_grant_blocks=1)
+        with self.assertRaises(ValueError):
+            MemoryConfig.from_config({"buffer_block": 10})
+
+    def test_sources(self):
+        self.assertEqual(memory_config(), MemoryConfig())
+        self.assertEqual(memory_config(64).buffer_blocks, 64)
+        config = memory_config({"buffer_blocks": 500, "block_size": 8192, "query_grant_blocks": 40})
+        self.assertEqual((config.buffer_blocks, config.block_size, config.work_blocks), (500, 8192, 40))
+        config = memory_config(storage_manager=FakeStorageManager(300, 25))
+        self.assertEqual((config.buffer_blocks, config.page_size, config.work_blocks), (300, 4096, 25))
+        # config eksplisit menang atas storage manager
+        self.assertEqual(memory_config(64, FakeStorageManager(300)).buffer_blocks, 64)
+
+
+class TestPlannerMemory(unittest.TestCase):
+
+    def test_planner_memory_from_storage_manager(self):
+        planner = CostPlanner(storage_manager=FakeStorageManager(50))
+        self.assertEqual(planner.buffer_blocks, 50)
+        planner.memory = planner.memory.with_grant(10)
+        self.assertEqual(planner.buffer_blocks, 10)
+        self.assertEqual(planner.cost_sort(QueryTree("SORT", "id"), _input(1000))["sort_cost"],
+                         external_sort_cost(1000, 10))
+
+    def test_join_memory_per_method(self):
+        planner = CostPlanner(memory=100)
+        join = QueryTree("JOIN", "THETA:a.id = b.id")
+        small = planner.cost_join(QueryTree("JOIN", "THETA:a.id < b.id"), _input(1000), _input(20))
+        self.assertEqual((small["join_method"], small["memory_blocks"]), ("block-nested-loop", 22))
+        grace = planner.cost_join(join, _input(1000), _input(500))
+        self.assertEqual((grace["join_method"], grace["memory_blocks"]), ("hash-join", 100))
+        merge = planner.cost_join(join, _input(1000, order="id"), _input(900, order="id"))
+        self.assertEqual((merge["join_method"], merge["memory_blocks"]), ("merge-join", 3))
+
+    def test_grant_bounds_every_operator(self):
+        tree = QueryTree("SORT", "id", [QueryTree("JOIN", "THETA:a.id = b.id", [QueryTree("TABLE", "a"),
+                                                                                QueryTree("TABLE", "b")])])
+        stats = {"a": {"n_r": 20000, "b_r": 2000, "v_a_r": {"id": 20000}},
+                 "b": {"n_r": 5000, "b_r": 400, "v_a_r": {"id": 5000}}}
+        free = CostPlanner(stats=stats, memory=1000).calculate_cost(tree)
+        tight = CostPlanner(stats=stats, memory=MemoryConfig(1000, query_grant_blocks=40)).calculate_cost(tree)
+        self.assertGreater(free["peak_memory_blocks"], 40)
+        self.assertLessEqual(tight["peak_memory_blocks"], 40)
+        self.assertGreater(tight["cost"], free["cost"])
+
+
+class TestEngineMemoryGrant(unittest.TestCase):
+
+    QUERY = ("SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id "
+             "JOIN movie_actors ma ON ma.movie_id = m.movie_id ORDER BY m.movie_id;")
+
+    def test_plan_fits_grant(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query(self.QUERY)
+        engine.optimize_query(parsed)
+        free_cost, free_memory = engine.last_top_plans[0]["cost"], engine.last_memory_blocks
+        self.assertLessEqual(free_memory, engine.memory.buffer_blocks)
+
+        engine.optimize_query(parsed, memory_grant_blocks=5)
+        print(f"\npeak memory: tanpa grant {free_memory} blocks, grant 5 -> {engine.last_memory_blocks} blocks")
+        self.assertLessEqual(engine.last_memory_blocks, 5)
+        self.assertGreaterEqual(engine.last_top_plans[0]["cost"], free_cost)
+        for join in engine.last_top_plans[0]["breakdown"]["joins"]:
+            self.assertLessEqual(join["memory_blocks"], 5)
+
+        # grant hanya berlaku untuk query itu
+        engine.optimize_query(parsed)
+        self.assertEqual(engine.last_memory_blocks, free_memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
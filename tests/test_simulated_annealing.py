@@ -0,0 +1,108 @@
+"""
+Test untuk strategi simulated annealing (_simulated_annealing_optimize):
+move swap / 3-cycle / segment, seed, evaluation cap, dan perbandingan dengan GA.
+"""
+
+import sys
+import os
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import plan_cost, _tables_under
+from helper.join_graph import JoinGraph
+from helper.join_order import dp_join_order
+from helper.join_strategy import select_join_strategy
+from tests.queries import star_query
+
+
+def _count_cartesian(node):
+    if node.type != "JOIN":
+        return 0
+    return (node.val == "CARTESIAN") + _count_cartesian(node.childs[0]) + _count_cartesian(node.childs[1])
+
+
+class TestSimulatedAnnealing(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OptimizationEngine()
+        self.tables, self.conds, self.stats = star_query(12)
+
+    def test_moves_are_permutations(self):
+        rng = random.Random(0)
+        graph = JoinGraph(self.tables, self.conds)
+        order = list(self.tables)
+        for move in ("swap", "cycle3", "segment"):
+            self.engine.sa_moves = (move,)
+            for _ in range(50):
+                neighbor = self.engine._sa_neighbor(order, rng)
+                self.assertEqual(sorted(neighbor), sorted(order))
+                repaired = self.engine._sa_neighbor(order, rng, graph)
+                self.assertEqual(sorted(repaired), sorted(order))
+
+        self.engine.sa_moves = ("reverse",)
+        with self.assertRaises(ValueError):
+            self.engine._sa_neighbor(order, rng)
+
+    def test_seed_is_deterministic(self):
+        self.engine.sa_seed = 7
+        plan_a, cost_a = self.engine._simulated_annealing_optimize(self.tables, self.conds, self.stats)
+        stats_a = dict(self.engine.last_sa_stats)
+        plan_b, cost_b = self.engine._simulated_annealing_optimize(self.tables, self.conds, self.stats)
+        self.assertEqual(cost_a, cost_b)
+        self.assertEqual(stats_a, self.engine.last_sa_stats)
+
+    def test_plan_is_valid_and_capped(self):
+        self.engine.sa_seed = 1
+        self.engine.sa_max_evaluations = 50
+        plan, cost = self.engine._simulated_annealing_optimize(self.tables, self.conds, self.stats)
+        self.assertEqual(_tables_under(plan), set(self.tables))
+        self.assertEqual(cost, self.engine._cost_engine(self.stats).plan_cost(plan))
+        self.assertEqual(_count_cartesian(plan), 0)
+        self.assertLessEqual(self.engine.last_sa_stats["evaluations"], 50)
+        self.assertLessEqual(self.engine.last_sa_stats["misses"], 50)
+
+    def test_small_and_bushy(self):
+        plan, cost = self.engine._simulated_annealing_optimize(["a", "b"], {frozenset({"a", "b"}): "a.x = b.x"}, {})
+        self.assertEqual(_tables_under(plan), {"a", "b"})
+
+        self.engine.bushy_plans = True
+        self.engine.sa_seed = 3
+        plan, cost = self.engine._simulated_annealing_optimize(self.tables, self.conds, self.stats)
+        self.assertEqual(_tables_under(plan), set(self.tables))
+        self.assertEqual(cost, self.engine._cost_engine(self.stats).plan_cost(plan))
+
+    def test_selected_when_enabled(self):
+        tables, conds, _ = star_query(20)
+        self.assertEqual(select_join_strategy(self.engine, tables, conds).name, "ga")
+        self.engine.use_sa = True
+        self.assertEqual(select_join_strategy(self.engine, tables, conds).name, "sa")
+
+    def test_better_than_ga_with_fewer_evaluations(self):
+        self.engine.cost_model = "simple"
+        ga_cost = sa_cost = ga_plans = sa_plans = 0
+        for seed in range(5):
+            tables, conds, stats = star_query(20, seed)
+            random.seed(seed)
+            ga_cost += self.engine._genetic_algorithm_optimize(tables, conds, stats)[1]
+            ga_plans += self.engine.last_ga_stats["misses"]
+            self.engine.sa_seed = seed
+            sa_cost += self.engine._simulated_annealing_optimize(tables, conds, stats)[1]
+            sa_plans += self.engine.last_sa_stats["misses"]
+        print(f"\nGA: cost {ga_cost:,} / {ga_plans} plan, SA: cost {sa_cost:,} / {sa_plans} plan")
+        self.assertLessEqual(sa_cost, ga_cost)
+        self.assertLess(sa_plans, ga_plans)
+
+    def test_close_to_optimum(self):
+        optimum = dp_join_order(self.tables, self.conds, self.stats)[1]
+        self.engine.cost_model = "simple"
+        self.engine.sa_max_evaluations = 300
+        for seed in range(3):
+            self.engine.sa_seed = seed
+            _, cost = self.engine._simulated_annealing_optimize(self.tables, self.conds, self.stats)
+            self.assertLess(cost / optimum, 1.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Test untuk deteksi star / snowflake schema (helper/star_schema.py) dan
+strategi "star" di OptimizationEngine.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from helper.helper import _conjuncts
+from helper.join_strategy import select_join_strategy
+from helper.star_schema import detect_star_schema, star_join_order, choose_star_join_methods
+
+
+def _warehouse():
+    tables = ["sales", "date_dim", "store", "product", "region"]
+    conds = {
+        frozenset({"sales", "date_dim"}): "sales.date_id = date_dim.date_id",
+        frozenset({"sales", "store"}): "sales.store_id = store.store_id",
+        frozenset({"sales", "product"}): "sales.product_id = product.product_id",
+        frozenset({"store", "region"}): "store.region_id = region.region_id",
+    }
+    stats = {
+        "sales": {"n_r": 100000, "b_r": 2000, "v_a_r": {"date_id": 365, "store_id": 50, "product_id": 800}},
+        "date_dim": {"n_r": 365, "b_r": 4, "v_a_r": {"date_id": 365, "month": 12}},
+        "store": {"n_r": 50, "b_r": 1, "v_a_r": {"store_id": 50, "region_id": 5}},
+        "product": {"n_r": 800, "b_r": 20, "v_a_r": {"product_id": 800}},
+        "region": {"n_r": 5, "b_r": 1, "v_a_r": {"region_id": 5}},
+    }
+    return tables, conds, stats
+
+
+def _joins(node):
+    if node.type != "JOIN":
+        return []
+    return _joins(node.childs[0]) + _joins(node.childs[1]) + [node]
+
+
+class TestStarDetection(unittest.TestCase):
+
+    def test_snowflake(self):
+        tables, conds, stats = _warehouse()
+        schema = detect_star_schema(tables, conds, stats)
+        self.assertEqual(schema.fact, "sales")
+        self.assertEqual(sorted(schema.branches), [["date_dim"], ["product"], ["store", "region"]])
+        self.assertTrue(schema.snowflake)
+        self.assertEqual(schema.keys["region"], "region_id")
+
+    def test_rejects_non_star(self):
+        tables, conds, stats = _warehouse()
+        # fact tidak cukup besar dibanding dimensinya
+        self.assertIsNone(detect_star_schema(tables, conds, stats, fact_ratio=500))
+        # predikat ke kolom yang bukan key dimensi
+        bad = dict(stats, product={"n_r": 800, "b_r": 20, "v_a_r": {"product_id": 100}})
+        self.assertIsNone(detect_star_schema(tables, conds, bad))
+        # graph siklik
+        cyclic = dict(conds)
+        cyclic[frozenset({"date_dim", "product"})] = "date_dim.date_id = product.product_id"
+        self.assertIsNone(detect_star_schema(tables, cyclic, stats))
+        # fact hanya punya satu dimensi
+        self.assertIsNone(detect_star_schema(["sales", "store", "region"], conds, stats))
+
+    def test_key_needs_stats(self):
+        tables, conds, stats = _warehouse()
+        # tanpa statistik kolom, key dimensi tidak bisa dibuktikan
+        bare = {t: {"n_r": s["n_r"], "b_r": s["b_r"]} for t, s in stats.items()}
+        self.assertIsNone(detect_star_schema(tables, conds, bare))
+        # primary_key / foreign_keys cukup untuk membuktikan key
+        for t in ("date_dim", "store", "product"):
+            bare[t]["primary_key"] = [f"{t.split('_')[0]}_id"]
+        bare["store"]["foreign_keys"] = {"region_id": "region.region_id"}
+        schema = detect_star_schema(tables, conds, bare)
+        self.assertEqual(schema.fact, "sales")
+        self.assertEqual(schema.keys["region"], "region_id")
+
+    def test_order_by_filter_selectivity(self):
+        tables, conds, stats = _warehouse()
+        schema = detect_star_schema(tables, conds, stats)
+        self.assertEqual(star_join_order(schema, stats), ["sales", "store", "region", "date_dim", "product"])
+        order = star_join_order(schema, stats, {"product": 0.01, "region": 0.2})
+        self.assertEqual(order, ["sales", "product", "store", "region", "date_dim"])
+
+    def test_join_methods(self):
+        tables, conds, stats = _warehouse()
+        stats["product"].update(b_r=2000, indexes={"product_id": {"type": "b+", "value": 2}})
+        schema = detect_star_schema(tables, conds, stats)
+        order = ["sales", "date_dim", "product", "store", "region"]
+
+        # fact besar: probe index per baris lebih mahal dari hash join
+        methods = choose_star_join_methods(schema, order, stats)
+        self.assertEqual([m["join_method"] for m in methods], ["hash-join"] * 4)
+
+        # setelah filter date_dim yang sangat selektif, index nested-loop ke product menang
+        methods = choose_star_join_methods(schema, order, stats, {"date_dim": 0.001})
+        self.assertEqual(methods[1]["join_method"], "index-nested-loop (b+)")
+        self.assertEqual(methods[1]["index"], "product_id")
+
+
+class TestStarStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OptimizationEngine()
+
+    def test_selection(self):
+        tables, conds, stats = _warehouse()
+        self.assertEqual(select_join_strategy(self.engine, tables, conds, stats).name, "star")
+        # tanpa statistik deteksi tidak bisa dilakukan
+        self.assertEqual(select_join_strategy(self.engine, tables, conds).name, "dp")
+        self.engine.use_star_plans = False
+        self.assertEqual(select_join_strategy(self.engine, tables, conds, stats).name, "dp")
+
+    def test_plan_is_annotated(self):
+        tables, conds, stats = _warehouse()
+        self.engine.filter_selectivity = {"product": 0.01}
+        plan, cost = self.engine._star_optimize(tables, conds, stats)
+        joins = _joins(plan)
+        self.assertEqual(len(joins), 4)
+        self.assertTrue(all(j.physical.get("join_method") for j in joins))
+        self.assertEqual(joins[0].childs[1].val, "product")
+        self.assertEqual(self.engine.last_star_schema.fact, "sales")
+
+    def test_methods_match_engine_cost(self):
+        tables, conds, stats = _warehouse()
+        stats["product"]["indexes"] = {"product_id": {"type": "b+", "value": 2}}
+        plan, cost = self.engine._star_optimize(tables, conds, stats)
+        engine = self.engine._cost_engine(stats)
+        breakdown = engine.breakdown(plan)
+        self.assertEqual(cost, breakdown["cost"])
+        joins = _joins(plan)
+        self.assertEqual([j.physical["join_method"] for j in joins],
+                         [j["join_method"] for j in breakdown["joins"]])
+        self.assertEqual([j.physical["estimated_cost"] for j in joins],
+                         [j["join_cost"] for j in breakdown["joins"]])
+
+    def test_end_to_end(self):
+        self.engine.star_fact_ratio = 1.5
+        parsed = self.engine.parse_query(
+            "SELECT * FROM movie_actors ma "
+            "JOIN actors a ON a.actor_id = ma.actor_id "
+            "JOIN movies m ON m.movie_id = ma.movie_id "
+            "WHERE m.genre = 'Drama';"
+        )
+        optimized = self.engine.optimize_query(parsed)
+        self.assertEqual(self.engine.last_strategy, "star")
+        self.assertIn("movies", self.engine.filter_selectivity)
+
+        joins = _joins(optimized.query_tree)
+        self.assertEqual(joins[0].childs[0].val, "movie_actors")
+        # movies punya filter, jadi di-join sebelum actors
+        self.assertEqual(joins[0].childs[1].val, "movies")
+        self.assertEqual(joins[0].physical["join_method"], "hash-join")
+
+    def test_merged_filter_is_not_an_edge(self):
+        self.assertEqual(_conjuncts("Cond(m.genre = Drama) AND Cond(a.id = ma.id)"),
+                         ["Cond(m.genre = Drama)", "Cond(a.id = ma.id)"])
+        self.assertEqual(len(_conjuncts("a.x = 1 OR a.y = 2")), 1)
+
+    def test_between_is_one_conjunct(self):
+        self.assertEqual(_conjuncts("Cond(s.day BETWEEN 1 AND 7) AND Cond(s.date_id = d.date_id)"),
+                         ["Cond(s.day BETWEEN 1 AND 7)", "Cond(s.date_id = d.date_id)"])
+        self.assertEqual(_conjuncts("s.x between 1 and 2 AND s.name = 'A AND B'"),
+                         ["s.x between 1 and 2", "s.name = 'A AND B'"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Test untuk time budget optimasi (time_budget_ms / Deadline / greedy fallback).
+"""
+
+import sys
+import os
+import time
+import random
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from model.parsed_query import ParsedQuery
+from helper.helper import build_join_tree, plan_cost, _tables_under
+from helper.join_order import Deadline, greedy_join_order, dp_join_order, dp_bushy_join_order
+from helper.stats import get_stats
+from tests.queries import chain_query
+
+
+def _cartesian_query(names):
+    # SELECT * FROM A, B, C, ... sebagai pohon JOIN left-deep
+    node = QueryTree("TABLE", val=names[0])
+    for name in names[1:]:
+        node = QueryTree("JOIN", childs=[node, QueryTree("TABLE", val=name)])
+    root = QueryTree("SELECT", val="dummy")
+    root.add_child(node)
+    return ParsedQuery("SELECT * FROM " + ", ".join(names), root)
+
+
+class TestTimeBudget(unittest.TestCase):
+
+    def test_deadline(self):
+        self.assertFalse(Deadline(None).expired())
+        self.assertEqual(Deadline(None).remaining_ms(), float('inf'))
+        self.assertTrue(Deadline(0).expired())
+        self.assertGreater(Deadline(10000).remaining_ms(), 0)
+
+    def test_dp_stops_when_expired(self):
+        tables, conds, stats = chain_query(8)
+        self.assertEqual(dp_join_order(tables, conds, stats, deadline=Deadline(0)), (None, float('inf')))
+        self.assertEqual(dp_bushy_join_order(tables, conds, stats, deadline=Deadline(0)), (None, float('inf')))
+
+    def test_greedy_join_order(self):
+        stats = get_stats()
+        tables = ["movies", "reviews", "awards", "movie_actors", "actors"]
+        conds = {
+            frozenset({"movies", "reviews"}): "movies.movie_id = reviews.movie_id",
+            frozenset({"movies", "awards"}): "movies.movie_id = awards.movie_id",
+            frozenset({"movies", "movie_actors"}): "movies.movie_id = movie_actors.movie_id",
+            frozenset({"movie_actors", "actors"}): "movie_actors.actor_id = actors.actor_id",
+        }
+        order, cost = greedy_join_order(tables, conds, stats)
+        self.assertEqual(sorted(order), sorted(tables))
+        self.assertEqual(cost, plan_cost(build_join_tree(order, conds), stats))
+        _, dp_cost = dp_join_order(tables, conds, stats)
+        self.assertGreaterEqual(cost, dp_cost)
+
+    def test_exhausted_budget_falls_back_to_greedy(self):
+        engine = OptimizationEngine()
+        names = ["A", "B", "C", "D", "E"]
+        out = engine.optimize_query(_cartesian_query(names), time_budget_ms=0)
+        self.assertTrue(engine.last_budget_exhausted)
+        self.assertEqual(_tables_under(out.query_tree), set(names))
+
+    def test_engine_budget_and_per_call_override(self):
+        engine = OptimizationEngine()
+        engine.time_budget_ms = 0
+        names = ["A", "B", "C", "D"]
+        engine.optimize_query(_cartesian_query(names))
+        self.assertTrue(engine.last_budget_exhausted)
+        engine.optimize_query(_cartesian_query(names), time_budget_ms=60000)
+        self.assertFalse(engine.last_budget_exhausted)
+
+    def test_ga_is_anytime(self):
+        tables, conds, stats = chain_query(20)
+        engine = OptimizationEngine()
+        engine.ga_generations = 100000
+        random.seed(4)
+        start = time.perf_counter()
+        plan, cost = engine._genetic_algorithm_optimize(tables, conds, stats, Deadline(50))
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(_tables_under(plan), set(tables))
+        self.assertEqual(cost, engine._cost_engine(stats).plan_cost(plan))
+        print(f"\nGA 20 tabel dengan budget 50ms: {elapsed * 1000:.1f}ms, cost={cost}")
+
+
+if __name__ == "__main__":
+    unittest.main()
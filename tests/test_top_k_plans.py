@@ -0,0 +1,149 @@
+"""
+Test untuk top-k plan (TopKPlans, plan_top_k, last_top_plans) dan
+plan_cost_breakdown.
+"""
+
+import sys
+import os
+import random
+import itertools
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from QueryOptimizer import OptimizationEngine
+from model.query_tree import QueryTree
+from helper.helper import plan_cost, plan_cost_breakdown, build_join_tree
+from helper.join_graph import JoinGraph
+from helper.join_order import TopKPlans, PlanCostModel, FitnessCache, bnb_join_order, dp_join_order
+from tests.queries import star_query
+
+
+def _connected_orders(tables, graph):
+    for perm in itertools.permutations(tables):
+        mask = 1 << graph.index[perm[0]]
+        ok = True
+        for t in perm[1:]:
+            if not graph.joins(mask, graph.index[t]):
+                ok = False
+                break
+            mask |= 1 << graph.index[t]
+        if ok:
+            yield perm
+
+
+class TestTopKPlans(unittest.TestCase):
+
+    def test_bounded_distinct_heap(self):
+        top = TopKPlans(3)
+        self.assertEqual(top.threshold(), float('inf'))
+        for key, cost in [("a", 50), ("b", 10), ("a", 5), ("c", 30), ("d", 40), ("e", 20), ("f", 60)]:
+            top.offer(key, cost)
+        self.assertEqual(len(top), 3)
+        self.assertEqual(top.items(), [("b", 10), ("e", 20), ("c", 30)])
+        self.assertEqual(top.threshold(), 30)
+        self.assertFalse(top.offer("g", 30))
+        self.assertFalse(top.offer("h", float('inf')))
+        self.assertTrue(top.offer("a", 1))
+        self.assertEqual([k for k, _ in top.items()], ["a", "b", "e"])
+
+    def test_bnb_top_k_is_exact(self):
+        tables, conds, stats = star_query(7, seed=3)
+        graph = JoinGraph(tables, conds)
+        model = PlanCostModel(stats)
+        cache = FitnessCache(model)
+        expected = sorted(cache.cost(p) for p in _connected_orders(tables, graph))
+
+        top = TopKPlans(5)
+        order, cost = bnb_join_order(tables, conds, stats, graph=graph, top_k=top)
+        self.assertEqual(cost, expected[0])
+        self.assertEqual([c for _, c in top.items()], expected[:5])
+
+    def test_dp_top_k_matches_brute_force(self):
+        for n, seed in ((4, 0), (5, 2), (5, 7)):
+            tables, conds, stats = star_query(n, seed=seed)
+            # tambah edge antar dimensi supaya ada urutan yang dipangkas DP satu-plan
+            conds[frozenset({tables[1], tables[2]})] = f"{tables[1]}.x = {tables[2]}.x"
+            graph = JoinGraph(tables, conds)
+            cache = FitnessCache(PlanCostModel(stats))
+            expected = sorted((cache.cost(p), p) for p in _connected_orders(tables, graph))
+
+            top = TopKPlans(5)
+            order, cost = dp_join_order(tables, conds, stats, graph=graph, top_k=top)
+            self.assertEqual(cost, expected[0][0])
+            self.assertEqual([c for _, c in top.items()], [c for c, _ in expected[:5]])
+            for key, c in top.items():
+                self.assertEqual(cache.cost(key), c)
+
+    def test_breakdown_matches_plan_cost(self):
+        stats = {"a": {"n_r": 300, "b_r": 7}, "b": {"n_r": 50, "b_r": 2}, "c": {"n_r": 900, "b_r": 30}}
+        left = QueryTree("JOIN", "THETA:a.x = b.x", [QueryTree("TABLE", "a"), QueryTree("TABLE", "b")])
+        sigma = QueryTree("SIGMA", "c.y > 1", [QueryTree("TABLE", "c")])
+        root = QueryTree("JOIN", "THETA:b.z = c.z", [sigma, left])
+        breakdown = plan_cost_breakdown(root, stats)
+        self.assertEqual(breakdown["cost"], plan_cost(root, stats))
+        self.assertEqual([j["right"] for j in breakdown["joins"]], [["b"], ["a", "b"]])
+        self.assertEqual(breakdown["joins"][1]["left_rows"], 450)
+
+
+class TestEngineTopK(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = OptimizationEngine()
+        self.engine.plan_top_k = 5
+        self.tables, self.conds, self.stats = star_query(9)
+
+    def _check(self, best_cost, k=5):
+        plans = self.engine.last_top_plans
+        self.assertGreater(len(plans), 1)
+        self.assertLessEqual(len(plans), k)
+        costs = [p["cost"] for p in plans]
+        self.assertEqual(costs, sorted(costs))
+        self.assertEqual(costs[0], best_cost)
+        for p in plans:
+            self.assertEqual(p["cost"], self.engine._cost_engine(self.stats).plan_cost(p["plan"]))
+            self.assertEqual(p["breakdown"]["cost"], p["cost"])
+            self.assertEqual(len(p["breakdown"]["joins"]), len(self.tables) - 1)
+        return plans
+
+    def test_ga_and_sa(self):
+        random.seed(0)
+        _, cost = self.engine._genetic_algorithm_optimize(self.tables, self.conds, self.stats)
+        self._check(cost)
+
+        self.engine.sa_seed = 1
+        _, cost = self.engine._simulated_annealing_optimize(self.tables, self.conds, self.stats)
+        self._check(cost)
+
+    def test_bushy_plans_are_distinct_shapes(self):
+        self.engine.bushy_plans = True
+        random.seed(1)
+        _, cost = self.engine._genetic_algorithm_optimize(self.tables, self.conds, self.stats)
+        plans = self._check(cost)
+        shapes = {repr(p["breakdown"]["joins"]) for p in plans}
+        self.assertEqual(len(shapes), len(plans))
+
+    def test_dp_and_bnb(self):
+        _, cost = self.engine._dp_optimize(self.tables, self.conds, self.stats)
+        self._check(cost)
+        # lower bound BnB di model "planner" lemah; top-k BnB dites di model simple
+        self.engine.join_enumerator = "bnb"
+        self.engine.cost_model = "simple"
+        _, cost = self.engine._bnb_optimize(self.tables, self.conds, self.stats)
+        self.assertEqual(len(self._check(cost)), 5)
+
+    def test_optimize_query_keeps_single_plan_by_default(self):
+        engine = OptimizationEngine()
+        parsed = engine.parse_query(
+            "SELECT * FROM movies m JOIN reviews r ON m.movie_id = r.movie_id "
+            "JOIN directors d ON d.director_id = m.movie_id;"
+        )
+        optimized = engine.optimize_query(parsed)
+        self.assertEqual(len(engine.last_top_plans), 1)
+        self.assertIs(engine.last_top_plans[0]["plan"], optimized.query_tree)
+
+        recosted = engine.recost_top_plans()
+        self.assertIn("planner_cost", recosted[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Test untuk lebar kolom (helper.widths) dan l_r / f_r / b_r hasil projection
+dan join: projection yang di-push ke bawah join mengecilkan input join.
+"""
+
+import sys
+import os
+import unittest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.query_tree import QueryTree, ColumnNode, ColumnDefinition
+from helper.cost import CostPlanner
+from helper.widths import column_width, column_widths, tuple_width, DEFAULT_WIDTH
+
+
+STATS = {
+    "emp": {"n_r": 10000, "b_r": 1000, "f_r": 10, "l_r": 400,
+            "v_a_r": {"id": 10000, "dept": 50, "bio": 9000},
+            "schema": [ColumnDefinition("id", "int"), ColumnDefinition("dept", "int"),
+                       ColumnDefinition("bio", "varchar", 392)]},
+    "dept": {"n_r": 50, "b_r": 5, "f_r": 10, "l_r": 400,
+             "v_a_r": {"id": 50, "name": 50}, "widths": {"id": 4, "name": 396}},
+}
+
+
+def _project(columns, child):
+    return QueryTree("PROJECT", [ColumnNode(c, t) for t, c in columns], [child])
+
+
+def _join(left, right):
+    return QueryTree("JOIN", "THETA:emp.dept = dept.id", [left, right])
+
+
+class TestColumnWidths(unittest.TestCase):
+
+    def test_column_width(self):
+        self.assertEqual(column_width(ColumnDefinition("a", "int")), 4)
+        self.assertEqual(column_width(ColumnDefinition("a", "varchar", 50)), 50)
+        self.assertEqual(column_width({"data_type": "float"}), 8)
+        self.assertEqual(column_width(ColumnDefinition("a", "blob")), DEFAULT_WIDTH)
+        self.assertEqual(column_width(12), 12)
+        for bad in (0, True, "int"):
+            with self.assertRaises(ValueError):
+                column_width(bad)
+
+    def test_column_widths_sources(self):
+        self.assertEqual(column_widths(STATS["emp"]), {"id": 4, "dept": 4, "bio": 392})
+        self.assertEqual(column_widths(STATS["dept"]), {"id": 4, "name": 396})
+        # tanpa schema: l_r dibagi rata, sisa l_r untuk kolom yang belum diketahui
+        self.assertEqual(column_widths({"l_r": 100, "v_a_r": {"a": 1, "b": 1}}), {"a": 50, "b": 50})
+        self.assertEqual(column_widths({"l_r": 100, "v_a_r": {"a": 1, "b": 1}, "widths": {"a": 10}}),
+                         {"a": 10, "b": 90})
+        self.assertEqual(column_widths({"v_a_r": {"a": 1}}), {})
+        self.assertEqual(tuple_width({"a": 10, "b": 90}, {"a", "c"}), 10 + DEFAULT_WIDTH)
+
+
+class TestProjectionWidth(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner(stats=STATS)
+
+    def test_projection_shrinks_blocks(self):
+        result = self.planner.calculate_cost(_project([("emp", "id"), ("emp", "dept")], QueryTree("TABLE", "emp")))
+        self.assertEqual(result["l_r"], 8)
+        # block input 10 * 400 byte, tuple 8 byte
+        self.assertEqual(result["f_r"], 500)
+        self.assertEqual(result["b_r"], 20)
+        self.assertEqual(result["io_cost"], 1000)
+
+    def test_all_columns_unchanged(self):
+        scan = self.planner.cost_table_scan(QueryTree("TABLE", "emp"))
+        node = QueryTree("PROJECT", [ColumnNode("id"), ColumnNode("dept"), ColumnNode("bio")])
+        result = self.planner.cost_projection(node, scan)
+        self.assertEqual((result["b_r"], result["f_r"]), (1000, 10))
+
+    def test_without_widths_unchanged(self):
+        planner = CostPlanner(stats={"t": {"n_r": 1000, "b_r": 100, "v_a_r": {"a": 10, "b": 10}}})
+        result = planner.calculate_cost(QueryTree("PROJECT", [ColumnNode("a")], [QueryTree("TABLE", "t")]))
+        self.assertEqual((result["b_r"], result["f_r"]), (100, 10))
+
+
+class TestJoinWidth(unittest.TestCase):
+
+    def setUp(self):
+        self.planner = CostPlanner(stats=STATS)
+
+    def test_join_tuple_is_sum_of_inputs(self):
+        result = self.planner.calculate_cost(_join(QueryTree("TABLE", "emp"), QueryTree("TABLE", "dept")))
+        self.assertEqual(result["l_r"], 800)
+        self.assertEqual(result["f_r"], 5)
+        self.assertEqual(result["b_r"], 2000)
+
+    def test_pushed_projection_cheapens_join_above(self):
+        wide = _join(QueryTree("TABLE", "emp"), QueryTree("TABLE", "dept"))
+        narrow = _join(_project([("emp", "dept")], QueryTree("TABLE", "emp")),
+                       _project([("dept", "id"), ("dept", "name")], QueryTree("TABLE", "dept")))
+        wide_cost = self.planner.calculate_cost(QueryTree("SORT", "dept", [wide]))
+        narrow_cost = self.planner.calculate_cost(QueryTree("SORT", "dept", [narrow]))
+        self.assertLess(narrow_cost["b_r"], wide_cost["b_r"])
+        self.assertLess(narrow_cost["io_cost"], wide_cost["io_cost"])
+
+
+if __name__ == "__main__":
+    unittest.main()